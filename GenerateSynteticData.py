@@ -1,84 +1,253 @@
+#!/usr/bin/env python3
+"""
+Synthetic Publish-Subscribe Topology Generator
+
+Generates broker, producer, consumer and topic nodes plus their PUBLISHES,
+SUBSCRIBES_TO and HOSTS relationships as neo4j-admin import CSV files
+(output/nodes.csv and output/relationships.csv).
+
+Relationship generation is split into shards that run in a process pool.
+Each shard draws from its own seed derived from --seed, so the output is
+reproducible for a given seed and shard count.
+"""
+
+import argparse
 import csv
-import random
-
-# Parameters
-num_brokers = 20
-num_producers = 100
-num_consumers = 100
-num_topics = 2000
-topics_per_producer = 10
-topics_per_consumer = 10
-replication_factor = 3
-
-# Generate Brokers
-brokers = [f'B{i}' for i in range(1, num_brokers + 1)]
-
-# Generate Producers
-producers = [f'P{i}' for i in range(1, num_producers + 1)]
-
-# Generate Consumers
-consumers = [f'C{i}' for i in range(1, num_consumers + 1)]
-
-# Generate Topics
-topics = [f'T{i}' for i in range(1, num_topics + 1)]
-
-# Create Nodes CSV
-with open('output/nodes.csv', 'w', newline='') as csvfile:
-    fieldnames = ['id:ID', 'name', 'type', ':LABEL']
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter=";")
-    writer.writeheader()
-
-    # Write Brokers
-    for broker in brokers:
-        writer.writerow({'id:ID': broker, 'name': broker, 'type': 'broker', ':LABEL': 'Broker'})
-
-    # Write Producers
-    for producer in producers:
-        writer.writerow({'id:ID': producer, 'name': producer, 'type': 'producer', ':LABEL': 'Producer'})
-
-    # Write Consumers
-    for consumer in consumers:
-        writer.writerow({'id:ID': consumer, 'name': consumer, 'type': 'consumer', ':LABEL': 'Consumer'})
-
-    # Write Topics
-    for topic in topics:
-        writer.writerow({'id:ID': topic, 'name': topic, 'type': 'topic', ':LABEL': 'Topic'})
-
-# Create Relationships CSV
-with open('output/relationships.csv', 'w', newline='') as csvfile:
-    fieldnames = [':START_ID', ':END_ID', 'relationship', ':TYPE']
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter=";")
-    writer.writeheader()
-
-    # Producer to Topic (PUBLISHES)
-    for producer in producers:
-        published_topics = random.sample(topics, topics_per_producer)
-        for topic in published_topics:
-            writer.writerow({
-                ':START_ID': producer,
-                ':END_ID': topic,
-                'relationship': 'publishes',
-                ':TYPE': 'PUBLISHES'
-            })
-
-    # Consumer to Topic (SUBSCRIBES_TO)
-    for consumer in consumers:
-        subscribed_topics = random.sample(topics, topics_per_consumer)
-        for topic in subscribed_topics:
-            writer.writerow({
-                ':START_ID': consumer,
-                ':END_ID': topic,
-                'relationship': 'subscribes_to',
-                ':TYPE': 'SUBSCRIBES_TO'
-            })
-
-    # Broker to Topic (HOSTS)
-    for topic in topics:
-        hosting_brokers = random.sample(brokers, replication_factor)
-        for broker in hosting_brokers:
-            writer.writerow({
-                ':START_ID': broker,
-                ':END_ID': topic,
-                'relationship': 'hosts',
-                ':TYPE': 'HOSTS'
-            })
+import gzip
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+NODE_FIELDS = ['id:ID', 'name', 'type', ':LABEL']
+RELATIONSHIP_FIELDS = [':START_ID', ':END_ID', 'relationship', ':TYPE']
+
+# Relationship sections in output order: (source prefix, target prefix, relationship, type)
+SECTIONS = [
+    ('P', 'T', 'publishes', 'PUBLISHES'),
+    ('C', 'T', 'subscribes_to', 'SUBSCRIBES_TO'),
+    ('B', 'T', 'hosts', 'HOSTS'),
+]
+
+# Random keys drawn at once by the dense sampler, and the population up to which it is used
+MAX_SAMPLE_ELEMENTS = 1 << 22
+SMALL_POPULATION = 1024
+
+def parse_args():
+    """
+    Parse command line arguments for the generator
+
+    Returns:
+        Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description='Synthetic publish-subscribe topology generator')
+    parser.add_argument('--brokers', type=int, default=20, help='Number of brokers (default: 20)')
+    parser.add_argument('--producers', type=int, default=100, help='Number of producers (default: 100)')
+    parser.add_argument('--consumers', type=int, default=100, help='Number of consumers (default: 100)')
+    parser.add_argument('--topics', type=int, default=2000, help='Number of topics (default: 2000)')
+    parser.add_argument('--topics-per-producer', type=int, default=10, help='Topics published by each producer (default: 10)')
+    parser.add_argument('--topics-per-consumer', type=int, default=10, help='Topics subscribed by each consumer (default: 10)')
+    parser.add_argument('--replication-factor', type=int, default=3, help='Brokers hosting each topic (default: 3)')
+    parser.add_argument('--output-dir', type=str, default='output', help='Directory for the CSV files (default: output)')
+    parser.add_argument('--shards', type=int, default=1, help='Number of shards to split generation into (default: 1)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per shard, up to CPU count)')
+    parser.add_argument('--seed', type=int, default=None, help='Base random seed (default: fresh entropy)')
+    parser.add_argument('--chunk-size', type=int, default=100000, help='Entities sampled and written per chunk (default: 100000)')
+    parser.add_argument('--gzip', action='store_true', help='Write gzip-compressed CSV files')
+    parser.add_argument('--keep-shards', action='store_true', help='Keep per-shard part files instead of merging them')
+    args = parser.parse_args()
+
+    if min(args.brokers, args.producers, args.consumers, args.topics, args.shards, args.chunk_size) < 1:
+        parser.error("Counts, shards and chunk size must be at least 1")
+    if max(args.topics_per_producer, args.topics_per_consumer) > args.topics:
+        parser.error("Cannot publish or subscribe to more topics than exist")
+    if args.replication_factor > args.brokers:
+        parser.error("Replication factor cannot exceed the number of brokers")
+
+    return args
+
+def open_csv(path, use_gzip):
+    """
+    Open a CSV file for writing, optionally gzip-compressed
+
+    Args:
+        path (str): File path
+        use_gzip (bool): Whether to compress the file
+
+    Returns:
+        file: Writable text file object
+    """
+    if use_gzip:
+        return gzip.open(path, 'wt', newline='')
+    return open(path, 'w', newline='')
+
+def sample_without_replacement(rng, population, rows, k):
+    """
+    Draw k distinct values from range(population) for each of rows rows
+
+    Args:
+        rng: NumPy random Generator
+        population (int): Size of the population
+        rows (int): Number of independent samples
+        k (int): Sample size per row
+
+    Returns:
+        ndarray: (rows, k) array of distinct values per row
+    """
+    sample = np.empty((rows, k), dtype=np.int64)
+    if k == 0:
+        return sample
+
+    if 2 * k > population or population <= SMALL_POPULATION:
+        # Dense case: keep the k smallest of random keys, in blocks of bounded size
+        block = max(1, MAX_SAMPLE_ELEMENTS // population)
+        for start in range(0, rows, block):
+            keys = rng.random((min(block, rows - start), population))
+            sample[start:start + block] = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        return sample
+
+    # Sparse case: k draws per row, each in O(k)
+    for row in range(rows):
+        sample[row] = rng.choice(population, k, replace=False)
+    return sample
+
+def shard_range(count, shards, shard):
+    """
+    Get the [start, end) slice of count entities assigned to a shard
+
+    Args:
+        count (int): Number of entities
+        shards (int): Number of shards
+        shard (int): Shard index
+
+    Returns:
+        tuple: (start, end) entity indices
+    """
+    return count * shard // shards, count * (shard + 1) // shards
+
+def generate_shard(task):
+    """
+    Generate and write the relationships of one shard
+
+    Args:
+        task (dict): Shard parameters (see main)
+
+    Returns:
+        list: Paths of the part files written, one per relationship section
+    """
+    rng = np.random.default_rng(task['seed'])
+    paths = []
+
+    for section, (source_prefix, target_prefix, relationship, rel_type) in enumerate(SECTIONS):
+        start, end = task['ranges'][section]
+        population, k = task['samples'][section]
+        path = os.path.join(task['output_dir'], f"relationships.section-{section}.part-{task['shard']:04d}.csv")
+        if task['gzip']:
+            path += '.gz'
+        paths.append(path)
+
+        with open_csv(path, task['gzip']) as csvfile:
+            writer = csv.writer(csvfile, delimiter=';')
+            for chunk_start in range(start, end, task['chunk_size']):
+                chunk_end = min(end, chunk_start + task['chunk_size'])
+                targets = sample_without_replacement(rng, population, chunk_end - chunk_start, k)
+                sources = np.repeat(np.arange(chunk_start + 1, chunk_end + 1), k)
+                writer.writerows(
+                    (f"{source_prefix}{source}", f"{target_prefix}{target}", relationship, rel_type)
+                    for source, target in zip(sources.tolist(), (targets + 1).ravel().tolist())
+                )
+
+    return paths
+
+def write_nodes(path, args):
+    """
+    Write the node CSV file
+
+    Args:
+        path (str): Output file path
+        args: Parsed arguments
+    """
+    node_groups = [
+        ('B', args.brokers, 'broker', 'Broker'),
+        ('P', args.producers, 'producer', 'Producer'),
+        ('C', args.consumers, 'consumer', 'Consumer'),
+        ('T', args.topics, 'topic', 'Topic'),
+    ]
+    with open_csv(path, args.gzip) as csvfile:
+        writer = csv.writer(csvfile, delimiter=';')
+        writer.writerow(NODE_FIELDS)
+        for prefix, count, node_type, label in node_groups:
+            writer.writerows((f"{prefix}{i}", f"{prefix}{i}", node_type, label) for i in range(1, count + 1))
+
+def merge_parts(path, part_paths, use_gzip):
+    """
+    Write the relationship header and append all part files in order
+
+    Gzip members can be concatenated byte for byte, so compressed parts
+    are appended without recompression.
+
+    Args:
+        path (str): Output file path
+        part_paths (list): Part files in output order
+        use_gzip (bool): Whether the files are gzip-compressed
+    """
+    with open_csv(path, use_gzip) as csvfile:
+        csv.writer(csvfile, delimiter=';').writerow(RELATIONSHIP_FIELDS)
+
+    with open(path, 'ab') as merged:
+        for part_path in part_paths:
+            with open(part_path, 'rb') as part:
+                shutil.copyfileobj(part, merged)
+            os.remove(part_path)
+
+def main():
+    """Main entry point for the generator"""
+    args = parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+    suffix = '.gz' if args.gzip else ''
+
+    seed_sequence = np.random.SeedSequence(args.seed)
+    print(f"Generating with seed {seed_sequence.entropy} across {args.shards} shards")
+
+    write_nodes(os.path.join(args.output_dir, f'nodes.csv{suffix}'), args)
+
+    entity_counts = [args.producers, args.consumers, args.topics]
+    samples = [
+        (args.topics, args.topics_per_producer),
+        (args.topics, args.topics_per_consumer),
+        (args.brokers, args.replication_factor),
+    ]
+    tasks = [{
+        'shard': shard,
+        'seed': shard_seed,
+        'ranges': [shard_range(count, args.shards, shard) for count in entity_counts],
+        'samples': samples,
+        'output_dir': args.output_dir,
+        'chunk_size': args.chunk_size,
+        'gzip': args.gzip,
+    } for shard, shard_seed in enumerate(seed_sequence.spawn(args.shards))]
+
+    workers = args.workers or min(args.shards, os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shard_paths = list(executor.map(generate_shard, tasks))
+    else:
+        shard_paths = [generate_shard(task) for task in tasks]
+
+    if args.keep_shards:
+        header_path = os.path.join(args.output_dir, f'relationships.header.csv{suffix}')
+        with open_csv(header_path, args.gzip) as csvfile:
+            csv.writer(csvfile, delimiter=';').writerow(RELATIONSHIP_FIELDS)
+        print(f"Wrote {sum(len(paths) for paths in shard_paths)} relationship part files with header {header_path}")
+    else:
+        # Section-major order: all PUBLISHES rows, then SUBSCRIBES_TO, then HOSTS
+        ordered_parts = [paths[section] for section in range(len(SECTIONS)) for paths in shard_paths]
+        merge_parts(os.path.join(args.output_dir, f'relationships.csv{suffix}'), ordered_parts, args.gzip)
+
+    total = (args.producers * args.topics_per_producer + args.consumers * args.topics_per_consumer +
+             args.topics * args.replication_factor)
+    print(f"Generated {args.brokers + args.producers + args.consumers + args.topics} nodes and {total} relationships")
+
+if __name__ == "__main__":
+    main()
@@ -6,177 +6,209 @@ This module provides functions for analyzing the basic structure
 and properties of the publish-subscribe system model.
 """
 
-import networkx as nx
+from dataclasses import dataclass, field
+from pubsub_index import get_typed_index
+from pubsub_centrality import layer_centrality
 
-def analyze_graph(G):
+@dataclass(slots=True)
+class GraphAnalysis:
+    """
+    Results of the basic graph analysis
+    
+    Attributes:
+        num_nodes (int): Number of graph nodes
+        num_edges (int): Number of graph edges
+        node_types (dict): Number of nodes per type
+        edge_types (dict): Number of edges per type
+        app_dependencies (dict): Application -> {'dependents', 'dependencies'} counts
+        broker_load (dict): Broker -> {'topics', 'applications'} counts
+        node_utilization (dict): Node -> {'applications', 'brokers', 'total'} hosted service counts
+        topic_load (dict): Topic -> {'publishers', 'subscribers', 'total'} counts
+        infra_centrality (dict): Centrality of each infrastructure node
+        app_centrality (dict): Centrality of each application in the dependency layer
+    """
+    num_nodes: int
+    num_edges: int
+    node_types: dict
+    edge_types: dict
+    app_dependencies: dict = field(default_factory=dict)
+    broker_load: dict = field(default_factory=dict)
+    node_utilization: dict = field(default_factory=dict)
+    topic_load: dict = field(default_factory=dict)
+    infra_centrality: dict = field(default_factory=dict)
+    app_centrality: dict = field(default_factory=dict)
+    
+    def bottlenecks(self):
+        """
+        Find the potential system bottlenecks
+        
+        Returns:
+            list: (component type, component, stats) tuples for the 3 busiest topics,
+                  brokers routing over 20% of topics and nodes hosting over 25% of services
+        """
+        bottlenecks = []
+        
+        # Topics with many publishers and subscribers
+        sorted_topics = sorted(self.topic_load.items(), key=lambda x: x[1]['total'], reverse=True)
+        bottlenecks.extend(('Topic', topic, stats) for topic, stats in sorted_topics[:3])
+        
+        # Brokers with high load
+        topic_threshold = max(2, self.node_types.get('Topic', 0) // 5)  # 20% of topics
+        sorted_brokers = sorted(self.broker_load.items(), key=lambda x: x[1]['topics'], reverse=True)
+        bottlenecks.extend(('Broker', broker, stats) for broker, stats in sorted_brokers
+                           if stats['topics'] > topic_threshold)
+        
+        # Overloaded nodes
+        service_threshold = max(2, (self.node_types.get('Application', 0) + self.node_types.get('Broker', 0)) // 4)  # 25% of services
+        sorted_nodes = sorted(self.node_utilization.items(), key=lambda x: x[1]['total'], reverse=True)
+        bottlenecks.extend(('Node', node, stats) for node, stats in sorted_nodes
+                           if stats['total'] > service_threshold)
+        
+        return bottlenecks
+
+def analyze_graph(G, index=None, centrality=None):
     """
     Perform basic analysis of the graph structure
     
     Args:
         G: NetworkX graph object
+        index: TypedIndex of G (built if not given)
+        centrality (dict): Options for layer_centrality (exact betweenness if not given)
+    
+    Returns:
+        GraphAnalysis: Analysis results (see print_graph_analysis for the report)
+    """
+    if index is None:
+        index = get_typed_index(G)
+    
+    # Count edges like the type distribution, from the layers when attached, so that
+    # parallel relationships the DiGraph collapses are included in both
+    analysis = GraphAnalysis(G.number_of_nodes(), sum(index.edge_type_counts.values()),
+                             index.type_counts(), dict(index.edge_type_counts))
+    
+    # Analyze application dependencies
+    app_nodes = index.nodes_of_type('Application')
+    for app in app_nodes:
+        analysis.app_dependencies[app] = {
+            'dependents': len(index.dependents(app)),
+            'dependencies': len(index.dependencies(app))
+        }
+    
+    # Analyze broker workload
+    for broker in index.nodes_of_type('Broker'):
+        analysis.broker_load[broker] = {
+            'topics': len(index.routed_topics(broker)),
+            'applications': len(index.dependents(broker))
+        }
+    
+    # Analyze node utilization
+    infra_nodes = index.nodes_of_type('Node')
+    for node in infra_nodes:
+        hosted_apps = index.hosted_services(node, 'Application')
+        hosted_brokers = index.hosted_services(node, 'Broker')
+        
+        analysis.node_utilization[node] = {
+            'applications': len(hosted_apps),
+            'brokers': len(hosted_brokers),
+            'total': len(hosted_apps) + len(hosted_brokers)
+        }
+    
+    # Centrality in the infrastructure and dependency networks
+    centrality = centrality or {}
+    if infra_nodes:
+        analysis.infra_centrality = layer_centrality(G, 'Node', index=index, **centrality)
+    if app_nodes:
+        analysis.app_centrality = layer_centrality(G, 'Application', index=index, **centrality)
+    
+    # Topics with many publishers and subscribers
+    for node in index.nodes_of_type('Topic'):
+        publishers = index.publishers(node)
+        subscribers = index.subscribers(node)
+        
+        analysis.topic_load[node] = {
+            'publishers': len(publishers),
+            'subscribers': len(subscribers),
+            'total': len(publishers) + len(subscribers)
+        }
+    
+    return analysis
+
+def print_graph_analysis(analysis):
+    """
+    Print the basic graph analysis report
+    
+    Args:
+        analysis: GraphAnalysis object
     """
     print("\n=== Graph Analysis ===")
     
     print(f"\nGraph Summary:")
-    print(f"Number of nodes: {G.number_of_nodes()}")
-    print(f"Number of edges: {G.number_of_edges()}")
-    
-    # Count node types
-    node_types = {}
-    for node, attrs in G.nodes(data=True):
-        node_type = attrs.get('type')
-        node_types[node_type] = node_types.get(node_type, 0) + 1
+    print(f"Number of nodes: {analysis.num_nodes}")
+    print(f"Number of edges: {analysis.num_edges}")
     
     print("\nNode Distribution:")
-    for node_type, count in node_types.items():
+    for node_type, count in analysis.node_types.items():
         print(f"  {node_type}: {count}")
     
-    # Count edge types
-    edge_types = {}
-    for u, v, attrs in G.edges(data=True):
-        edge_type = attrs.get('type')
-        edge_types[edge_type] = edge_types.get(edge_type, 0) + 1
-    
     print("\nEdge Distribution:")
-    for edge_type, count in edge_types.items():
+    for edge_type, count in analysis.edge_types.items():
         print(f"  {edge_type}: {count}")
     
-    # Extract application subgraph
-    app_nodes = [node for node, attrs in G.nodes(data=True) if attrs.get('type') == 'Application']
-    app_graph = G.subgraph(app_nodes)
-    
-    # Analyze application dependencies
-    print("\nApplication Dependency Analysis:")
-    app_deps = {}
-    for app in app_nodes:
-        in_deps = list(G.predecessors(app))
-        out_deps = list(G.successors(app))
-        in_apps = [dep for dep in in_deps if G.nodes[dep].get('type') == 'Application']
-        out_apps = [dep for dep in out_deps if G.nodes[dep].get('type') == 'Application']
-        
-        app_deps[app] = {
-            'dependents': len(in_apps),
-            'dependencies': len(out_apps)
-        }
-    
     # Find most depended-upon applications
-    deps_sorted = sorted(app_deps.items(), key=lambda x: x[1]['dependents'], reverse=True)
+    print("\nApplication Dependency Analysis:")
+    deps_sorted = sorted(analysis.app_dependencies.items(), key=lambda x: x[1]['dependents'], reverse=True)
     print("\nMost Central Applications (by number of dependents):")
     for app, stats in deps_sorted[:3]:
         print(f"  {app}: {stats['dependents']} dependents, {stats['dependencies']} dependencies")
     
-    # Analyze broker workload
     print("\nBroker Workload Analysis:")
-    broker_load = {}
-    broker_nodes = [node for node, attrs in G.nodes(data=True) if attrs.get('type') == 'Broker']
-    
-    for broker in broker_nodes:
-        # Count routed topics
-        routed_topics = [node for node in G.successors(broker) 
-                         if G.nodes[node].get('type') == 'Topic' and G[broker][node].get('type') == 'ROUTES']
-        
-        # Get dependent applications
-        dependent_apps = [node for node in G.predecessors(broker) 
-                         if G.nodes[node].get('type') == 'Application' and G[node][broker].get('type') == 'DEPENDS_ON']
-        
-        broker_load[broker] = {
-            'topics': len(routed_topics),
-            'applications': len(dependent_apps)
-        }
-    
-    for broker, stats in broker_load.items():
+    for broker, stats in analysis.broker_load.items():
         print(f"  {broker}: Routes {stats['topics']} topics, Serves {stats['applications']} applications")
     
-    # Analyze node utilization
     print("\nNode Utilization Analysis:")
-    node_util = {}
-    infra_nodes = [node for node, attrs in G.nodes(data=True) if attrs.get('type') == 'Node']
+    for node, stats in analysis.node_utilization.items():
+        print(f"  {node}: Hosts {stats['applications']} applications, {stats['brokers']} brokers (Total: {stats['total']})")
     
-    for node in infra_nodes:
-        # Count hosted applications
-        hosted_apps = [n for n in G.predecessors(node) 
-                      if G.nodes[n].get('type') == 'Application' and G[n][node].get('type') == 'RUNS_ON']
-        
-        # Count hosted brokers
-        hosted_brokers = [n for n in G.predecessors(node) 
-                         if G.nodes[n].get('type') == 'Broker' and G[n][node].get('type') == 'RUNS_ON']
-        
-        node_util[node] = {
-            'applications': len(hosted_apps),
-            'brokers': len(hosted_brokers),
-            'total': len(hosted_apps) + len(hosted_brokers)
-        }
+    if analysis.infra_centrality:
+        sorted_centrality = sorted(analysis.infra_centrality.items(), key=lambda x: x[1], reverse=True)
+        print("\nInfrastructure Centrality (Most Critical Nodes):")
+        for node, score in sorted_centrality:
+            print(f"  {node}: {score:.4f}")
     
-    for node, stats in node_util.items():
-        print(f"  {node}: Hosts {stats['applications']} applications, {stats['brokers']} brokers (Total: {stats['total']})")
+    if analysis.app_centrality:
+        sorted_centrality = sorted(analysis.app_centrality.items(), key=lambda x: x[1], reverse=True)
+        print("\nApplication Dependency Centrality (Most Central Applications):")
+        for app, score in sorted_centrality[:3]:
+            print(f"  {app}: {score:.4f}")
     
-    # Find most central nodes in the infrastructure
-    infra_graph = G.subgraph(infra_nodes)
-    if infra_graph.number_of_nodes() > 0:
-        try:
-            betweenness = nx.betweenness_centrality(infra_graph)
-            sorted_betweenness = sorted(betweenness.items(), key=lambda x: x[1], reverse=True)
-            
-            print("\nInfrastructure Centrality (Most Critical Nodes):")
-            for node, score in sorted_betweenness:
-                print(f"  {node}: {score:.4f}")
-        except:
-            print("\nCould not compute infrastructure centrality (graph may be disconnected)")
-    
-    # Identify potential bottlenecks
     print("\nPotential System Bottlenecks:")
-    
-    # Topics with many publishers and subscribers
-    topic_load = {}
-    for node, attrs in G.nodes(data=True):
-        if attrs.get('type') == 'Topic':
-            publishers = [n for n in G.predecessors(node) 
-                         if G.nodes[n].get('type') == 'Application' and G[n][node].get('type') == 'PUBLISHES_TO']
-            
-            subscribers = [n for n in G.predecessors(node) 
-                          if G.nodes[n].get('type') == 'Application' and G[n][node].get('type') == 'SUBSCRIBES_TO']
-            
-            topic_load[node] = {
-                'publishers': len(publishers),
-                'subscribers': len(subscribers),
-                'total': len(publishers) + len(subscribers)
-            }
-    
-    # Sort topics by total connections
-    sorted_topics = sorted(topic_load.items(), key=lambda x: x[1]['total'], reverse=True)
-    for topic, stats in sorted_topics[:3]:
-        print(f"  Topic: {topic} - {stats['publishers']} publishers, {stats['subscribers']} subscribers")
-    
-    # Brokers with high load
-    sorted_brokers = sorted(broker_load.items(), key=lambda x: x[1]['topics'], reverse=True)
-    for broker, stats in sorted_brokers:
-        topic_threshold = max(2, node_types.get('Topic', 0) // 5)  # 20% of topics
-        if stats['topics'] > topic_threshold:
-            print(f"  Broker: {broker} - High routing load with {stats['topics']} topics")
-    
-    # Overloaded nodes
-    sorted_nodes = sorted(node_util.items(), key=lambda x: x[1]['total'], reverse=True)
-    for node, stats in sorted_nodes:
-        service_threshold = max(2, (node_types.get('Application', 0) + node_types.get('Broker', 0)) // 4)  # 25% of services
-        if stats['total'] > service_threshold:
-            print(f"  Node: {node} - Potential overload with {stats['total']} total services")
+    for component_type, component, stats in analysis.bottlenecks():
+        if component_type == 'Topic':
+            print(f"  Topic: {component} - {stats['publishers']} publishers, {stats['subscribers']} subscribers")
+        elif component_type == 'Broker':
+            print(f"  Broker: {component} - High routing load with {stats['topics']} topics")
+        else:
+            print(f"  Node: {component} - Potential overload with {stats['total']} total services")
 
 if __name__ == "__main__":
     import sys
     
     from pubsub_config import SystemConfig, parse_args
+    from pubsub_log import configure_logging
     from pubsub_graph import create_complete_graph
     
     try:
         # Parse arguments
         config, args = parse_args()
+        configure_logging()
+        config.print_summary()
         
         # Create graph
         print("Creating graph model...")
         G, components = create_complete_graph(config, use_neo4j=not args.no_neo4j)
         
         # Run analysis
-        analyze_graph(G)
+        print_graph_analysis(analyze_graph(G))
         
         print("\nBasic analysis complete.")
         
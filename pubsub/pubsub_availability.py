@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Availability Simulation Module for the Publish-Subscribe System Model
+
+This module estimates how available the applications are when every
+component fails independently with a given probability. Failure scenarios
+are drawn in batches as a boolean component x scenario matrix and all
+scenarios of a batch are propagated at once through the cascade rules of
+pubsub_cascade:
+
+- the components failed in the last wave, as (component, scenario) pairs,
+  are expanded through the component x condition SUPPORTS matrix
+- the live supporter counts of the touched (condition, scenario) pairs are
+  decremented, and the conditions left without supporters fail their owners
+- the newly failed pairs form the next wave, until nothing else fails
+
+Each batch draws from its own child of a seeded SeedSequence, so results
+only depend on the seed, whichever worker process runs the batch. Batches
+are consumed in order and sampling stops once the standard error of the
+mean system availability falls below a tolerance. The standard error is
+only trusted after a minimum number of scenarios and of scenarios losing
+an application, since rare failures leave early batches without any loss
+and with zero variance.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import numpy as np
+from pubsub_index import get_typed_index
+from pubsub_cascade import get_cascade_model, CASCADE_TYPES
+
+# Failure probability of each component type unless set per component
+DEFAULT_FAILURE_PROBABILITIES = {'Node': 0.01, 'Broker': 0.01, 'Application': 0.001, 'Topic': 0.0}
+
+# Scenarios, and scenarios losing an application, needed before testing convergence
+MIN_SCENARIOS = 1000
+MIN_FAILURE_EVENTS = 100
+
+_worker_state = None
+
+@dataclass(slots=True)
+class AvailabilityResult:
+    """
+    Results of a Monte Carlo availability simulation
+    
+    Attributes:
+        applications (list): Application names
+        availability (ndarray): Fraction of the scenarios in which each application is available
+        system (ndarray): Fraction of applications available in each scenario
+        scenarios (int): Number of simulated scenarios
+        converged (bool): Whether the standard error reached the tolerance
+        seed (int): Entropy of the root SeedSequence, to reproduce the run
+        failure_events (int): Number of scenarios in which an application was unavailable
+    """
+    applications: list
+    availability: np.ndarray
+    system: np.ndarray
+    scenarios: int = 0
+    converged: bool = False
+    seed: int = None
+    failure_events: int = 0
+    
+    @property
+    def expected_availability(self):
+        """Expected fraction of applications available"""
+        return float(self.system.mean()) if self.scenarios else 1.0
+    
+    @property
+    def standard_error(self):
+        """Standard error of the expected availability"""
+        if self.scenarios < 2:
+            return math.inf
+        return float(self.system.std(ddof=1) / math.sqrt(self.scenarios))
+    
+    @property
+    def resilience_score(self):
+        """Resilience against random failures on a 0-10 scale"""
+        return 10 * self.expected_availability
+    
+    def percentiles(self, percentiles=(1, 5, 50)):
+        """
+        Get percentiles of the system availability distribution
+        
+        Args:
+            percentiles: Percentiles to compute (low ones describe the bad tail)
+        
+        Returns:
+            dict: Percentile -> fraction of applications available
+        """
+        if not self.scenarios:
+            return {percentile: 1.0 for percentile in percentiles}
+        values = np.percentile(self.system, percentiles)
+        return {percentile: float(value) for percentile, value in zip(percentiles, values)}
+    
+    def least_available(self, k=10):
+        """
+        Get the applications that are unavailable most often
+        
+        Args:
+            k (int): Number of applications returned
+        
+        Returns:
+            list: Dictionaries with 'application' and 'availability', least available first
+        """
+        order = np.argsort(self.availability, kind='stable')[:k]
+        return [{'application': self.applications[i], 'availability': float(self.availability[i])}
+                for i in order.tolist()]
+
+def parse_failure_probabilities(specs):
+    """
+    Parse TYPE=P failure probability settings
+    
+    Args:
+        specs: Strings such as 'node=0.01'
+    
+    Returns:
+        dict: Component type -> failure probability
+    
+    Raises:
+        ValueError: If a setting is malformed
+    """
+    probabilities = {}
+    for spec in specs:
+        component_type, separator, probability = spec.partition('=')
+        if not separator:
+            raise ValueError(f"Expected TYPE=PROBABILITY, got '{spec}'")
+        probabilities[component_type] = float(probability)
+    return probabilities
+
+def component_probabilities(G, model, probabilities=None):
+    """
+    Get the failure probability of every component of a cascade model
+    
+    A 'failure_probability' node attribute overrides the probability of its type.
+    
+    Args:
+        G: NetworkX graph object
+        model: CascadeModel of G
+        probabilities (dict): Component type -> failure probability, merged
+                              over DEFAULT_FAILURE_PROBABILITIES
+    
+    Returns:
+        ndarray: Failure probability of each component, in model order
+    
+    Raises:
+        ValueError: If a type is unknown or a probability is outside [0, 1]
+    """
+    by_type = dict(DEFAULT_FAILURE_PROBABILITIES)
+    for component_type, probability in (probabilities or {}).items():
+        component_type = component_type.capitalize()
+        if component_type not in CASCADE_TYPES:
+            raise ValueError(f"Unknown component type '{component_type}', "
+                             f"expected one of {', '.join(CASCADE_TYPES)}")
+        by_type[component_type] = probability
+    
+    result = np.array([G.nodes[component].get('failure_probability', by_type[component_type])
+                       for component, component_type in zip(model.components, model.types)], dtype=np.float64)
+    if ((result < 0) | (result > 1)).any():
+        raise ValueError("Failure probabilities must be between 0 and 1")
+    return result
+
+def _kernel(model, probabilities):
+    """Collect the arrays used to sample and propagate scenarios"""
+    return {
+        'indptr': model.supports.indptr.astype(np.int64),
+        'indices': model.supports.indices.astype(np.int64),
+        'owners': model.owners,
+        'initial': model.initial.astype(np.min_scalar_type(max(1, int(model.initial.max(initial=0))))),
+        'probabilities': probabilities,
+        'sampled': np.flatnonzero(probabilities > 0),
+        'applications': np.flatnonzero(np.asarray(model.types) == 'Application')
+    }
+
+def propagate_scenarios(kernel, failed):
+    """
+    Propagate a batch of failure scenarios to a fixpoint
+    
+    Each wave expands the newly failed (component, scenario) pairs of all
+    scenarios at once into the conditions they support, so every support
+    edge is visited at most once per scenario.
+    
+    Args:
+        kernel: Arrays of _kernel
+        failed: Boolean component x scenario array of the initial failures (updated in place)
+    
+    Returns:
+        ndarray: Boolean component x scenario array of all failed components
+    """
+    indptr = kernel['indptr']
+    indices = kernel['indices']
+    owners = kernel['owners']
+    size = failed.shape[1]
+    # Live supporters of each condition in each scenario, flattened condition-major
+    remaining = np.repeat(kernel['initial'], size)
+    one = remaining.dtype.type(1)
+    
+    components, scenarios = np.nonzero(failed)
+    while len(components):
+        starts = indptr[components]
+        counts = indptr[components + 1] - starts
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        keys = indices[offsets] * size + np.repeat(scenarios, counts)
+        np.subtract.at(remaining, keys, one)
+        # Conditions whose last supporter just failed fail their owners in the next wave
+        keys = keys[remaining[keys] == 0]
+        components = owners[keys // size]
+        scenarios = keys % size
+        live = ~failed[components, scenarios]
+        keys = np.sort(components[live] * size + scenarios[live])
+        keys = keys[np.diff(keys, prepend=-1) != 0]
+        components = keys // size
+        scenarios = keys % size
+        failed[components, scenarios] = True
+    return failed
+
+def _simulate_batch(kernel, stream, size):
+    """
+    Sample and propagate one batch of scenarios
+    
+    Returns:
+        tuple: (scenarios in which each application is available, fraction
+                of applications available in each scenario)
+    """
+    rng = np.random.default_rng(stream)
+    sampled = kernel['sampled']
+    failed = np.zeros((len(kernel['probabilities']), size), dtype=bool)
+    failed[sampled] = rng.random((len(sampled), size)) < kernel['probabilities'][sampled, None]
+    failed = propagate_scenarios(kernel, failed)
+    
+    apps = kernel['applications']
+    if not len(apps):
+        return np.zeros(0, dtype=np.int64), np.ones(size)
+    available = ~failed[apps]
+    return available.sum(axis=1), available.mean(axis=0)
+
+def _init_worker(kernel):
+    """Keep the kernel arrays of a pool worker"""
+    global _worker_state
+    _worker_state = kernel
+
+def _simulate_shard(task):
+    """Simulate one batch in a pool worker"""
+    return _simulate_batch(_worker_state, *task)
+
+def simulate_availability(G, probabilities=None, rules=None, max_scenarios=100000, tolerance=1e-3,
+                          batch_size=256, seed=None, workers=1, index=None,
+                          min_scenarios=MIN_SCENARIOS, min_failure_events=MIN_FAILURE_EVENTS):
+    """
+    Estimate application availability under random independent component failures
+    
+    Args:
+        G: NetworkX graph object
+        probabilities (dict): Component type -> failure probability (see component_probabilities)
+        rules: CascadeRules the failures propagate through (default rules if not given)
+        max_scenarios (int): Maximum number of simulated scenarios
+        tolerance (float): Stop once the standard error of the expected availability
+                           is at most this value (checked after each batch)
+        batch_size (int): Scenarios sampled and propagated together
+        seed (int): Seed of the root SeedSequence (fresh entropy if not given)
+        workers (int): Worker processes simulating batches (1 runs in this process)
+        index: TypedIndex of G (built if not given)
+        min_scenarios (int): Scenarios simulated before convergence is tested
+        min_failure_events (int): Scenarios losing an application needed before convergence
+                                  is tested, so that a run without losses never converges
+    
+    Returns:
+        AvailabilityResult: Per-application availability and system availability distribution
+    
+    Raises:
+        ValueError: If max_scenarios or batch_size is not positive, or a probability is invalid
+    """
+    if max_scenarios < 1 or batch_size < 1:
+        raise ValueError("max_scenarios and batch_size must be positive")
+    if index is None:
+        index = get_typed_index(G)
+    model = get_cascade_model(index, rules)
+    kernel = _kernel(model, component_probabilities(G, model, probabilities))
+    
+    root = np.random.SeedSequence(seed)
+    sizes = [min(batch_size, max_scenarios - start) for start in range(0, max_scenarios, batch_size)]
+    streams = root.spawn(len(sizes))
+    applications = [model.components[i] for i in kernel['applications'].tolist()]
+    
+    available = np.zeros(len(applications), dtype=np.int64)
+    system = []
+    total = 0
+    total_squares = 0.0
+    scenarios = 0
+    failure_events = 0
+    
+    def consume(batch):
+        # Add a batch in order and tell whether the estimate has converged
+        nonlocal available, total, total_squares, scenarios, failure_events
+        batch_available, batch_system = batch
+        available += batch_available
+        system.append(batch_system)
+        total += batch_system.sum()
+        total_squares += np.square(batch_system).sum()
+        scenarios += len(batch_system)
+        failure_events += int((batch_system < 1).sum())
+        if scenarios < max(2, min_scenarios) or failure_events < max(1, min_failure_events):
+            return False
+        variance = max(0.0, (total_squares - total * total / scenarios) / (scenarios - 1))
+        return math.sqrt(variance / scenarios) <= tolerance
+    
+    converged = False
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    if workers <= 1:
+        for stream, size in zip(streams, sizes):
+            converged = consume(_simulate_batch(kernel, stream, size))
+            if converged:
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(kernel,)) as executor:
+            # One batch per worker at a time, so early stopping wastes at most one round
+            for start in range(0, len(sizes), workers):
+                tasks = list(zip(streams[start:start + workers], sizes[start:start + workers]))
+                for batch in executor.map(_simulate_shard, tasks):
+                    converged = consume(batch)
+                    if converged:
+                        break
+                if converged:
+                    break
+    
+    return AvailabilityResult(applications, available / max(scenarios, 1), np.concatenate(system),
+                              scenarios, converged, root.entropy, failure_events)
+
+def print_availability(result, k=10):
+    """
+    Print the availability distribution and the least available applications
+    
+    Args:
+        result: AvailabilityResult object
+        k (int): Number of least available applications printed
+    """
+    print(f"\n=== Availability Simulation ({result.scenarios} scenarios) ===")
+    print(f"Expected availability: {result.expected_availability * 100:.2f}% of applications "
+          f"(standard error {result.standard_error * 100:.3f}%, {result.failure_events} scenarios losing "
+          f"applications{'' if result.converged else ', not converged'})")
+    tail = ', '.join(f"p{percentile}: {value * 100:.1f}%" for percentile, value in result.percentiles().items())
+    print(f"System availability distribution: {tail}")
+    print(f"Resilience under random failures: {result.resilience_score:.1f}/10")
+    
+    least = result.least_available(k)
+    if least:
+        print("\nLeast available applications:")
+        for rank, entry in enumerate(least, 1):
+            print(f"  {rank}. {entry['application']}: {entry['availability'] * 100:.2f}%")
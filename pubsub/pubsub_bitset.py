@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Bitset Module for the Publish-Subscribe System Model
+
+This module provides compact sets of applications for failure simulation.
+Every application of a typed index gets a dense id (the column order of the
+broker impact matrix), and a set of applications is stored as an array of
+uint64 words with bit i set for application i. Unions, intersections and
+differences are word-wise operations and sizes are popcounts, so combining
+the impact of several failures and comparing them (e.g. the applications
+hit by both Broker-2 and Node-5) never touches application names.
+
+A set takes one bit per application of the system, against roughly 100
+bytes per member for a set of name strings.
+"""
+
+import weakref
+import numpy as np
+from pubsub_matrix import get_broker_impact
+
+WORD_BITS = 64
+
+_bitsets_cache = weakref.WeakKeyDictionary()
+
+# Bits set in every byte value, for NumPy releases without bitwise_count (before 2.0)
+_BYTE_COUNTS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1, dtype=np.uint8)
+
+class ApplicationBitsets:
+    """
+    Dense application ids and bitset construction for one typed index
+    
+    Attributes:
+        applications (list): Application names by id
+        ids (dict): Application name -> id
+        words (int): Number of uint64 words per set
+    """
+    def __init__(self, applications):
+        """
+        Number the applications of the system
+        
+        Args:
+            applications: Application names in id order
+        """
+        self.applications = list(applications)
+        self.ids = {app: i for i, app in enumerate(self.applications)}
+        self.words = (len(self.applications) + WORD_BITS - 1) // WORD_BITS
+    
+    def __len__(self):
+        return len(self.applications)
+    
+    def empty(self):
+        """Get an empty ImpactSet"""
+        return ImpactSet(self, np.zeros(self.words, dtype=np.uint64))
+    
+    def from_ids(self, ids):
+        """
+        Build an ImpactSet from application ids
+        
+        Args:
+            ids: Iterable or array of application ids
+        
+        Returns:
+            ImpactSet: Set of the applications
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        words = np.zeros(self.words, dtype=np.uint64)
+        np.bitwise_or.at(words, ids >> 6, np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64)))
+        return ImpactSet(self, words)
+    
+    def from_names(self, names):
+        """
+        Build an ImpactSet from component names, skipping those that are not applications
+        
+        Args:
+            names: Iterable of component names
+        
+        Returns:
+            ImpactSet: Set of the applications among the names
+        """
+        ids = self.ids
+        return self.from_ids([ids[name] for name in names if name in ids])
+    
+    def from_csr(self, matrix):
+        """
+        Convert the rows of a sparse matrix over the applications into bitsets
+        
+        Args:
+            matrix: Sparse matrix with one column per application, in id order
+        
+        Returns:
+            ndarray: uint64 array of shape (rows, words), one bitset per row
+        """
+        matrix = matrix.tocsr()
+        rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        cols = matrix.indices.astype(np.int64)
+        bits = np.zeros((matrix.shape[0], self.words), dtype=np.uint64)
+        np.bitwise_or.at(bits, (rows, cols >> 6), np.left_shift(np.uint64(1), (cols & 63).astype(np.uint64)))
+        return bits
+    
+    def from_csr_row(self, matrix, row):
+        """
+        Build an ImpactSet from one row of a CSR matrix over the applications
+        
+        Args:
+            matrix: CSR matrix with one column per application, in id order
+            row (int): Row index
+        
+        Returns:
+            ImpactSet: Set of the applications stored in the row
+        """
+        return self.from_ids(matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]])
+    
+    def names(self, words):
+        """
+        Get the application names of a bitset
+        
+        Args:
+            words: uint64 array of one bitset
+        
+        Returns:
+            list: Application names in id order
+        """
+        applications = self.applications
+        return [applications[i] for i in member_ids(words, len(applications)).tolist()]
+
+def member_ids(words, size):
+    """
+    Get the ids of the members of a bitset
+    
+    Args:
+        words: uint64 array of one bitset
+        size (int): Number of applications in the system
+    
+    Returns:
+        ndarray: Sorted member ids
+    """
+    bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), bitorder='little')
+    return np.flatnonzero(bits[:size])
+
+def popcount(words, axis=-1):
+    """
+    Count the members of one or more bitsets
+    
+    Args:
+        words: uint64 array of bitsets, words along the last axis
+        axis (int): Axis holding the words of a set
+    
+    Returns:
+        Member count (int array for several sets)
+    """
+    return _word_counts(words).sum(axis=axis, dtype=np.int64)
+
+def _word_counts(words):
+    """Count the bits set in every word"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    return _BYTE_COUNTS[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+def overlap_counts(bits):
+    """
+    Count the members shared by every pair of bitsets
+    
+    Args:
+        bits: uint64 array of shape (sets, words)
+    
+    Returns:
+        ndarray: Symmetric int array of shape (sets, sets); the diagonal holds the set sizes
+    """
+    counts = np.empty((len(bits), len(bits)), dtype=np.int64)
+    for i in range(len(bits)):
+        counts[i] = popcount(bits & bits[i])
+    return counts
+
+class ImpactSet:
+    """
+    Set of applications stored as a bitset
+    
+    Supports len, iteration over application names, membership tests and
+    the |, &, - operators with other ImpactSets of the same index.
+    
+    Attributes:
+        universe (ApplicationBitsets): Application numbering of the set
+        words (ndarray): uint64 words of the bitset
+    """
+    __slots__ = ('universe', 'words')
+    
+    def __init__(self, universe, words):
+        self.universe = universe
+        self.words = words
+    
+    def __len__(self):
+        return int(popcount(self.words))
+    
+    def __bool__(self):
+        return bool(self.words.any())
+    
+    def __iter__(self):
+        return iter(self.universe.names(self.words))
+    
+    def __contains__(self, app):
+        i = self.universe.ids.get(app)
+        return i is not None and bool((int(self.words[i >> 6]) >> (i & 63)) & 1)
+    
+    def __eq__(self, other):
+        if isinstance(other, ImpactSet):
+            return self.universe is other.universe and np.array_equal(self.words, other.words)
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __or__(self, other):
+        return ImpactSet(self.universe, self.words | other.words)
+    
+    def __and__(self, other):
+        return ImpactSet(self.universe, self.words & other.words)
+    
+    def __sub__(self, other):
+        return ImpactSet(self.universe, self.words & ~other.words)
+    
+    def __repr__(self):
+        return f"ImpactSet({len(self)} of {len(self.universe)} applications)"
+    
+    def overlap(self, other):
+        """Count the applications in both sets"""
+        return int(popcount(self.words & other.words))
+
+def get_application_bitsets(index):
+    """
+    Get the application numbering of a typed index, building it if missing
+    
+    The ids follow the column order of the broker impact matrix, so its
+    rows and those of the failure sweep convert to bitsets directly.
+    
+    Args:
+        index: TypedIndex of the graph
+    
+    Returns:
+        ApplicationBitsets: Application numbering of the index
+    """
+    bitsets = _bitsets_cache.get(index)
+    if bitsets is None:
+        bitsets = ApplicationBitsets(get_broker_impact(index)['applications'])
+        _bitsets_cache[index] = bitsets
+    return bitsets
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Bulk Import Module for the Publish-Subscribe System Model
+
+This module provides functions for writing the graph model as CSV files in the
+neo4j-admin import tool format, and for validating such files offline against
+the import tool's header schema before they are loaded.
+"""
+
+import csv
+import os
+from pubsub_log import get_logger
+
+logger = get_logger(__name__)
+
+# Value types accepted by the import tool in header columns (name:type)
+IMPORT_VALUE_TYPES = {
+    'int', 'long', 'short', 'byte', 'float', 'double', 'boolean', 'char', 'string',
+    'point', 'date', 'localtime', 'time', 'localdatetime', 'datetime', 'duration'
+}
+INTEGER_TYPES = {'int', 'long', 'short', 'byte'}
+FLOAT_TYPES = {'float', 'double'}
+
+def import_type(values):
+    """
+    Infer the import tool value type of a property column
+    
+    Args:
+        values: Property values of the column (None for missing values)
+        
+    Returns:
+        str: Value type name, 'string' when the values are not uniformly numeric or boolean
+    """
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, bool) for value in present):
+        return 'boolean'
+    if present and all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        return 'int'
+    if present and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return 'double'
+    return 'string'
+
+def format_value(value):
+    """Format a property value for an import tool CSV cell"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return value
+
+def _write_import_file(path, id_columns, rows, properties, delimiter):
+    """
+    Write one import tool CSV file with a typed header
+    
+    Args:
+        path (str): Output file path
+        id_columns (list): Leading header columns (ID or START_ID/END_ID)
+        rows (list): List of (id values, properties dict, label or type) tuples
+        properties (list): Property names in column order
+        delimiter (str): Field delimiter
+        
+    Returns:
+        list: Header columns written
+    """
+    types = {key: import_type([row_properties.get(key) for _, row_properties, _ in rows]) for key in properties}
+    header = id_columns + [key if types[key] == 'string' else f"{key}:{types[key]}" for key in properties]
+    header.append(':LABEL' if len(id_columns) == 1 else ':TYPE')
+    
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(header)
+        writer.writerows(
+            list(ids) + [format_value(row_properties.get(key)) for key in properties] + [label]
+            for ids, row_properties, label in rows
+        )
+    return header
+
+def write_bulk_import_files(components, relationships, output_dir="bulk_import", delimiter=";"):
+    """
+    Write nodes and relationships as neo4j-admin import CSV files
+    
+    One file is written per node label and per relationship type. Node names
+    serve as the import IDs (name:ID), and property columns carry their
+    value type (e.g. capacity:int, message_size:int, topic_count:int).
+    
+    Args:
+        components: Dictionary of node lists by component type (from create_complete_graph)
+        relationships: List of relationship dictionaries, including derived DEPENDS_ON
+        output_dir (str): Directory to store the CSV files
+        delimiter (str): Field delimiter
+        
+    Returns:
+        dict: Dictionary with 'nodes' and 'relationships' file path lists and the
+              'command' to run the import
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    
+    nodes_by_label = {}
+    for component_nodes in components.values():
+        for node in component_nodes:
+            nodes_by_label.setdefault(node["label"], []).append(node)
+    
+    relationships_by_type = {}
+    for rel in relationships:
+        relationships_by_type.setdefault(rel["type"], []).append(rel)
+    
+    node_files = []
+    for label, label_nodes in nodes_by_label.items():
+        properties = _property_names(node["properties"] for node in label_nodes)
+        properties.remove("name")
+        rows = [([node["name"]], node["properties"], label) for node in label_nodes]
+        path = os.path.join(output_dir, f"nodes_{label}.csv")
+        _write_import_file(path, ['name:ID'], rows, properties, delimiter)
+        node_files.append(path)
+    
+    relationship_files = []
+    for rel_type, type_relationships in relationships_by_type.items():
+        properties = _property_names(rel["properties"] for rel in type_relationships)
+        rows = [([rel["source"], rel["target"]], rel["properties"], rel_type) for rel in type_relationships]
+        path = os.path.join(output_dir, f"relationships_{rel_type}.csv")
+        _write_import_file(path, [':START_ID', ':END_ID'], rows, properties, delimiter)
+        relationship_files.append(path)
+    
+    command = (f"neo4j-admin database import full --delimiter='{delimiter}' " +
+               " ".join(f"--nodes={path}" for path in node_files) + " " +
+               " ".join(f"--relationships={path}" for path in relationship_files) + " neo4j")
+    
+    logger.info("Bulk import files written to %s:\n  %d node files, %d relationship files\nLoad them offline with:\n  %s",
+                output_dir, len(node_files), len(relationship_files), command)
+    
+    return {
+        'nodes': node_files,
+        'relationships': relationship_files,
+        'command': command
+    }
+
+def _property_names(property_dicts):
+    """Collect property names in first-seen order"""
+    names = {}
+    for properties in property_dicts:
+        names.update(dict.fromkeys(properties))
+    return list(names)
+
+def _parse_header(header, path):
+    """
+    Split header columns into (name, role, value type) triples
+    
+    Returns:
+        list: One (name, role, value type) tuple per column, where role is one of
+              'ID', 'START_ID', 'END_ID', 'LABEL', 'TYPE', 'IGNORE' or None
+    """
+    columns = []
+    for column in header:
+        name, _, spec = column.partition(':')
+        spec_name, _, group = spec.partition('(')
+        if group and not group.endswith(')'):
+            raise ValueError(f"{path}: malformed ID group in column '{column}'")
+        spec_upper = spec_name.upper()
+        if spec_upper in ('ID', 'START_ID', 'END_ID', 'LABEL', 'TYPE', 'IGNORE'):
+            columns.append((name, spec_upper, None))
+        elif spec_name == '':
+            columns.append((name, None, 'string'))
+        else:
+            value_type = spec_name[:-2] if spec_name.endswith('[]') else spec_name
+            if value_type.lower() not in IMPORT_VALUE_TYPES:
+                raise ValueError(f"{path}: unknown value type '{spec_name}' in column '{column}'")
+            columns.append((name, None, spec_name.lower()))
+    return columns
+
+def _check_value(value, value_type):
+    """Check that a non-empty cell parses as its declared value type"""
+    if value_type.endswith('[]'):
+        return all(_check_value(item, value_type[:-2]) for item in value.split(';'))
+    try:
+        if value_type in INTEGER_TYPES:
+            int(value)
+        elif value_type in FLOAT_TYPES:
+            float(value)
+        elif value_type == 'boolean':
+            return value.lower() in ('true', 'false')
+    except ValueError:
+        return False
+    return True
+
+def validate_bulk_import_files(node_files, relationship_files, delimiter=";", max_errors=20):
+    """
+    Validate import tool CSV files without a database
+    
+    Checks that each header follows the import tool schema (exactly one :ID in node
+    files, :START_ID/:END_ID/:TYPE in relationship files, known value types), that
+    every row has one cell per header column and typed cells parse, that node IDs
+    are unique, and that relationships only reference existing nodes.
+    
+    Args:
+        node_files (list): Node CSV file paths
+        relationship_files (list): Relationship CSV file paths
+        delimiter (str): Field delimiter
+        max_errors (int): Number of errors collected before stopping
+        
+    Returns:
+        dict: Dictionary with 'nodes' and 'relationships' row counts
+        
+    Raises:
+        ValueError: If any file violates the schema
+    """
+    errors = []
+    node_ids = set()
+    relationship_count = 0
+    
+    def check_rows(path, required_roles):
+        with open(path, 'r', newline='') as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                errors.append(f"{path}: missing header")
+                return
+            try:
+                columns = _parse_header(header, path)
+            except ValueError as e:
+                errors.append(str(e))
+                return
+            
+            roles = [role for _, role, _ in columns]
+            for role, count in required_roles.items():
+                if roles.count(role) != count:
+                    errors.append(f"{path}: expected {count} :{role} column(s), found {roles.count(role)}")
+                    return
+            
+            for line_number, row in enumerate(reader, start=2):
+                if len(errors) >= max_errors:
+                    return
+                if len(row) != len(columns):
+                    errors.append(f"{path}:{line_number}: expected {len(columns)} fields, found {len(row)}")
+                    continue
+                for (name, role, value_type), value in zip(columns, row):
+                    if value_type and value and not _check_value(value, value_type):
+                        errors.append(f"{path}:{line_number}: '{value}' is not a valid {value_type} for '{name}'")
+                    elif role in ('ID', 'START_ID', 'END_ID', 'TYPE') and not value:
+                        errors.append(f"{path}:{line_number}: empty :{role} value")
+                yield row, roles
+    
+    for path in node_files:
+        for row, roles in check_rows(path, {'ID': 1}) or []:
+            node_id = row[roles.index('ID')]
+            if node_id in node_ids:
+                errors.append(f"{path}: duplicate node ID '{node_id}'")
+            node_ids.add(node_id)
+    
+    for path in relationship_files:
+        for row, roles in check_rows(path, {'START_ID': 1, 'END_ID': 1, 'TYPE': 1}) or []:
+            relationship_count += 1
+            for role in ('START_ID', 'END_ID'):
+                node_id = row[roles.index(role)]
+                if node_id and node_id not in node_ids:
+                    errors.append(f"{path}: :{role} '{node_id}' does not reference a node")
+    
+    if errors:
+        raise ValueError("Invalid bulk import files:\n  " + "\n  ".join(errors[:max_errors]))
+    
+    return {
+        'nodes': len(node_ids),
+        'relationships': relationship_count
+    }
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Cascading Failure Module for the Publish-Subscribe System Model
+
+This module propagates failures transitively through the typed graph until
+nothing else fails. simulate_failure looks one hop out; here a failure can
+starve topics, the applications subscribing to them, the topics those
+applications were the last publisher of, and so on.
+
+Each propagation rule is a condition with a counter of the components that
+still support it, for example the live publishers of a topic or the live
+hosts of an application. A failed component decrements the counters of the
+conditions it supports, and a condition whose counter reaches zero fails its
+owner in the next wave. Every support edge is visited at most once, so a
+scenario runs in O(V + E).
+
+Rules (see CascadeRules):
+- host: a broker or application fails when all nodes it runs on are down
+- publishers: a topic is lost when all of its publishers are down
+- routing: a topic is lost when all brokers routing it are down
+- starvation: an application fails when any ('any') or all ('all') of the
+  topics it subscribes to are lost
+"""
+
+import weakref
+from dataclasses import dataclass, field
+import numpy as np
+import scipy.sparse as sp
+from pubsub_index import get_typed_index
+from pubsub_bitset import get_application_bitsets
+
+# Component types in cascade model order
+CASCADE_TYPES = ('Node', 'Broker', 'Application', 'Topic')
+STARVATION_MODES = ('any', 'all')
+
+_model_cache = weakref.WeakKeyDictionary()
+
+@dataclass(frozen=True, slots=True)
+class CascadeRules:
+    """
+    Propagation rules of a cascade
+    
+    Attributes:
+        host (bool): Services fail when all their hosting nodes are down
+        publishers (bool): Topics are lost when all their publishers are down
+        routing (bool): Topics are lost when all their routing brokers are down
+        starvation (str): Applications fail when 'any' or 'all' of their subscribed
+                          topics are lost, or None to never starve applications
+    """
+    host: bool = True
+    publishers: bool = True
+    routing: bool = True
+    starvation: str = 'any'
+    
+    def __post_init__(self):
+        if self.starvation not in STARVATION_MODES + (None,):
+            raise ValueError(f"Unknown starvation mode '{self.starvation}', "
+                             f"expected one of {', '.join(STARVATION_MODES)} or None")
+
+class CascadeModel:
+    """
+    Failure conditions of a typed graph under a set of cascade rules
+    
+    Attributes:
+        components (list): Component names by id
+        ids (dict): Component name -> id
+        types (list): Component type by id
+        rules (CascadeRules): Rules the conditions were built for
+        supports: Component x condition boolean CSR matrix, True where the
+                  component supports the condition
+        owners (ndarray): Component failed by each condition
+        initial (ndarray): Number of supporters of each condition
+        kinds (list): Rule name of each condition
+    """
+    def __init__(self, index, rules):
+        """
+        Build the failure conditions of a typed index
+        
+        Args:
+            index: TypedIndex of the graph
+            rules: CascadeRules object
+        """
+        self.rules = rules
+        self.components = []
+        self.types = []
+        for component_type in CASCADE_TYPES:
+            for component in index.nodes_of_type(component_type):
+                self.components.append(component)
+                self.types.append(component_type)
+        self.ids = {component: i for i, component in enumerate(self.components)}
+        ids = self.ids
+        
+        owners = []
+        initial = []
+        self.kinds = []
+        support_rows = []
+        support_cols = []
+        
+        def add_condition(owner, supporters, kind):
+            # A condition without supporters never fires: nothing can take it away
+            supporters = [ids[supporter] for supporter in dict.fromkeys(supporters) if supporter in ids]
+            if not supporters:
+                return
+            condition = len(owners)
+            owners.append(ids[owner])
+            initial.append(len(supporters))
+            self.kinds.append(kind)
+            support_rows.extend(supporters)
+            support_cols.extend([condition] * len(supporters))
+        
+        if rules.host:
+            for service_type in ('Broker', 'Application'):
+                for service in index.nodes_of_type(service_type):
+                    add_condition(service, index.hosts(service), 'host')
+        
+        topics = index.nodes_of_type('Topic')
+        if rules.publishers:
+            for topic in topics:
+                add_condition(topic, index.publishers(topic), 'publishers')
+        
+        if rules.routing:
+            routers = {}
+            for broker in index.nodes_of_type('Broker'):
+                for topic in index.routed_topics(broker):
+                    routers.setdefault(topic, []).append(broker)
+            for topic in topics:
+                add_condition(topic, routers.get(topic, ()), 'routing')
+        
+        if rules.starvation:
+            inputs = {}
+            for topic in topics:
+                for app in index.subscribers(topic):
+                    inputs.setdefault(app, []).append(topic)
+            for app in index.nodes_of_type('Application'):
+                if rules.starvation == 'all':
+                    add_condition(app, inputs.get(app, ()), 'starvation')
+                else:
+                    for topic in dict.fromkeys(inputs.get(app, ())):
+                        add_condition(app, (topic,), 'starvation')
+        
+        self.owners = np.asarray(owners, dtype=np.int64)
+        self.initial = np.asarray(initial, dtype=np.int64)
+        self.supports = sp.csr_matrix(
+            (np.ones(len(support_rows), dtype=bool),
+             (np.asarray(support_rows, dtype=np.int64), np.asarray(support_cols, dtype=np.int64))),
+            shape=(len(self.components), len(owners)))
+        
+        # Plain lists for the worklist loop
+        self._supported = [self.supports.indices[start:end].tolist()
+                           for start, end in zip(self.supports.indptr[:-1].tolist(),
+                                                 self.supports.indptr[1:].tolist())]
+        self._owners = self.owners.tolist()
+        self._initial = self.initial.tolist()
+    
+    def propagate(self, failed_ids):
+        """
+        Propagate the failure of some components to a fixpoint
+        
+        Args:
+            failed_ids: Ids of the initially failed components
+        
+        Returns:
+            tuple: (waves, causes) - list of component id lists, one per wave starting
+                   with the initial failures, and a dictionary mapping every id failed
+                   by the cascade to the rule that failed it
+        """
+        supported = self._supported
+        owners = self._owners
+        kinds = self.kinds
+        remaining = list(self._initial)
+        failed = bytearray(len(self.components))
+        
+        wave = []
+        for component in failed_ids:
+            if not failed[component]:
+                failed[component] = 1
+                wave.append(component)
+        
+        waves = [wave]
+        causes = {}
+        while wave:
+            next_wave = []
+            for component in wave:
+                for condition in supported[component]:
+                    remaining[condition] -= 1
+                    if remaining[condition] == 0:
+                        owner = owners[condition]
+                        if not failed[owner]:
+                            failed[owner] = 1
+                            causes[owner] = kinds[condition]
+                            next_wave.append(owner)
+            if next_wave:
+                waves.append(next_wave)
+            wave = next_wave
+        return waves, causes
+
+@dataclass(slots=True)
+class CascadeResult:
+    """
+    Results of a cascading failure
+    
+    Attributes:
+        initial (tuple): Initially failed components
+        waves (list): Lists of the components failed in each wave, starting with the initial failures
+        causes (dict): Component -> rule that failed it, for every component failed by the cascade
+        types (dict): Failed component -> component type
+        impacted (ImpactSet): Failed applications, initial failures included
+        total_applications (int): Number of applications in the system
+    """
+    initial: tuple
+    waves: list = field(default_factory=list)
+    causes: dict = field(default_factory=dict)
+    types: dict = field(default_factory=dict)
+    impacted: object = None
+    total_applications: int = 0
+    
+    @property
+    def depth(self):
+        """Number of waves after the initial failures"""
+        return max(0, len(self.waves) - 1)
+    
+    @property
+    def failed_components(self):
+        """Number of failed components, initial failures included"""
+        return sum(len(wave) for wave in self.waves)
+    
+    @property
+    def impacted_applications(self):
+        """Number of failed applications"""
+        return len(self.impacted) if self.impacted is not None else 0
+    
+    @property
+    def impact_percentage(self):
+        """Percentage of all applications failed"""
+        if self.total_applications == 0:
+            return 0.0
+        return (self.impacted_applications / self.total_applications) * 100
+    
+    @property
+    def resilience_score(self):
+        """Resilience against this cascade on a 0-10 scale"""
+        return max(0, 10 - (self.impact_percentage / 10))
+    
+    def wave_summary(self):
+        """
+        Count the failures of each wave
+        
+        Returns:
+            list: One dictionary per wave mapping component types to failure counts,
+                  plus 'applications', the cumulative number of failed applications
+        """
+        summary = []
+        applications = 0
+        for wave in self.waves:
+            counts = {}
+            for component in wave:
+                component_type = self.types[component]
+                counts[component_type] = counts.get(component_type, 0) + 1
+            applications += counts.get('Application', 0)
+            counts['applications'] = applications
+            summary.append(counts)
+        return summary
+
+def get_cascade_model(index, rules=None):
+    """
+    Get the cascade model of a typed index, building it if missing
+    
+    Args:
+        index: TypedIndex of the graph
+        rules: CascadeRules object (default rules if not given)
+    
+    Returns:
+        CascadeModel: Failure conditions of the index under the rules
+    """
+    rules = rules or CascadeRules()
+    models = _model_cache.setdefault(index, {})
+    model = models.get(rules)
+    if model is None:
+        model = CascadeModel(index, rules)
+        models[rules] = model
+    return model
+
+def simulate_cascade(G, failed_components, rules=None, index=None):
+    """
+    Simulate a cascading failure starting from one or more components
+    
+    Args:
+        G: NetworkX graph object
+        failed_components: Component name, or iterable of names, failing initially
+        rules: CascadeRules object (default rules if not given)
+        index: TypedIndex of G (built if not given)
+    
+    Returns:
+        CascadeResult: Cascade waves and impact
+    
+    Raises:
+        ValueError: If a failed component is not a broker, node, application or topic of G
+    """
+    if index is None:
+        index = get_typed_index(G)
+    model = get_cascade_model(index, rules)
+    
+    if isinstance(failed_components, (list, tuple, set, frozenset)):
+        failed_components = tuple(failed_components)
+    else:
+        failed_components = (failed_components,)
+    unknown = [component for component in failed_components if component not in model.ids]
+    if unknown:
+        raise ValueError(f"Unknown components: {', '.join(str(component) for component in unknown)}")
+    
+    waves, causes = model.propagate([model.ids[component] for component in failed_components])
+    
+    components = model.components
+    bitsets = get_application_bitsets(index)
+    result = CascadeResult(failed_components, total_applications=len(bitsets))
+    result.waves = [[components[i] for i in wave] for wave in waves]
+    result.causes = {components[i]: rule for i, rule in causes.items()}
+    result.types = {components[i]: model.types[i] for wave in waves for i in wave}
+    result.impacted = bitsets.from_names(
+        component for wave in result.waves for component in wave if result.types[component] == 'Application')
+    return result
+
+def run_cascade_simulations(G, critical_components, rules=None, index=None):
+    """
+    Run cascading failure simulations on the identified critical components
+    
+    Args:
+        G: NetworkX graph object
+        critical_components: Dictionary with critical component information (see get_simulation_targets)
+        rules: CascadeRules object (default rules if not given)
+        index: TypedIndex of G (built if not given)
+    
+    Returns:
+        dict: Dictionary mapping component types to CascadeResult objects
+    """
+    if index is None:
+        index = get_typed_index(G)
+    
+    return {component_type: simulate_cascade(G, critical_components[component_type]['node'], rules, index)
+            for component_type in ('broker', 'node', 'application', 'topic')
+            if component_type in critical_components}
+
+def print_cascade(result, max_components=10):
+    """
+    Print the waves of a cascading failure
+    
+    Args:
+        result: CascadeResult object
+        max_components (int): Number of components listed per wave
+    """
+    initial = ', '.join(str(component) for component in result.initial)
+    print(f"\n=== Cascading Failure of {initial} ===")
+    for wave_number, (wave, counts) in enumerate(zip(result.waves, result.wave_summary())):
+        by_type = ', '.join(f"{count} {component_type.lower()}{'s' if count != 1 else ''}"
+                            for component_type, count in counts.items() if component_type != 'applications')
+        label = "Initial failure" if wave_number == 0 else f"Wave {wave_number}"
+        print(f"{label}: {by_type} ({counts['applications']} applications failed so far)")
+        if wave_number > 0:
+            for component in wave[:max_components]:
+                print(f"  - {component} ({result.causes[component]})")
+            if len(wave) > max_components:
+                print(f"  ... and {len(wave) - max_components} more components")
+    
+    print(f"Cascade depth: {result.depth} ({result.failed_components} components failed)")
+    print(f"System Impact: {result.impact_percentage:.1f}% of applications failed "
+          f"(resilience {result.resilience_score:.1f}/10)")
+
+def print_cascade_simulations(cascades):
+    """
+    Print the cascading failure of each simulated critical component
+    
+    Args:
+        cascades: Result of run_cascade_simulations
+    """
+    if not cascades:
+        print("\nNo critical components identified for cascade simulation.")
+        return
+    
+    print("\n=== Cascading Failure Simulation ===")
+    for cascade in cascades.values():
+        print_cascade(cascade)
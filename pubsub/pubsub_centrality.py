@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Centrality Module for the Publish-Subscribe System Model
+
+This module provides centrality scores for the component layers of the
+model, such as the infrastructure CONNECTS_TO layer between nodes and the
+DEPENDS_ON layer between applications.
+
+Betweenness centrality is computed from single-source shortest path
+accumulations, so the sources can be split into chunks and run in a process
+pool (exact mode) or sampled as pivots (approximate mode, with a pivot
+count or an additive error bound). Harmonic centrality can be estimated the
+same way from sampled sources, and degree centrality is offered as the
+cheapest proxy. Results are cached per typed index, so each graph version
+computes a given score once.
+"""
+
+import math
+import os
+import random
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+import networkx as nx
+from pubsub_index import get_typed_index
+
+MEASURES = ('betweenness', 'harmonic', 'degree')
+MODES = ('exact', 'approximate')
+
+_centrality_cache = weakref.WeakKeyDictionary()
+
+def pivot_count(num_nodes, epsilon, delta=0.1):
+    """
+    Number of sampled pivots that bounds the error of approximate betweenness
+    
+    By Hoeffding's inequality and a union bound over the nodes, sampling
+    ln(2n / delta) / (2 * epsilon^2) pivots keeps every normalized score
+    within epsilon of the exact value with probability at least 1 - delta.
+    
+    Args:
+        num_nodes (int): Number of nodes in the layer
+        epsilon (float): Additive error bound on normalized scores
+        delta (float): Allowed probability of exceeding the bound
+    
+    Returns:
+        int: Pivot count (at most num_nodes)
+    """
+    if epsilon <= 0 or not 0 < delta < 1:
+        raise ValueError("epsilon must be positive and delta must be between 0 and 1")
+    if num_nodes < 2:
+        return num_nodes
+    return min(num_nodes, math.ceil(math.log(2 * num_nodes / delta) / (2 * epsilon ** 2)))
+
+def layer_subgraph(G, node_type, index=None):
+    """
+    Get the subgraph induced by the components of one type
+    
+    For Node this is the infrastructure CONNECTS_TO layer, for Application
+    the DEPENDS_ON layer and for Broker the broker CONNECTS_TO layer.
+    
+    Args:
+        G: NetworkX graph object
+        node_type (str): Component type
+        index: TypedIndex of G (built if not given)
+    
+    Returns:
+        Graph: Subgraph view of G
+    """
+    if index is None:
+        index = get_typed_index(G)
+    return G.subgraph(index.nodes_of_type(node_type))
+
+def layer_centrality(G, node_type, measure='betweenness', mode='exact', pivots=None, epsilon=None,
+                     delta=0.1, workers=1, seed=None, index=None):
+    """
+    Compute a centrality score for every component in one layer
+    
+    Args:
+        G: NetworkX graph object
+        node_type (str): Component type of the layer (e.g. 'Node' or 'Application')
+        measure (str): 'betweenness', 'harmonic' or 'degree'
+        mode (str): 'exact', or 'approximate' to sample source pivots
+        pivots (int): Number of pivots in approximate mode
+        epsilon (float): Additive error bound in approximate mode, used when pivots is not set
+        delta (float): Probability of exceeding epsilon
+        workers (int): Worker processes sharing the sources (1 runs in this process)
+        seed (int): Seed of the pivot sample
+        index: TypedIndex of G (built if not given)
+    
+    Returns:
+        dict: Dictionary mapping components to scores normalized to [0, 1]
+            (sampled estimates can exceed 1)
+    """
+    if measure not in MEASURES:
+        raise ValueError(f"Unknown centrality measure: {measure}")
+    if mode not in MODES:
+        raise ValueError(f"Unknown centrality mode: {mode}")
+    if index is None:
+        index = get_typed_index(G)
+    
+    key = (node_type, measure, mode, pivots, epsilon, delta, seed)
+    cache = _centrality_cache.setdefault(index, {})
+    if key not in cache:
+        layer = nx.DiGraph() if G.is_directed() else nx.Graph()
+        layer.add_nodes_from(index.nodes_of_type(node_type))
+        layer.add_edges_from(layer_subgraph(G, node_type, index).edges())
+        
+        if measure == 'degree':
+            scores = nx.degree_centrality(layer) if len(layer) > 1 else dict.fromkeys(layer, 0.0)
+        else:
+            sources = _sources(layer, mode, pivots, epsilon, delta, seed)
+            if measure == 'betweenness':
+                scores = _betweenness(layer, sources, workers)
+            else:
+                scores = _harmonic(layer, sources, workers)
+        cache[key] = scores
+    return cache[key]
+
+def _sources(layer, mode, pivots, epsilon, delta, seed):
+    """Choose the source nodes: all of them in exact mode, a random sample in approximate mode"""
+    nodes = list(layer)
+    if mode == 'exact':
+        return nodes
+    if pivots is None:
+        if epsilon is None:
+            raise ValueError("Approximate centrality needs a pivot count or an error bound")
+        pivots = pivot_count(len(nodes), epsilon, delta)
+    if pivots >= len(nodes):
+        return nodes
+    return random.Random(seed).sample(nodes, max(1, pivots))
+
+def _chunks(sources, workers):
+    """Split the sources into one contiguous chunk per worker"""
+    size = math.ceil(len(sources) / workers)
+    return [sources[i:i + size] for i in range(0, len(sources), size)]
+
+def _run_sharded(function, layer, sources, workers):
+    """Run a per-source-chunk function over the sources, in a process pool when workers > 1"""
+    workers = min(workers or os.cpu_count() or 1, max(1, len(sources)))
+    tasks = [(layer, chunk) for chunk in _chunks(sources, workers)] if sources else []
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(function, tasks))
+    else:
+        partials = [function(task) for task in tasks]
+    
+    totals = dict.fromkeys(layer, 0.0)
+    for partial in partials:
+        for node, value in partial.items():
+            totals[node] += value
+    return totals
+
+def _betweenness_shard(task):
+    """Sum the betweenness dependencies accumulated from a chunk of sources"""
+    layer, sources = task
+    return nx.betweenness_centrality_subset(layer, sources, list(layer), normalized=False)
+
+def _betweenness(layer, sources, workers):
+    """Betweenness normalized like nx.betweenness_centrality, scaled up when sources are sampled"""
+    n = len(layer)
+    totals = _run_sharded(_betweenness_shard, layer, sources, workers)
+    if n <= 2:
+        return totals
+    
+    # The subset sums halve undirected scores; normalization counts ordered pairs
+    scale = (1 if layer.is_directed() else 2) / ((n - 1) * (n - 2))
+    scale *= n / len(sources)
+    return {node: value * scale for node, value in totals.items()}
+
+def _harmonic_shard(task):
+    """Sum the reciprocal distances from a chunk of sources"""
+    layer, sources = task
+    return nx.harmonic_centrality(layer, sources=sources)
+
+def _harmonic(layer, sources, workers):
+    """Harmonic centrality normalized by n - 1, scaled up when sources are sampled"""
+    n = len(layer)
+    totals = _run_sharded(_harmonic_shard, layer, sources, workers)
+    if n <= 1:
+        return totals
+    scale = n / len(sources) / (n - 1)
+    return {node: value * scale for node, value in totals.items()}
+
+def centrality_options(args):
+    """
+    Collect the centrality options of parsed command line arguments
+    
+    Args:
+        args: Parsed command line arguments
+    
+    Returns:
+        dict: Keyword arguments for layer_centrality
+    """
+    return {
+        'measure': args.centrality,
+        'mode': args.centrality_mode,
+        'pivots': args.centrality_pivots,
+        'epsilon': args.centrality_epsilon,
+        'workers': args.workers
+    }
+
+def centrality_rule_options(args):
+    """
+    Collect the options of the centrality criticality rule from parsed command line arguments
+    
+    Args:
+        args: Parsed command line arguments
+    
+    Returns:
+        dict: centrality argument for identify_critical_components, or None if the rule is off
+    """
+    if args.centrality_threshold is None:
+        return None
+    return dict(centrality_options(args), threshold=args.centrality_threshold)
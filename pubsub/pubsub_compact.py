@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+Compact Graph Module for the Publish-Subscribe System Model
+
+This module provides PubSubGraph, an array-backed representation of the
+system graph. Nodes are int32 ids with a uint8 type code and a packed name
+table, node and edge properties are stored column-wise, and the edges of
+each relationship type are kept as forward and reverse CSR arrays.
+A to_networkx/from_networkx bridge keeps the NetworkX-based analysis
+functions usable on the same data.
+
+Because every relationship type is a separate layer over one node table,
+parallel edges of different types between the same two components (e.g. an
+application that both publishes and subscribes to a topic) are all kept,
+which a DiGraph cannot do without the cost of a MultiDiGraph.
+"""
+
+from array import array
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+NODE_TYPES = ("Application", "Broker", "Topic", "Node")
+EDGE_TYPES = ("RUNS_ON", "PUBLISHES_TO", "SUBSCRIBES_TO", "ROUTES", "DEPENDS_ON", "CONNECTS_TO")
+
+class PropertyColumn:
+    """
+    Column-wise storage of one node or edge property
+    
+    Integer and float values are stored in a NumPy array; any other values
+    are dictionary-encoded as int32 codes into a table of distinct values.
+    Missing values are tracked with a mask, which is omitted when every
+    row has a value.
+    
+    Attributes:
+        values: NumPy array of values or of codes into categories
+        categories (list): Distinct values for dictionary-encoded columns, else None
+        present: Boolean mask of rows that have a value, or None if all do
+    """
+    def __init__(self, values):
+        """
+        Build a column from a list of values (None for missing)
+        
+        Args:
+            values (list): Row values
+        """
+        present = np.fromiter((value is not None for value in values), dtype=bool, count=len(values))
+        filled = [value for value in values if value is not None]
+        self.present = None if present.all() else present
+        self.categories = None
+        
+        if filled and all(type(value) is int for value in filled):
+            self.values = np.zeros(len(values), dtype=np.int64)
+            self.values[present] = filled
+        elif filled and all(type(value) in (int, float) for value in filled):
+            self.values = np.zeros(len(values), dtype=np.float64)
+            self.values[present] = filled
+        else:
+            codes = {}
+            self.values = np.full(len(values), -1, dtype=np.int32)
+            self.values[present] = [codes.setdefault(value, len(codes)) for value in filled]
+            self.categories = list(codes)
+    
+    def get(self, row, default=None):
+        """
+        Get the value of a row
+        
+        Args:
+            row (int): Row index
+            default: Value returned if the row has no value
+            
+        Returns:
+            Row value or default
+        """
+        if self.present is not None and not self.present[row]:
+            return default
+        value = self.values[row]
+        return self.categories[value] if self.categories is not None else value.item()
+    
+    def nbytes(self):
+        """Approximate memory used by the column arrays"""
+        return self.values.nbytes + (self.present.nbytes if self.present is not None else 0)
+
+class PubSubGraph:
+    """
+    Array-backed graph of the publish-subscribe system
+    
+    Attributes:
+        node_types (tuple): Node type names, indexed by type code
+        edge_types (tuple): Relationship type names
+        type_codes: uint8 array of node type codes, indexed by node id
+        node_properties (dict): PropertyColumn per node property name
+        edge_properties (dict): Per relationship type, PropertyColumn per property
+            name in forward CSR order
+    """
+    def __init__(self, names, types, relationships, node_properties=None, edge_properties=None):
+        """
+        Build the graph from node and relationship arrays
+        
+        Args:
+            names (list): Node names, indexed by node id
+            types (list): Node type names, indexed by node id
+            relationships (dict): Per relationship type, a (sources, targets) pair of node id arrays
+            node_properties (dict): Per property name, a list of values indexed by node id
+            edge_properties (dict): Per relationship type, a dict of property value lists
+                aligned with that type's (sources, targets) arrays
+        """
+        count = len(names)
+        
+        # Packed UTF-8 name table with offsets instead of one Python string per node
+        encoded = [name.encode("utf-8") for name in names]
+        self._name_offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum([len(name) for name in encoded], out=self._name_offsets[1:])
+        self._name_data = b"".join(encoded)
+        self._ids = None
+        
+        self.node_types = tuple(dict.fromkeys(NODE_TYPES + tuple(types)))
+        type_index = {node_type: code for code, node_type in enumerate(self.node_types)}
+        self.type_codes = np.fromiter((type_index[node_type] for node_type in types), dtype=np.uint8, count=count)
+        
+        self.node_properties = {key: PropertyColumn(values) for key, values in (node_properties or {}).items()}
+        
+        self.edge_types = tuple(relationships)
+        self._forward = {}
+        self._reverse = {}
+        self.edge_properties = {}
+        edge_properties = edge_properties or {}
+        for rel_type, (sources, targets) in relationships.items():
+            sources = np.asarray(sources, dtype=np.int32)
+            targets = np.asarray(targets, dtype=np.int32)
+            order = np.argsort(sources, kind="stable")
+            self._forward[rel_type] = (_indptr(sources, count), targets[order])
+            
+            # Reverse CSR; edge ids map each reverse entry to its forward position
+            forward_sources = sources[order]
+            reverse_order = np.argsort(targets[order], kind="stable").astype(np.int32)
+            self._reverse[rel_type] = (_indptr(targets, count), forward_sources[reverse_order], reverse_order)
+            
+            self.edge_properties[rel_type] = {
+                key: PropertyColumn([values[i] for i in order.tolist()])
+                for key, values in edge_properties.get(rel_type, {}).items()
+            }
+    
+    @property
+    def num_nodes(self):
+        """Number of nodes in the graph"""
+        return len(self.type_codes)
+    
+    def num_edges(self, rel_type=None):
+        """
+        Count edges
+        
+        Args:
+            rel_type (str): Relationship type, or None for all types
+            
+        Returns:
+            int: Number of edges
+        """
+        rel_types = self.edge_types if rel_type is None else [rel_type]
+        return sum(len(self._forward[t][1]) for t in rel_types if t in self._forward)
+    
+    def node_name(self, node_id):
+        """Get the name of a node id"""
+        start, end = self._name_offsets[node_id], self._name_offsets[node_id + 1]
+        return self._name_data[start:end].decode("utf-8")
+    
+    def node_names(self, node_ids=None):
+        """
+        Get the names of node ids
+        
+        Args:
+            node_ids: Iterable of node ids, or None for all nodes in id order
+            
+        Returns:
+            list: Node names
+        """
+        if node_ids is None:
+            node_ids = range(self.num_nodes)
+        return [self.node_name(node_id) for node_id in node_ids]
+    
+    def node_id(self, name):
+        """
+        Get the id of a node name
+        
+        The name-to-id dictionary is only built on first use.
+        
+        Args:
+            name (str): Node name
+            
+        Returns:
+            int: Node id
+        """
+        if self._ids is None:
+            self._ids = {node_name: node_id for node_id, node_name in enumerate(self.node_names())}
+        return self._ids[name]
+    
+    def node_type(self, node_id):
+        """Get the type name of a node id"""
+        return self.node_types[self.type_codes[node_id]]
+    
+    def nodes_of_type(self, node_type):
+        """
+        Get the ids of all nodes of a type
+        
+        Args:
+            node_type (str): Node type name
+            
+        Returns:
+            ndarray: Node ids in ascending order
+        """
+        if node_type not in self.node_types:
+            return np.zeros(0, dtype=np.int32)
+        return np.flatnonzero(self.type_codes == self.node_types.index(node_type)).astype(np.int32)
+    
+    def successors(self, node_id, rel_type):
+        """
+        Get the targets of a node's outgoing edges of one type
+        
+        Returns:
+            ndarray: Target node ids (a view into the CSR arrays)
+        """
+        if rel_type not in self._forward:
+            return np.zeros(0, dtype=np.int32)
+        indptr, indices = self._forward[rel_type]
+        return indices[indptr[node_id]:indptr[node_id + 1]]
+    
+    def predecessors(self, node_id, rel_type):
+        """
+        Get the sources of a node's incoming edges of one type
+        
+        Returns:
+            ndarray: Source node ids (a view into the CSR arrays)
+        """
+        if rel_type not in self._reverse:
+            return np.zeros(0, dtype=np.int32)
+        indptr, indices, _ = self._reverse[rel_type]
+        return indices[indptr[node_id]:indptr[node_id + 1]]
+    
+    def out_degree(self, rel_type):
+        """Get the out-degree of every node for one relationship type"""
+        if rel_type not in self._forward:
+            return np.zeros(self.num_nodes, dtype=np.int64)
+        return np.diff(self._forward[rel_type][0])
+    
+    def in_degree(self, rel_type):
+        """Get the in-degree of every node for one relationship type"""
+        if rel_type not in self._reverse:
+            return np.zeros(self.num_nodes, dtype=np.int64)
+        return np.diff(self._reverse[rel_type][0])
+    
+    def edges(self, rel_type):
+        """
+        Get all edges of one relationship type
+        
+        Returns:
+            tuple: (sources, targets) node id arrays in forward CSR order
+        """
+        if rel_type not in self._forward:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+        indptr, indices = self._forward[rel_type]
+        sources = np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(indptr))
+        return sources, indices
+    
+    def iter_edges(self, rel_type):
+        """
+        Iterate over the edges of one relationship type with their properties
+        
+        Returns:
+            generator: Generator of (source name, target name, properties dict) tuples
+        """
+        sources, targets = self.edges(rel_type)
+        columns = list(self.edge_properties.get(rel_type, {}).items())
+        for edge, (source, target) in enumerate(zip(sources.tolist(), targets.tolist())):
+            properties = {key: value for key, column in columns if (value := column.get(edge)) is not None}
+            yield self.node_name(source), self.node_name(target), properties
+    
+    def adjacency(self, rel_type):
+        """
+        Get the adjacency matrix of one relationship type
+        
+        The matrix shares the CSR arrays of the graph; parallel edges appear
+        as summed entries.
+        
+        Returns:
+            csr_matrix: num_nodes x num_nodes int8 matrix
+        """
+        indptr, indices = self._forward.get(rel_type, (np.zeros(self.num_nodes + 1, dtype=np.int64),
+                                                       np.zeros(0, dtype=np.int32)))
+        data = np.ones(len(indices), dtype=np.int8)
+        return sp.csr_matrix((data, indices, indptr), shape=(self.num_nodes, self.num_nodes))
+    
+    def join(self, *steps):
+        """
+        Join relationship layers along a path of steps
+        
+        Each step is a relationship type, followed from source to target, or a
+        (relationship type, "in") pair to follow it from target to source.
+        For example join("PUBLISHES_TO", ("ROUTES", "in")) relates each
+        application to the brokers routing the topics it publishes to.
+        
+        Args:
+            *steps: Relationship types or (relationship type, direction) pairs
+            
+        Returns:
+            csr_matrix: num_nodes x num_nodes matrix counting the paths between nodes
+        """
+        result = None
+        for step in steps:
+            rel_type, direction = (step, "out") if isinstance(step, str) else step
+            matrix = self.adjacency(rel_type).astype(np.int32)
+            if direction == "in":
+                matrix = matrix.T.tocsr()
+            result = matrix if result is None else result @ matrix
+        return result
+    
+    def reachable(self, node_id, *steps):
+        """
+        Get the nodes reached from one node along a path of steps
+        
+        Args:
+            node_id (int): Start node id
+            *steps: Relationship types or (relationship type, direction) pairs, as in join()
+            
+        Returns:
+            ndarray: Sorted ids of the nodes at the end of the path
+        """
+        frontier = np.array([node_id], dtype=np.int32)
+        for step in steps:
+            rel_type, direction = (step, "out") if isinstance(step, str) else step
+            neighbors = self.successors if direction == "out" else self.predecessors
+            parts = [neighbors(node, rel_type) for node in frontier.tolist()]
+            frontier = np.unique(np.concatenate(parts)) if parts else frontier[:0]
+        return frontier
+    
+    def type_counts(self):
+        """
+        Count nodes per type
+        
+        Returns:
+            dict: Dictionary mapping node type names to counts
+        """
+        counts = np.bincount(self.type_codes, minlength=len(self.node_types))
+        return {node_type: int(count) for node_type, count in zip(self.node_types, counts) if count}
+    
+    def memory_usage(self):
+        """
+        Estimate the memory held by the graph arrays
+        
+        Returns:
+            int: Size in bytes
+        """
+        total = self._name_offsets.nbytes + len(self._name_data) + self.type_codes.nbytes
+        total += sum(column.nbytes() for column in self.node_properties.values())
+        for rel_type in self.edge_types:
+            total += sum(array.nbytes for array in self._forward[rel_type] + self._reverse[rel_type])
+            total += sum(column.nbytes() for column in self.edge_properties[rel_type].values())
+        return total
+    
+    @classmethod
+    def from_components(cls, components, relationships):
+        """
+        Build the graph directly from the in-memory model, without NetworkX
+        
+        Unlike a DiGraph, parallel edges of different types between the same
+        pair of nodes are all kept.
+        
+        Args:
+            components: Dictionary of node lists by component type (from create_complete_graph)
+            relationships: List of relationship dictionaries
+            
+        Returns:
+            PubSubGraph: Compact graph
+        """
+        nodes = [node for component_nodes in components.values() for node in component_nodes]
+        return cls.from_records(nodes, relationships)
+    
+    @classmethod
+    def from_records(cls, nodes, relationships):
+        """
+        Build the graph from node and relationship dictionaries
+        
+        Args:
+            nodes: List of node dictionaries (label, name, properties)
+            relationships: List of relationship dictionaries (source, target, type, properties)
+            
+        Returns:
+            PubSubGraph: Compact graph
+        """
+        builder = PubSubGraphBuilder()
+        for node in nodes:
+            # As in neo4j_to_networkx, the label takes the place of a 'type' property
+            builder.add_node(node["name"], node["label"],
+                             {k: v for k, v in node["properties"].items() if k not in ("name", "type")})
+        for rel in relationships:
+            builder.add_edge(rel["source"], rel["target"], rel["type"], rel["properties"])
+        return builder.build()
+    
+    @classmethod
+    def from_networkx(cls, G):
+        """
+        Build the graph from a NetworkX graph with 'type' node and edge attributes
+        
+        Args:
+            G: NetworkX graph object
+            
+        Returns:
+            PubSubGraph: Compact graph
+        """
+        names = list(G.nodes())
+        ids = {name: node_id for node_id, name in enumerate(names)}
+        types = [attrs.get("type") for _, attrs in G.nodes(data=True)]
+        
+        node_keys = dict.fromkeys(key for _, attrs in G.nodes(data=True) for key in attrs if key != "type")
+        node_properties = {key: [attrs.get(key) for _, attrs in G.nodes(data=True)] for key in node_keys}
+        
+        edges = {}
+        edge_rows = {}
+        for u, v, attrs in G.edges(data=True):
+            rel_type = attrs.get("type")
+            sources, targets = edges.setdefault(rel_type, ([], []))
+            sources.append(ids[u])
+            targets.append(ids[v])
+            edge_rows.setdefault(rel_type, []).append(attrs)
+        
+        edge_properties = {}
+        for rel_type, rows in edge_rows.items():
+            keys = dict.fromkeys(key for attrs in rows for key in attrs if key != "type")
+            edge_properties[rel_type] = {key: [attrs.get(key) for attrs in rows] for key in keys}
+        
+        return cls(names, types, edges, node_properties, edge_properties)
+    
+    def to_networkx(self):
+        """
+        Convert the graph to a NetworkX DiGraph
+        
+        Relationship types are added in edge_types order, so when several
+        edges connect the same pair of nodes the last type wins, as in
+        neo4j_to_networkx.
+        
+        Returns:
+            DiGraph: NetworkX graph with 'type' node and edge attributes
+        """
+        G = nx.DiGraph()
+        names = self.node_names()
+        
+        node_columns = list(self.node_properties.items())
+        G.add_nodes_from(
+            (names[node_id], {"type": self.node_type(node_id),
+                              **{key: value for key, column in node_columns
+                                 if (value := column.get(node_id)) is not None}})
+            for node_id in range(self.num_nodes)
+        )
+        
+        for rel_type in self.edge_types:
+            sources, targets = self.edges(rel_type)
+            edge_columns = list(self.edge_properties[rel_type].items())
+            G.add_edges_from(
+                (names[source], names[target], {**{key: value for key, column in edge_columns
+                                                   if (value := column.get(edge)) is not None},
+                                                "type": rel_type})
+                for edge, (source, target) in enumerate(zip(sources.tolist(), targets.tolist()))
+            )
+        
+        return G
+
+class PubSubGraphBuilder:
+    """
+    Incremental builder for PubSubGraph
+    
+    Collects nodes and typed edges one at a time, e.g. while streaming query
+    results, and builds the graph arrays once at the end. Edges may refer to
+    nodes that were not added; such nodes get no type, as with NetworkX
+    add_edge.
+    """
+    def __init__(self):
+        self._ids = {}
+        self._names = []
+        self._types = []
+        self._node_properties = {}
+        self._sources = {}
+        self._targets = {}
+        self._edge_properties = {}
+    
+    def _node_id(self, name, node_type=None):
+        """Get the id of a node name, adding the node if it is new"""
+        node_id = self._ids.get(name)
+        if node_id is None:
+            node_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._types.append(node_type)
+        return node_id
+    
+    def add_node(self, name, node_type, properties=None):
+        """
+        Add a node, or update the type and properties of an existing one
+        
+        Args:
+            name (str): Node name
+            node_type (str): Node type
+            properties (dict): Node properties
+        """
+        node_id = self._node_id(name, node_type)
+        self._types[node_id] = node_type
+        for key, value in (properties or {}).items():
+            _set_value(self._node_properties.setdefault(key, []), node_id, value)
+    
+    def add_edge(self, source, target, rel_type, properties=None):
+        """
+        Add an edge to the layer of its relationship type
+        
+        Args:
+            source (str): Source node name
+            target (str): Target node name
+            rel_type (str): Relationship type
+            properties (dict): Relationship properties
+        """
+        sources = self._sources.setdefault(rel_type, array("i"))
+        edge = len(sources)
+        sources.append(self._node_id(source))
+        self._targets.setdefault(rel_type, array("i")).append(self._node_id(target))
+        columns = self._edge_properties.setdefault(rel_type, {})
+        for key, value in (properties or {}).items():
+            _set_value(columns.setdefault(key, []), edge, value)
+    
+    def build(self):
+        """
+        Build the compact graph from the collected nodes and edges
+        
+        Returns:
+            PubSubGraph: Compact graph
+        """
+        count = len(self._names)
+        node_properties = {key: _padded(values, count) for key, values in self._node_properties.items()}
+        edges = {}
+        edge_properties = {}
+        for rel_type, sources in self._sources.items():
+            edges[rel_type] = (np.frombuffer(sources, dtype=np.intc),
+                               np.frombuffer(self._targets[rel_type], dtype=np.intc))
+            edge_properties[rel_type] = {key: _padded(values, len(sources))
+                                         for key, values in self._edge_properties[rel_type].items()}
+        return PubSubGraph(self._names, self._types, edges, node_properties, edge_properties)
+
+def _set_value(values, row, value):
+    """Set one row of a property value list, padding skipped rows with None"""
+    if len(values) <= row:
+        values.extend([None] * (row - len(values)))
+        values.append(value)
+    else:
+        values[row] = value
+
+def _padded(values, count):
+    """Pad a property value list with None to count rows"""
+    return values + [None] * (count - len(values))
+
+def _indptr(rows, count):
+    """Build a CSR row pointer array from unsorted row ids"""
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=count), out=indptr[1:])
+    return indptr
@@ -42,13 +42,14 @@ class SystemConfig:
             raise ValueError("System must have at least 1 application")
         if num_topics < 1:
             raise ValueError("System must have at least 1 topic")
-            
-        # Print configuration summary
+    
+    def print_summary(self):
+        """Print a summary of the configuration"""
         print(f"System Configuration:")
-        print(f"  Brokers: {num_brokers}")
-        print(f"  Nodes: {num_nodes}")
-        print(f"  Applications: {num_applications}")
-        print(f"  Topics: {num_topics}")
+        print(f"  Brokers: {self.num_brokers}")
+        print(f"  Nodes: {self.num_nodes}")
+        print(f"  Applications: {self.num_applications}")
+        print(f"  Topics: {self.num_topics}")
 
 def parse_args():
     """
@@ -63,6 +64,12 @@ def parse_args():
     parser.add_argument('--apps', type=int, default=10, help='Number of applications (default: 10)')
     parser.add_argument('--topics', type=int, default=25, help='Number of topics (default: 25)')
     parser.add_argument('--no-neo4j', action='store_true', help='Skip Neo4j database operations')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='Rows per batched Neo4j write, 0 to write one entity at a time (default: 1000)')
+    parser.add_argument('--placement', choices=['least_loaded', 'capacity_weighted', 'random'], default='least_loaded',
+                        help='Strategy for placing brokers and applications on nodes (default: least_loaded)')
+    parser.add_argument('--bulk-dir', type=str, default=None,
+                        help='Write neo4j-admin import CSV files to this directory instead of writing to Neo4j')
     parser.add_argument('--no-viz', action='store_true', help='Skip visualizations')
     args = parser.parse_args()
     
@@ -88,6 +95,7 @@ if __name__ == "__main__":
         num_applications=args.apps,
         num_topics=args.topics
     )
+    config.print_summary()
     
     print("\nConfiguration module can be imported in other scripts.")
     print("Run the main analysis script with: python pubsub_main.py [options]")
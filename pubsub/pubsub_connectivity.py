@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Layer Connectivity Module for the Publish-Subscribe System Model
+
+This module provides BlockCutTree, the block-cut tree of an undirected
+CONNECTS_TO layer (brokers or infrastructure nodes). It is built once with
+a linear-time biconnected component decomposition and then answers
+articulation point, bridge and "what happens if X is removed" queries
+without touching the graph again.
+
+Trees are cached per typed index, so criticality rules, recommendations and
+failure simulation on the same graph version share one computation.
+"""
+
+import weakref
+import networkx as nx
+
+_tree_cache = weakref.WeakKeyDictionary()
+
+class BlockCutTree:
+    """
+    Block-cut tree of an undirected layer graph
+    
+    Attributes:
+        articulation_points (frozenset): Components whose removal disconnects the layer
+        bridges (frozenset): Edges (as frozenset pairs) whose removal disconnects the layer
+        blocks (list): Biconnected blocks (frozensets of components)
+    """
+    def __init__(self, nodes, edges):
+        """
+        Decompose a layer into blocks and precompute the removal effect of every component
+        
+        Args:
+            nodes: Iterable of layer components
+            edges: Iterable of (source, target) connections between them
+        """
+        graph = nx.Graph()
+        graph.add_nodes_from(nodes)
+        graph.add_edges_from(edges)
+        
+        self.blocks = [frozenset(block) for block in nx.biconnected_components(graph)]
+        self.bridges = frozenset(frozenset(edge) for edge in nx.bridges(graph))
+        
+        self._blocks_of = {}
+        for i, block in enumerate(self.blocks):
+            for node in block:
+                self._blocks_of.setdefault(node, []).append(i)
+        self.articulation_points = frozenset(node for node, blocks in self._blocks_of.items() if len(blocks) > 1)
+        
+        self._component_size = {}
+        for component in nx.connected_components(graph):
+            for node in component:
+                self._component_size[node] = len(component)
+        
+        self._pieces = {}
+        self._split_components()
+    
+    def _split_components(self):
+        """Compute the sizes of the pieces each articulation point splits its component into"""
+        # Weight of a tree vertex: 1 for a cut vertex, the non-cut members for a block
+        block_weights = [sum(1 for node in block if node not in self.articulation_points)
+                         for block in self.blocks]
+        visited = set()
+        for root in range(len(self.blocks)):
+            if root in visited:
+                continue
+            
+            # Iterative DFS over the tree, alternating blocks (ints) and cut vertices (tagged)
+            visited.add(root)
+            order = []
+            parent = {('block', root): None}
+            stack = [('block', root)]
+            while stack:
+                vertex = stack.pop()
+                order.append(vertex)
+                if vertex[0] == 'block':
+                    neighbors = [('cut', node) for node in self.blocks[vertex[1]]
+                                 if node in self.articulation_points]
+                else:
+                    neighbors = [('block', i) for i in self._blocks_of[vertex[1]]]
+                for neighbor in neighbors:
+                    if neighbor != parent[vertex] and neighbor not in parent:
+                        parent[neighbor] = vertex
+                        if neighbor[0] == 'block':
+                            visited.add(neighbor[1])
+                        stack.append(neighbor)
+            
+            subtree = {}
+            children = {}
+            for vertex in reversed(order):
+                weight = 1 if vertex[0] == 'cut' else block_weights[vertex[1]]
+                subtree[vertex] = weight + sum(subtree[child] for child in children.get(vertex, ()))
+                if parent[vertex] is not None:
+                    children.setdefault(parent[vertex], []).append(vertex)
+            
+            for vertex in order:
+                if vertex[0] != 'cut':
+                    continue
+                node = vertex[1]
+                pieces = [subtree[child] for child in children.get(vertex, ())]
+                # Everything outside the subtree of the cut vertex stays on the parent side
+                pieces.append(self._component_size[node] - subtree[vertex])
+                self._pieces[node] = tuple(sorted(pieces, reverse=True))
+    
+    def is_articulation_point(self, node):
+        """Check whether removing a component disconnects its part of the layer"""
+        return node in self.articulation_points
+    
+    def is_bridge(self, source, target):
+        """Check whether removing a connection disconnects its part of the layer"""
+        return frozenset((source, target)) in self.bridges
+    
+    def blocks_containing(self, node):
+        """
+        Get the blocks a component belongs to
+        
+        Removing an articulation point disconnects these blocks from each other.
+        
+        Args:
+            node: Layer component
+        
+        Returns:
+            tuple: Blocks (frozensets of components) containing the component
+        """
+        return tuple(self.blocks[i] for i in self._blocks_of.get(node, ()))
+    
+    def component_size(self, node):
+        """Get the number of components connected to a component, itself included"""
+        return self._component_size.get(node, 0)
+    
+    def component_sizes_after_removal(self, node):
+        """
+        Get the sizes of the connected pieces left when a component is removed
+        
+        Args:
+            node: Layer component
+        
+        Returns:
+            tuple: Piece sizes in descending order (empty for an isolated component)
+        """
+        if node in self._pieces:
+            return self._pieces[node]
+        size = self.component_size(node)
+        return (size - 1,) if size > 1 else ()
+    
+    def separated_components(self, node):
+        """
+        Count the pieces a component's connected part of the layer splits into when it is removed
+        
+        Args:
+            node: Layer component
+        
+        Returns:
+            int: At least 2 for an articulation point, 1 otherwise (0 if isolated)
+        """
+        return len(self.component_sizes_after_removal(node))
+
+def get_block_cut_tree(index, node_type):
+    """
+    Get the block-cut tree of the CONNECTS_TO layer of one component type
+    
+    Args:
+        index: TypedIndex of the graph
+        node_type (str): Component type (e.g. 'Broker' or 'Node')
+    
+    Returns:
+        BlockCutTree: Tree for the indexed graph version, computed once per index
+    """
+    trees = _tree_cache.setdefault(index, {})
+    if node_type not in trees:
+        trees[node_type] = BlockCutTree(index.nodes_of_type(node_type), index.connections(node_type))
+    return trees[node_type]
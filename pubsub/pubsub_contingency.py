@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Contingency Analysis Module for the Publish-Subscribe System Model
+
+This module evaluates N-k contingencies: every combination of k components
+of chosen types failing together (e.g. pairs or triples of nodes). The
+impact of a combination is the union of the impact bitset rows of its
+components from the failure sweep, plus the subscribers of topics whose
+publishers all failed together, which no single failure takes out.
+
+Combinations are enumerated depth first over the candidates sorted by
+their potential impact (impact row plus the subscribers of topics shared
+with other candidate publishers). The potential of a combination is an
+upper bound of its impact that only grows as components are added, so a
+branch is skipped when the union of its chosen potentials plus the largest
+potentials that can still be added cannot beat the current worst-k
+combinations or the impact threshold. The first components of the
+combinations are spread over a process pool whose workers read the bitset
+arrays from shared memory.
+"""
+
+import bisect
+import heapq
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+import numpy as np
+from pubsub_index import get_typed_index
+from pubsub_sweep import get_failure_sweep, SWEEP_TYPES
+from pubsub_bitset import popcount
+
+# Impact distribution bins (percentage of applications)
+DISTRIBUTION_BINS = 10
+
+_worker_state = None
+
+@dataclass(slots=True)
+class ContingencyResult:
+    """
+    Results of an N-k contingency analysis
+    
+    Attributes:
+        k (int): Number of components failing together
+        component_types (tuple): Types of the candidate components
+        candidates (int): Number of candidate components
+        combinations (int): Number of k-combinations of the candidates
+        evaluated (int): Combinations whose impact was computed
+        pruned (int): Combinations skipped by the upper bound
+        pruned_limit (int): Impacted application count no skipped combination exceeds
+        threshold (float): Impact percentage a combination had to exceed to be listed (None if not set)
+        total_applications (int): Number of applications in the system
+        worst (list): Most impacting combinations, as dictionaries with 'components',
+                      'impacted_applications' and 'impact_percentage'
+        exceeding (list): All combinations above the threshold, most impacting first
+        distribution (list): Evaluated combinations per impact bin of 100 / DISTRIBUTION_BINS percent
+    """
+    k: int
+    component_types: tuple
+    candidates: int = 0
+    combinations: int = 0
+    evaluated: int = 0
+    pruned: int = 0
+    pruned_limit: int = -1
+    threshold: float = None
+    total_applications: int = 0
+    worst: list = field(default_factory=list)
+    exceeding: list = field(default_factory=list)
+    distribution: list = field(default_factory=lambda: [0] * DISTRIBUTION_BINS)
+
+def _prepare(index, component_types, k):
+    """
+    Collect the candidates and their impact and potential bitsets
+    
+    Returns:
+        tuple: (candidate names, state dictionary of arrays for the search)
+    """
+    sweep = get_failure_sweep(index)
+    bitsets = sweep.bitsets
+    candidates = [component for component_type in component_types for component in index.nodes_of_type(component_type)]
+    candidate_ids = {component: i for i, component in enumerate(candidates)}
+    rows = bitsets.from_csr(sweep.impact[[sweep.rows[component] for component in candidates]])
+    
+    # Topics only lost when several candidate publishers fail together
+    joint_publishers = []
+    joint_subscribers = []
+    if k >= 2:
+        for topic in index.nodes_of_type('Topic'):
+            publishers = tuple(dict.fromkeys(index.publishers(topic)))
+            if 2 <= len(publishers) <= k and all(publisher in candidate_ids for publisher in publishers):
+                joint_publishers.append([candidate_ids[publisher] for publisher in publishers])
+                joint_subscribers.append(bitsets.from_names(index.subscribers(topic)).words)
+    joint = np.vstack(joint_subscribers) if joint_subscribers else np.zeros((0, bitsets.words), dtype=np.uint64)
+    
+    potential = rows.copy()
+    for topic, publishers in enumerate(joint_publishers):
+        for candidate in publishers:
+            potential[candidate] |= joint[topic]
+    
+    # Search the candidates in descending order of potential impact
+    order = np.argsort(-popcount(potential), kind='stable')
+    position = np.empty(len(order), dtype=np.int64)
+    position[order] = np.arange(len(order))
+    candidate_topics = [[] for _ in candidates]
+    publishers_of = []
+    for topic, publishers in enumerate(joint_publishers):
+        publishers = sorted(position[publishers].tolist())
+        publishers_of.append(publishers)
+        for candidate in publishers:
+            candidate_topics[candidate].append(topic)
+    
+    state = {
+        'rows': np.ascontiguousarray(rows[order]),
+        'potential': np.ascontiguousarray(potential[order]),
+        'joint': joint,
+        'publishers_of': publishers_of,
+        'candidate_topics': candidate_topics
+    }
+    return [candidates[i] for i in order.tolist()], state
+
+def _search(state, firsts, k, top, threshold_count, prune):
+    """
+    Evaluate the combinations starting with some first candidates, depth first
+    
+    The last component of a combination is evaluated in batches: the union
+    of the chosen rows is combined with the rows of all remaining candidates
+    at once.
+    
+    Returns:
+        tuple: (worst heap of (count, combination) pairs, exceeding pairs,
+                distribution, evaluated, pruned, pruned limit)
+    """
+    rows = state['rows']
+    potential = state['potential']
+    joint = state['joint']
+    publishers_of = state['publishers_of']
+    candidate_topics = state['candidate_topics']
+    n = len(rows)
+    total = state['total_applications']
+    counts = popcount(potential).tolist()
+    # prefix[j] = sum of the j largest potentials, candidates being sorted
+    prefix = [0]
+    for count in counts:
+        prefix.append(prefix[-1] + count)
+    negated_counts = [-count for count in counts]
+    joint_candidates = [candidate for candidate in range(n) if candidate_topics[candidate]]
+    
+    heap = []
+    exceeding = []
+    distribution = np.zeros(DISTRIBUTION_BINS, dtype=np.int64)
+    evaluated = 0
+    pruned = 0
+    pruned_limit = -1
+    
+    def cutoff():
+        # A combination is only kept if its impact exceeds this count
+        kth = heap[0][0] if len(heap) >= top else -1
+        if threshold_count is None:
+            return kth
+        return min(kth, threshold_count)
+    
+    def joint_impact(union, chosen, candidates):
+        # Add the topics whose publishers all failed, one of them being among candidates
+        for candidate in candidates:
+            for topic in candidate_topics[candidate]:
+                if all(publisher in chosen for publisher in publishers_of[topic]):
+                    union = union | joint[topic]
+        return union
+    
+    def evaluate(combination, union, start, stop):
+        # Evaluate the combination completed by each candidate in [start, stop)
+        nonlocal evaluated, distribution
+        chosen = set(combination)
+        bits = joint_impact(union, chosen, combination) | rows[start:stop]
+        for candidate in joint_candidates[bisect.bisect_left(joint_candidates, start):
+                                          bisect.bisect_left(joint_candidates, stop)]:
+            chosen.add(candidate)
+            bits[candidate - start] = joint_impact(bits[candidate - start], chosen, (candidate,))
+            chosen.discard(candidate)
+        impacted = popcount(bits)
+        evaluated += len(impacted)
+        if total:
+            distribution += np.bincount(np.minimum(impacted * DISTRIBUTION_BINS // total, DISTRIBUTION_BINS - 1),
+                                        minlength=DISTRIBUTION_BINS)
+        if threshold_count is not None:
+            exceeding.extend((int(impacted[i]), combination + (start + i,))
+                             for i in np.flatnonzero(impacted > threshold_count).tolist())
+        kth = heap[0][0] if len(heap) >= top else -1
+        for i in np.flatnonzero(impacted > kth).tolist():
+            count = int(impacted[i])
+            entry = (count, tuple(-candidate for candidate in combination + (start + i,)))
+            if len(heap) < top:
+                heapq.heappush(heap, entry)
+            elif count > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+    
+    def visit(combination, union, potential_union, start):
+        nonlocal pruned, pruned_limit
+        slots = k - len(combination)
+        known = int(popcount(potential_union))
+        if slots == 1:
+            stop = n
+            if prune:
+                # Candidates are sorted, so those that can still qualify come first
+                limit = cutoff()
+                stop = bisect.bisect_left(negated_counts, known - limit, start, n)
+                if stop < n:
+                    pruned += n - stop
+                    pruned_limit = max(pruned_limit, limit)
+            if start < stop:
+                evaluate(combination, union, start, stop)
+            return
+        for j in range(start, n - slots + 1):
+            extended = potential_union | potential[j]
+            if prune:
+                limit = cutoff()
+                # The largest potentials left bound every combination from j on
+                if known + prefix[j + slots] - prefix[j] <= limit:
+                    pruned += math.comb(n - j, slots)
+                    pruned_limit = max(pruned_limit, limit)
+                    return
+                if int(popcount(extended)) + prefix[j + slots] - prefix[j + 1] <= limit:
+                    pruned += math.comb(n - j - 1, slots - 1)
+                    pruned_limit = max(pruned_limit, limit)
+                    continue
+            visit(combination + (j,), union | rows[j], extended, j + 1)
+    
+    empty = np.zeros(rows.shape[1], dtype=np.uint64)
+    for first in firsts:
+        if k == 1:
+            visit((), empty, empty, first)
+            break
+        if prune:
+            limit = cutoff()
+            bound = int(popcount(potential[first])) + prefix[first + k] - prefix[first + 1]
+            if bound <= limit:
+                pruned += math.comb(n - first - 1, k - 1)
+                pruned_limit = max(pruned_limit, limit)
+                continue
+        visit((first,), rows[first], potential[first], first + 1)
+    
+    return heap, exceeding, distribution.tolist(), evaluated, pruned, pruned_limit
+
+def _share(state):
+    """Copy the bitset arrays of a search state into shared memory blocks"""
+    blocks = []
+    specs = {}
+    for key in ('rows', 'potential', 'joint'):
+        array = state[key]
+        block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[key] = (block.name, array.shape, array.dtype.str)
+    shared = {key: value for key, value in state.items() if key not in specs}
+    return blocks, specs, shared
+
+def _init_worker(specs, shared):
+    """Attach a pool worker to the shared bitset arrays"""
+    global _worker_state
+    blocks = []
+    state = dict(shared)
+    for key, (name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        state[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    state['blocks'] = blocks
+    _worker_state = state
+
+def _search_shard(task):
+    """Run the search for one chunk of first candidates in a pool worker"""
+    return _search(_worker_state, *task)
+
+def contingency_analysis(G, k=2, component_types=('Node',), threshold=None, top=10, workers=1, prune=True, index=None):
+    """
+    Find the combinations of k components whose joint failure impacts the most applications
+    
+    Args:
+        G: NetworkX graph object
+        k (int): Number of components failing together
+        component_types: Types of the candidate components (e.g. ('Node', 'Broker'))
+        threshold (float): Also list every combination impacting more than this
+                           percentage of applications (None to only rank)
+        top (int): Number of most impacting combinations returned
+        workers (int): Worker processes sharing the first candidates (1 runs in this process)
+        prune (bool): Skip combinations whose upper bound cannot qualify; without
+                      pruning every combination is evaluated and the distribution is complete
+        index: TypedIndex of G (built if not given)
+    
+    Returns:
+        ContingencyResult: Most impacting combinations and impact distribution
+    
+    Raises:
+        ValueError: If k is not positive or a component type is unknown
+    """
+    if index is None:
+        index = get_typed_index(G)
+    component_types = tuple(component_type.capitalize() for component_type in component_types)
+    unknown = [component_type for component_type in component_types if component_type not in SWEEP_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown component types: {', '.join(unknown)}")
+    if k < 1:
+        raise ValueError("Contingency size k must be at least 1")
+    
+    candidates, state = _prepare(index, component_types, k)
+    total = len(get_failure_sweep(index).applications)
+    state['total_applications'] = total
+    threshold_count = math.floor(total * threshold / 100 + 1e-9) if threshold is not None else None
+    
+    result = ContingencyResult(k, component_types, len(candidates), math.comb(len(candidates), k),
+                               threshold=threshold, total_applications=total)
+    if len(candidates) < k:
+        return result
+    
+    firsts = list(range(len(candidates) - k + 1))
+    workers = min(workers or os.cpu_count() or 1, len(firsts))
+    if k == 1 or workers <= 1:
+        partials = [_search(state, firsts, k, top, threshold_count, prune)]
+    else:
+        # Interleave the first candidates, the early ones leading the largest subtrees
+        tasks = [(firsts[worker::workers], k, top, threshold_count, prune) for worker in range(workers)]
+        blocks, specs, shared = _share(state)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(specs, shared)) as executor:
+                partials = list(executor.map(_search_shard, tasks))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+    
+    worst = []
+    exceeding = []
+    for heap, partial_exceeding, distribution, evaluated, pruned, pruned_limit in partials:
+        worst.extend((count, tuple(-candidate for candidate in combination)) for count, combination in heap)
+        exceeding.extend(partial_exceeding)
+        result.distribution = [a + b for a, b in zip(result.distribution, distribution)]
+        result.evaluated += evaluated
+        result.pruned += pruned
+        result.pruned_limit = max(result.pruned_limit, pruned_limit)
+    
+    def entries(pairs):
+        return [{'components': tuple(candidates[candidate] for candidate in combination),
+                 'impacted_applications': count,
+                 'impact_percentage': count * 100 / total if total else 0.0}
+                for count, combination in sorted(pairs, key=lambda pair: (-pair[0], pair[1]))]
+    
+    result.worst = entries(worst)[:top]
+    result.exceeding = entries(exceeding)
+    return result
+
+def print_contingency(result, max_combinations=10):
+    """
+    Print the most impacting combinations and the impact distribution
+    
+    Args:
+        result: ContingencyResult object
+        max_combinations (int): Number of combinations listed
+    """
+    types = ', '.join(component_type.lower() for component_type in result.component_types)
+    print(f"\n=== N-{result.k} Contingency Analysis ({types}) ===")
+    print(f"{result.combinations} combinations of {result.candidates} components: "
+          f"{result.evaluated} evaluated, {result.pruned} skipped by the upper bound")
+    
+    if result.threshold is not None:
+        print(f"\nCombinations impacting more than {result.threshold:g}% of applications: {len(result.exceeding)}")
+        for entry in result.exceeding[:max_combinations]:
+            print(f"  - {' + '.join(str(component) for component in entry['components'])}: "
+                  f"{entry['impacted_applications']} applications ({entry['impact_percentage']:.1f}%)")
+        if len(result.exceeding) > max_combinations:
+            print(f"  ... and {len(result.exceeding) - max_combinations} more combinations")
+    
+    if result.worst:
+        print(f"\nMost impacting combinations:")
+        for rank, entry in enumerate(result.worst[:max_combinations], 1):
+            print(f"  {rank}. {' + '.join(str(component) for component in entry['components'])}: "
+                  f"{entry['impacted_applications']} applications ({entry['impact_percentage']:.1f}%)")
+    
+    print("\nImpact distribution of the evaluated combinations:")
+    width = 100 / DISTRIBUTION_BINS
+    for bin_number, count in enumerate(result.distribution):
+        if count:
+            print(f"  {bin_number * width:.0f}-{(bin_number + 1) * width:.0f}%: {count}")
+    if result.pruned and result.total_applications:
+        print(f"  Skipped combinations impact at most "
+              f"{result.pruned_limit * 100 / result.total_applications:.1f}% of applications")
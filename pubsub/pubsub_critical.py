@@ -6,31 +6,112 @@ This module provides functions for identifying critical components in the system
 using adaptive thresholds and multiple identification rules.
 """
 
-import networkx as nx
-from pubsub_threshold import CriticalityThresholds
+from pubsub_threshold import CriticalityThresholds, DistributionThresholds
+from pubsub_index import get_typed_index
+from pubsub_matrix import get_broker_impact, impacted_application_counts
+from pubsub_connectivity import get_block_cut_tree
+from pubsub_centrality import layer_centrality
+from pubsub_scoring import rank_components
 
-def identify_critical_components(G, config):
+def identify_critical_components(G, config, index=None, centrality=None, threshold_policy=None, top_k=10):
     """
     Identify the critical components in the system based on adaptive thresholds
     
+    All per-component metrics and each layer's articulation points are
+    computed once, then every rule is evaluated in one pass per component
+    type, so the whole identification is O(V + E).
+    
     Args:
         G: NetworkX graph object
         config: SystemConfig object
+        index: TypedIndex of G (built if not given)
+        centrality (dict): Enables an extra rule flagging nodes and applications whose
+            layer centrality exceeds centrality['threshold']; the other keys are
+            passed to layer_centrality (e.g. measure, mode, pivots, workers)
+        threshold_policy: Computes the thresholds from the metric distributions instead
+            of the configuration, e.g. ('quantile', 0.95) (see DistributionThresholds)
+        top_k (int): Number of components kept in each criticality ranking
         
     Returns:
         dict: Dictionary with critical component information and component metrics
     """
-    # Calculate adaptive thresholds based on system configuration
-    thresholds = CriticalityThresholds(config)
-    
-    # Dictionary to store critical components by type
-    critical_components = {
-        'broker': [],
-        'node': [],
-        'application': [],
-        'topic': []
+    if index is None:
+        index = get_typed_index(G)
+    
+    # Count total components by type
+    total_components = {
+        'brokers': len(index.nodes_of_type('Broker')),
+        'nodes': len(index.nodes_of_type('Node')),
+        'applications': len(index.nodes_of_type('Application')),
+        'topics': len(index.nodes_of_type('Topic'))
+    }
+    
+    component_metrics = compute_component_metrics(index)
+    
+    # Calculate adaptive thresholds from the metric distributions or the system configuration
+    if threshold_policy is not None:
+        thresholds = DistributionThresholds.from_metrics(component_metrics, total_components, threshold_policy)
+    else:
+        thresholds = CriticalityThresholds(config)
+    
+    centrality_threshold = None
+    if centrality:
+        centrality_options = dict(centrality)
+        centrality_threshold = centrality_options.pop('threshold')
+        component_metrics['node_centrality'] = layer_centrality(G, 'Node', index=index, **centrality_options)
+        component_metrics['app_centrality'] = layer_centrality(G, 'Application', index=index,
+                                                               **centrality_options)
+    
+    # Articulation points need at least 3 components in a layer
+    broker_articulation_points = set()
+    if total_components['brokers'] > 2:
+        broker_articulation_points = layer_articulation_points(index, 'Broker')
+    node_articulation_points = set()
+    if total_components['nodes'] > 2:
+        node_articulation_points = layer_articulation_points(index, 'Node')
+    
+    critical_components = {}
+    critical_components['broker'] = _critical_brokers(component_metrics, total_components, thresholds,
+                                                      broker_articulation_points)
+    
+    # Nodes hosting a critical broker, from one pass over the critical brokers' hosts
+    critical_broker_hosts = set()
+    for broker_info in critical_components['broker']:
+        critical_broker_hosts.update(index.hosts(broker_info['node']))
+    
+    critical_components['node'] = _critical_nodes(component_metrics, total_components, thresholds,
+                                                  node_articulation_points, critical_broker_hosts,
+                                                  centrality_threshold)
+    critical_components['application'] = _critical_applications(component_metrics, total_components, thresholds,
+                                                                centrality_threshold)
+    critical_components['topic'] = _critical_topics(component_metrics, total_components, thresholds)
+    
+    # Continuous scores and top-k rankings over all components
+    ranking = rank_components(index, component_metrics, total_components, thresholds, top_k, centrality_threshold)
+    for components in critical_components.values():
+        for component_info in components:
+            component_info['score'] = ranking.score(component_info['node'])
+    
+    # Organize results for return
+    result = {
+        'critical_components': critical_components,
+        'component_metrics': component_metrics,
+        'thresholds': thresholds,
+        'ranking': ranking
     }
     
+    return result
+
+def compute_component_metrics(index):
+    """
+    Compute the per-component metrics used by the criticality rules
+    
+    Args:
+        index: TypedIndex of the graph
+        
+    Returns:
+        dict: Dictionary of metric dictionaries keyed by component name
+    """
     # Dictionary to store all component metrics
     component_metrics = {
         'broker_connections': {},
@@ -40,309 +121,300 @@ def identify_critical_components(G, config):
         'topic_subscribers': {}
     }
     
-    # Count total components by type
-    total_components = {
-        'brokers': sum(1 for _, attrs in G.nodes(data=True) if attrs.get('type') == 'Broker'),
-        'nodes': sum(1 for _, attrs in G.nodes(data=True) if attrs.get('type') == 'Node'),
-        'applications': sum(1 for _, attrs in G.nodes(data=True) if attrs.get('type') == 'Application'),
-        'topics': sum(1 for _, attrs in G.nodes(data=True) if attrs.get('type') == 'Topic')
-    }
-    
-    # ===== BROKER ANALYSIS =====
-    # Calculate broker metrics and identify critical brokers
-    broker_connections = {}
-    broker_impacted_apps = {}
-    
-    for node, attrs in G.nodes(data=True):
-        if attrs.get('type') == 'Broker':
-            # Count routed topics
-            routed_topics = [n for n in G.successors(node) 
-                            if G.nodes[n].get('type') == 'Topic' and G[node][n].get('type') == 'ROUTES']
-            broker_connections[node] = len(routed_topics)
-            
-            # Count impacted applications
-            impacted_apps = set()
-            for topic in routed_topics:
-                # Find apps that publish to this topic
-                publishers = [n for n in G.predecessors(topic) 
-                             if G.nodes[n].get('type') == 'Application' and G[n][topic].get('type') == 'PUBLISHES_TO']
-                # Find apps that subscribe to this topic
-                subscribers = [n for n in G.predecessors(topic) 
-                              if G.nodes[n].get('type') == 'Application' and G[n][topic].get('type') == 'SUBSCRIBES_TO']
-                impacted_apps.update(publishers)
-                impacted_apps.update(subscribers)
-            
-            broker_impacted_apps[node] = len(impacted_apps)
-    
-    # Store broker metrics
-    component_metrics['broker_connections'] = broker_connections
-    component_metrics['broker_impacted_apps'] = broker_impacted_apps
+    # Broker metrics: routed topics, and applications using them from the broker impact matrix
+    broker_connections = component_metrics['broker_connections']
+    for broker in index.nodes_of_type('Broker'):
+        broker_connections[broker] = len(index.routed_topics(broker))
+    broker_impacted_apps = impacted_application_counts(get_broker_impact(index))
     
-    # Identify critical brokers using thresholds
-    for broker, topic_count in broker_connections.items():
-        is_critical = False
-        criticality_reasons = []
-        
-        # Rule 1: High Topic Coverage
-        topic_coverage = topic_count / max(1, total_components['topics'])
-        if topic_coverage > thresholds.broker_topic_coverage:
-            is_critical = True
-            criticality_reasons.append(f"Routes {topic_count} topics ({topic_coverage:.0%} of all topics)")
-        
-        # Rule 2: High Application Impact
-        app_impact = broker_impacted_apps.get(broker, 0) / max(1, total_components['applications'])
-        if app_impact > thresholds.broker_application_impact:
-            is_critical = True
-            criticality_reasons.append(f"Impacts {broker_impacted_apps.get(broker, 0)} applications " +
-                                      f"({app_impact:.0%} of all applications)")
-        
-        # Rule 3: Network Articulation Point (if there are multiple brokers)
-        if total_components['brokers'] > 1:
-            # Create broker-only subgraph
-            broker_subgraph = nx.Graph()
-            broker_nodes = [n for n, attrs in G.nodes(data=True) if attrs.get('type') == 'Broker']
-            for n in broker_nodes:
-                broker_subgraph.add_node(n)
-            
-            for u, v, attrs in G.edges(data=True):
-                if (u in broker_nodes and v in broker_nodes and 
-                    attrs.get('type') == 'CONNECTS_TO'):
-                    broker_subgraph.add_edge(u, v)
-            
-            # Check if broker is an articulation point
-            if len(broker_nodes) > 2:  # Need at least 3 brokers for articulation points
-                try:
-                    articulation_points = list(nx.articulation_points(broker_subgraph))
-                    if broker in articulation_points:
-                        is_critical = True
-                        criticality_reasons.append("Acts as a network bridge between broker groups")
-                except nx.NetworkXError:
-                    # Graph may not be connected, which is itself a problem
-                    pass
-        
-        if is_critical:
-            critical_components['broker'].append({
-                'node': broker,
-                'metrics': {
-                    'topic_count': topic_count,
-                    'topic_coverage': topic_coverage,
-                    'impacted_apps': broker_impacted_apps.get(broker, 0),
-                    'app_impact': app_impact
-                },
-                'reasons': criticality_reasons
-            })
-    
-    # ===== NODE ANALYSIS =====
-    # Calculate node metrics and identify critical nodes
-    node_loads = {}
+    # Node metrics: hosted services and brokers
+    node_loads = component_metrics['node_loads']
     node_broker_hosts = {}
+    for node in index.nodes_of_type('Node'):
+        node_loads[node] = len(index.hosted_services(node))
+        node_broker_hosts[node] = len(index.hosted_services(node, 'Broker'))
+    
+    # Application metrics: dependents and exclusively published topics
+    app_dependencies = component_metrics['app_dependencies']
+    for app in index.nodes_of_type('Application'):
+        app_dependencies[app] = len(index.dependents(app))
+    
+    # Topic metrics: subscribers, and sole publishers for the application metrics
+    app_exclusive_topics = component_metrics['app_exclusive_topics']
+    topic_subscribers = component_metrics['topic_subscribers']
+    for topic in index.nodes_of_type('Topic'):
+        publishers = index.publishers(topic)
+        if len(publishers) == 1:
+            app_exclusive_topics.setdefault(publishers[0], []).append(topic)
+        topic_subscribers[topic] = len(index.subscribers(topic))
     
-    for node, attrs in G.nodes(data=True):
-        if attrs.get('type') == 'Node':
-            # Count hosted services
-            hosted_services = [n for n in G.predecessors(node) 
-                              if G[n][node].get('type') == 'RUNS_ON']
-            node_loads[node] = len(hosted_services)
-            
-            # Count hosted brokers
-            hosted_brokers = [n for n in hosted_services 
-                             if G.nodes[n].get('type') == 'Broker']
-            node_broker_hosts[node] = len(hosted_brokers)
-    
-    # Store node metrics
-    component_metrics['node_loads'] = node_loads
+    component_metrics['broker_impacted_apps'] = broker_impacted_apps
     component_metrics['node_broker_hosts'] = node_broker_hosts
     
-    # Identify critical nodes using thresholds
-    for node, service_count in node_loads.items():
-        is_critical = False
-        criticality_reasons = []
-        
-        # Rule 1: High Service Density
-        total_services = total_components['applications'] + total_components['brokers']
-        service_density = service_count / max(1, total_services)
-        if service_density > thresholds.node_service_density:
-            is_critical = True
-            criticality_reasons.append(f"Hosts {service_count} services ({service_density:.0%} of all services)")
-        
-        # Rule 2: Hosts Many Brokers
-        broker_hosting_ratio = node_broker_hosts.get(node, 0) / max(1, total_components['brokers'])
-        if broker_hosting_ratio > thresholds.node_broker_hosting:
-            is_critical = True
-            criticality_reasons.append(f"Hosts {node_broker_hosts.get(node, 0)} brokers " +
-                                      f"({broker_hosting_ratio:.0%} of all brokers)")
-        
-        # Rule 3: Hosts Critical Brokers
-        hosts_critical_broker = False
-        for broker_info in critical_components['broker']:
-            critical_broker = broker_info['node']
-            # Check if this broker runs on this node
-            for u, v, attrs in G.edges(data=True):
-                if (u == critical_broker and v == node and 
-                    attrs.get('type') == 'RUNS_ON'):
-                    hosts_critical_broker = True
-                    break
-        
-        if hosts_critical_broker:
-            is_critical = True
-            criticality_reasons.append("Hosts one or more critical brokers")
-        
-        # Rule 4: Infrastructure Bridge
-        # Create node-only subgraph
-        if total_components['nodes'] > 2:  # Need at least 3 nodes for articulation points
-            node_subgraph = nx.Graph()
-            node_nodes = [n for n, attrs in G.nodes(data=True) if attrs.get('type') == 'Node']
-            for n in node_nodes:
-                node_subgraph.add_node(n)
-            
-            for u, v, attrs in G.edges(data=True):
-                if (u in node_nodes and v in node_nodes and 
-                    attrs.get('type') == 'CONNECTS_TO'):
-                    node_subgraph.add_edge(u, v)
-            
-            try:
-                articulation_points = list(nx.articulation_points(node_subgraph))
-                if node in articulation_points:
-                    is_critical = True
-                    criticality_reasons.append("Acts as a network bridge between infrastructure segments")
-            except nx.NetworkXError:
-                # Graph may not be connected
-                pass
+    return component_metrics
+
+def layer_articulation_points(index, node_type):
+    """
+    Find the articulation points of the CONNECTS_TO layer between components of one type
+    
+    Args:
+        index: TypedIndex of the graph
+        node_type (str): Component type (e.g. 'Broker' or 'Node')
         
-        if is_critical:
-            critical_components['node'].append({
-                'node': node,
-                'metrics': {
-                    'service_count': service_count,
-                    'service_density': service_density,
-                    'broker_hosts': node_broker_hosts.get(node, 0),
-                    'broker_hosting_ratio': broker_hosting_ratio
-                },
-                'reasons': criticality_reasons
-            })
-    
-    # ===== APPLICATION ANALYSIS =====
-    # Calculate application metrics and identify critical applications
-    app_dependencies = {}
-    app_exclusive_topics = {}
-    
-    # First calculate dependencies
-    for node, attrs in G.nodes(data=True):
-        if attrs.get('type') == 'Application':
-            # Count applications that depend on this one
-            dependents = [n for n in G.predecessors(node) 
-                         if G.nodes[n].get('type') == 'Application' and G[n][node].get('type') == 'DEPENDS_ON']
-            app_dependencies[node] = len(dependents)
-    
-    # Then calculate exclusive topic publishing
-    for node, attrs in G.nodes(data=True):
-        if attrs.get('type') == 'Topic':
-            # Get all publishers to this topic
-            publishers = [n for n in G.predecessors(node) 
-                         if G.nodes[n].get('type') == 'Application' and G[n][node].get('type') == 'PUBLISHES_TO']
-            
-            # If there's exactly one publisher, it's exclusive
-            if len(publishers) == 1:
-                app = publishers[0]
-                if app not in app_exclusive_topics:
-                    app_exclusive_topics[app] = []
-                app_exclusive_topics[app].append(node)
-    
-    # Store application metrics
-    component_metrics['app_dependencies'] = app_dependencies
-    component_metrics['app_exclusive_topics'] = app_exclusive_topics
-    
-    # Identify critical applications using thresholds
+    Returns:
+        frozenset: Components whose removal disconnects the layer
+    """
+    return get_block_cut_tree(index, node_type).articulation_points
+
+def _critical_brokers(component_metrics, total_components, thresholds, articulation_points):
+    """Evaluate the broker rules over precomputed metrics"""
+    critical = []
+    for broker in component_metrics['broker_connections']:
+        broker_info = evaluate_broker(broker, component_metrics, total_components, thresholds,
+                                      articulation_points)
+        if broker_info:
+            critical.append(broker_info)
+    return critical
+
+def _critical_nodes(component_metrics, total_components, thresholds, articulation_points, critical_broker_hosts,
+                    centrality_threshold=None):
+    """Evaluate the infrastructure node rules over precomputed metrics"""
+    critical = []
+    for node in component_metrics['node_loads']:
+        node_info = evaluate_node(node, component_metrics, total_components, thresholds,
+                                  articulation_points, critical_broker_hosts, centrality_threshold)
+        if node_info:
+            critical.append(node_info)
+    return critical
+
+def _critical_applications(component_metrics, total_components, thresholds, centrality_threshold=None):
+    """Evaluate the application rules over precomputed metrics"""
+    critical = []
+    app_dependencies = component_metrics['app_dependencies']
+    app_exclusive_topics = component_metrics['app_exclusive_topics']
     for app in set(app_dependencies.keys()).union(app_exclusive_topics.keys()):
-        is_critical = False
-        criticality_reasons = []
-        
-        # Rule 1: Many Dependent Applications
-        dependent_count = app_dependencies.get(app, 0)
-        dependency_ratio = dependent_count / max(1, total_components['applications'] - 1)  # Exclude self
-        
-        if dependency_ratio > thresholds.app_dependency_ratio:
-            is_critical = True
-            criticality_reasons.append(f"Has {dependent_count} dependent applications " +
-                                      f"({dependency_ratio:.0%} of other applications)")
-        
-        # Rule 2: Exclusive Publisher for Many Topics
-        exclusive_topics = app_exclusive_topics.get(app, [])
-        if len(exclusive_topics) >= thresholds.app_publisher_uniqueness:
-            is_critical = True
-            criticality_reasons.append(f"Sole publisher for {len(exclusive_topics)} topics")
-        
-        if is_critical:
-            critical_components['application'].append({
-                'node': app,
-                'metrics': {
-                    'dependent_count': dependent_count,
-                    'dependency_ratio': dependency_ratio,
-                    'exclusive_topics': len(exclusive_topics),
-                    'exclusive_topic_names': [t for t in exclusive_topics]
-                },
-                'reasons': criticality_reasons
-            })
-    
-    # ===== TOPIC ANALYSIS =====
-    # Calculate topic metrics and identify critical topics
-    topic_subscribers = {}
-    
-    for node, attrs in G.nodes(data=True):
-        if attrs.get('type') == 'Topic':
-            # Count subscribers
-            subscribers = [n for n in G.predecessors(node) 
-                          if G.nodes[n].get('type') == 'Application' and G[n][node].get('type') == 'SUBSCRIBES_TO']
-            topic_subscribers[node] = len(subscribers)
-    
-    # Store topic metrics
-    component_metrics['topic_subscribers'] = topic_subscribers
-    
-    # Identify critical topics using thresholds
-    for topic, subscriber_count in topic_subscribers.items():
-        is_critical = False
-        criticality_reasons = []
-        
-        # Rule 1: High Subscriber Breadth
-        subscriber_breadth = subscriber_count / max(1, total_components['applications'])
-        
-        if (subscriber_count >= thresholds.topic_criticality_minimum_subs and 
-            subscriber_breadth > thresholds.topic_subscriber_breadth):
-            is_critical = True
-            criticality_reasons.append(f"Has {subscriber_count} subscribers " +
-                                     f"({subscriber_breadth:.0%} of all applications)")
+        app_info = evaluate_application(app, component_metrics, total_components, thresholds,
+                                        centrality_threshold)
+        if app_info:
+            critical.append(app_info)
+    return critical
+
+def _critical_topics(component_metrics, total_components, thresholds):
+    """Evaluate the topic rules over precomputed metrics"""
+    critical = []
+    for topic in component_metrics['topic_subscribers']:
+        topic_info = evaluate_topic(topic, component_metrics, total_components, thresholds)
+        if topic_info:
+            critical.append(topic_info)
+    return critical
+
+def evaluate_broker(broker, component_metrics, total_components, thresholds, articulation_points):
+    """
+    Apply the broker criticality rules to one broker
+    
+    Args:
+        broker: Broker name
+        component_metrics: Component metrics (see compute_component_metrics)
+        total_components (dict): Number of components per type
+        thresholds: CriticalityThresholds object
+        articulation_points: Container of articulation points of the broker layer
         
-        # Rule 2: Cross-System Communication (this would require more complex analysis)
-        # This would need community detection or other advanced algorithms
+    Returns:
+        dict: Critical component entry with metrics and reasons, or None if not critical
+    """
+    criticality_reasons = []
+    topic_count = component_metrics['broker_connections'].get(broker, 0)
+    impacted_apps = component_metrics['broker_impacted_apps'].get(broker, 0)
+    
+    # Rule 1: High Topic Coverage
+    topic_coverage = topic_count / max(1, total_components['topics'])
+    if topic_coverage > thresholds.broker_topic_coverage:
+        criticality_reasons.append(f"Routes {topic_count} topics ({topic_coverage:.0%} of all topics)")
+    
+    # Rule 2: High Application Impact
+    app_impact = impacted_apps / max(1, total_components['applications'])
+    if app_impact > thresholds.broker_application_impact:
+        criticality_reasons.append(f"Impacts {impacted_apps} applications " +
+                                  f"({app_impact:.0%} of all applications)")
+    
+    # Rule 3: Network Articulation Point
+    if broker in articulation_points:
+        criticality_reasons.append("Acts as a network bridge between broker groups")
+    
+    if not criticality_reasons:
+        return None
+    return {
+        'node': broker,
+        'metrics': {
+            'topic_count': topic_count,
+            'topic_coverage': topic_coverage,
+            'impacted_apps': impacted_apps,
+            'app_impact': app_impact
+        },
+        'reasons': criticality_reasons
+    }
+
+def evaluate_node(node, component_metrics, total_components, thresholds, articulation_points, critical_broker_hosts,
+                  centrality_threshold=None):
+    """
+    Apply the infrastructure node criticality rules to one node
+    
+    Args:
+        node: Infrastructure node name
+        component_metrics: Component metrics (see compute_component_metrics)
+        total_components (dict): Number of components per type
+        thresholds: CriticalityThresholds object
+        articulation_points: Container of articulation points of the node layer
+        critical_broker_hosts: Container of nodes hosting a critical broker
+        centrality_threshold (float): Centrality above which a node is critical,
+            or None to skip the rule (scores in component_metrics['node_centrality'])
         
-        if is_critical:
-            critical_components['topic'].append({
-                'node': topic,
-                'metrics': {
-                    'subscriber_count': subscriber_count,
-                    'subscriber_breadth': subscriber_breadth
-                },
-                'reasons': criticality_reasons
-            })
+    Returns:
+        dict: Critical component entry with metrics and reasons, or None if not critical
+    """
+    criticality_reasons = []
+    service_count = component_metrics['node_loads'].get(node, 0)
+    broker_hosts = component_metrics['node_broker_hosts'].get(node, 0)
+    total_services = total_components['applications'] + total_components['brokers']
+    
+    # Rule 1: High Service Density
+    service_density = service_count / max(1, total_services)
+    if service_density > thresholds.node_service_density:
+        criticality_reasons.append(f"Hosts {service_count} services ({service_density:.0%} of all services)")
+    
+    # Rule 2: Hosts Many Brokers
+    broker_hosting_ratio = broker_hosts / max(1, total_components['brokers'])
+    if broker_hosting_ratio > thresholds.node_broker_hosting:
+        criticality_reasons.append(f"Hosts {broker_hosts} brokers " +
+                                  f"({broker_hosting_ratio:.0%} of all brokers)")
+    
+    # Rule 3: Hosts Critical Brokers
+    if node in critical_broker_hosts:
+        criticality_reasons.append("Hosts one or more critical brokers")
+    
+    # Rule 4: Infrastructure Bridge
+    if node in articulation_points:
+        criticality_reasons.append("Acts as a network bridge between infrastructure segments")
+    
+    # Rule 5: Central in the Infrastructure Network (optional)
+    metrics = {
+        'service_count': service_count,
+        'service_density': service_density,
+        'broker_hosts': broker_hosts,
+        'broker_hosting_ratio': broker_hosting_ratio
+    }
+    if centrality_threshold is not None:
+        metrics['centrality'] = component_metrics['node_centrality'].get(node, 0.0)
+        if metrics['centrality'] > centrality_threshold:
+            criticality_reasons.append(f"Central in the infrastructure network (centrality {metrics['centrality']:.2f})")
+    
+    if not criticality_reasons:
+        return None
+    return {
+        'node': node,
+        'metrics': metrics,
+        'reasons': criticality_reasons
+    }
+
+def evaluate_application(app, component_metrics, total_components, thresholds, centrality_threshold=None):
+    """
+    Apply the application criticality rules to one application
     
-    # Organize results for return
-    result = {
-        'critical_components': critical_components,
-        'component_metrics': component_metrics,
-        'thresholds': thresholds
+    Args:
+        app: Application name
+        component_metrics: Component metrics (see compute_component_metrics)
+        total_components (dict): Number of components per type
+        thresholds: CriticalityThresholds object
+        centrality_threshold (float): Centrality above which an application is critical,
+            or None to skip the rule (scores in component_metrics['app_centrality'])
+        
+    Returns:
+        dict: Critical component entry with metrics and reasons, or None if not critical
+    """
+    criticality_reasons = []
+    
+    # Rule 1: Many Dependent Applications
+    dependent_count = component_metrics['app_dependencies'].get(app, 0)
+    dependency_ratio = dependent_count / max(1, total_components['applications'] - 1)  # Exclude self
+    
+    if dependency_ratio > thresholds.app_dependency_ratio:
+        criticality_reasons.append(f"Has {dependent_count} dependent applications " +
+                                  f"({dependency_ratio:.0%} of other applications)")
+    
+    # Rule 2: Exclusive Publisher for Many Topics
+    exclusive_topics = component_metrics['app_exclusive_topics'].get(app, [])
+    if len(exclusive_topics) >= thresholds.app_publisher_uniqueness:
+        criticality_reasons.append(f"Sole publisher for {len(exclusive_topics)} topics")
+    
+    # Rule 3: Central in the Dependency Network (optional)
+    metrics = {
+        'dependent_count': dependent_count,
+        'dependency_ratio': dependency_ratio,
+        'exclusive_topics': len(exclusive_topics),
+        'exclusive_topic_names': [t for t in exclusive_topics]
+    }
+    if centrality_threshold is not None:
+        metrics['centrality'] = component_metrics['app_centrality'].get(app, 0.0)
+        if metrics['centrality'] > centrality_threshold:
+            criticality_reasons.append(f"Central in the application dependency network " +
+                                      f"(centrality {metrics['centrality']:.2f})")
+    
+    if not criticality_reasons:
+        return None
+    return {
+        'node': app,
+        'metrics': metrics,
+        'reasons': criticality_reasons
     }
+
+def evaluate_topic(topic, component_metrics, total_components, thresholds):
+    """
+    Apply the topic criticality rules to one topic
     
-    return result
+    Args:
+        topic: Topic name
+        component_metrics: Component metrics (see compute_component_metrics)
+        total_components (dict): Number of components per type
+        thresholds: CriticalityThresholds object
+        
+    Returns:
+        dict: Critical component entry with metrics and reasons, or None if not critical
+    """
+    criticality_reasons = []
+    subscriber_count = component_metrics['topic_subscribers'].get(topic, 0)
+    
+    # Rule 1: High Subscriber Breadth
+    subscriber_breadth = subscriber_count / max(1, total_components['applications'])
+    
+    if (subscriber_count >= thresholds.topic_criticality_minimum_subs and 
+        subscriber_breadth > thresholds.topic_subscriber_breadth):
+        criticality_reasons.append(f"Has {subscriber_count} subscribers " +
+                                 f"({subscriber_breadth:.0%} of all applications)")
+    
+    # Rule 2: Cross-System Communication (this would require more complex analysis)
+    # This would need community detection or other advanced algorithms
+    
+    if not criticality_reasons:
+        return None
+    return {
+        'node': topic,
+        'metrics': {
+            'subscriber_count': subscriber_count,
+            'subscriber_breadth': subscriber_breadth
+        },
+        'reasons': criticality_reasons
+    }
 
 def print_critical_summary(critical_components_analysis):
     """
-    Print a summary of identified critical components
+    Print the thresholds used and a summary of identified critical components
     
     Args:
         critical_components_analysis: Results of critical component identification
     """
     critical_components = critical_components_analysis['critical_components']
     
+    critical_components_analysis['thresholds'].print_thresholds()
     print("\nCritical Component Summary:")
     
     if not any(critical_components.values()):
@@ -399,6 +471,7 @@ def get_simulation_targets(critical_components_analysis):
         dict: Dictionary of critical components to simulate failures for
     """
     critical_components = critical_components_analysis['critical_components']
+    ranking = critical_components_analysis.get('ranking')
     
     # Prepare for failure simulations
     simulation_targets = {}
@@ -406,9 +479,15 @@ def get_simulation_targets(critical_components_analysis):
     # Get one component of each type for simulation (if available)
     for component_type, components in critical_components.items():
         if components:
-            # Take the first critical component of each type
+            # Take the highest ranked critical component of each type, or the first one without a ranking
+            target = components[0]['node']
+            if ranking is not None:
+                critical = {component_info['node'] for component_info in components}
+                ranked = [entry['node'] for entry in ranking.top(component_type) if entry['node'] in critical]
+                if ranked:
+                    target = ranked[0]
             simulation_targets[component_type] = {
-                'node': components[0]['node'],
+                'node': target,
                 'type': component_type.capitalize()  # Convert 'broker' to 'Broker', etc.
             }
     
@@ -419,11 +498,14 @@ if __name__ == "__main__":
     import matplotlib.pyplot as plt
     
     from pubsub_config import SystemConfig, parse_args
+    from pubsub_log import configure_logging
     from pubsub_graph import create_complete_graph
     
     try:
         # Parse arguments
         config, args = parse_args()
+        configure_logging()
+        config.print_summary()
         
         # Create graph
         print("Creating graph model...")
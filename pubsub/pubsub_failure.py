@@ -6,9 +6,150 @@ This module provides functions for simulating component failures
 and assessing their impact on system functionality.
 """
 
-import networkx as nx
+from dataclasses import dataclass, field
+from pubsub_index import get_typed_index
+from pubsub_matrix import get_broker_impact
+from pubsub_connectivity import get_block_cut_tree
+from pubsub_bitset import get_application_bitsets
 
-def simulate_failure(G, failed_component, component_type):
+# Resilience recommendations printed for each failed component type
+RESILIENCE_RECOMMENDATIONS = {
+    'Broker': ("Implement broker redundancy and load balancing",
+               "Consider multi-broker topic replication"),
+    'Node': ("Distribute critical services across multiple nodes",
+             "Implement automated service migration capabilities"),
+    'Application': ("Reduce exclusive topic publishing",
+                    "Implement application redundancy for critical publishers"),
+    'Topic': ("Consider topic partitioning to distribute message load",
+              "Implement message replay capabilities for recovery")
+}
+
+@dataclass(slots=True)
+class FailureImpact:
+    """
+    Results of simulating the failure of one component
+    
+    Fields that do not apply to the failed component type stay at their defaults.
+    
+    Attributes:
+        component: Failed component
+        component_type (str): Broker, Node, Application or Topic
+        impacted (ImpactSet): Impacted applications
+        total_applications (int): Number of applications in the system
+        failed_services (tuple): Services that go down with a failed node
+        routed_topics (int): Topics routed by a failed broker
+        hosted_services (int): Services hosted by a failed node
+        hosted_applications (int): Applications hosted by a failed node
+        hosted_brokers (int): Brokers hosted by a failed node
+        segment_sizes (tuple): Sizes of the pieces a failed broker or node splits its layer into
+        remaining (int): Brokers or nodes left to take over the load
+        current_load (float): Average load of the remaining nodes
+        additional_load (float): Average load each remaining broker or node takes over
+        overloaded_brokers (list): Remaining brokers whose load grows by more than 50%
+        broker_failures (dict): Cascaded FailureImpact of each broker on a failed node
+        dependent_applications (int): Applications depending on a failed application
+        exclusive_topics (int): Topics a failed application is the sole publisher for
+        exclusive_subscribers (int): Other applications only impacted through those topics
+        publishers (int): Publishers of a failed topic
+        subscribers (int): Subscribers of a failed topic
+        publisher_dependents (int): Subscribers of a failed topic depending on one of its publishers
+    """
+    component: object
+    component_type: str
+    impacted: object = None
+    total_applications: int = 0
+    failed_services: tuple = ()
+    routed_topics: int = 0
+    hosted_services: int = 0
+    hosted_applications: int = 0
+    hosted_brokers: int = 0
+    segment_sizes: tuple = ()
+    remaining: int = 0
+    current_load: float = 0.0
+    additional_load: float = 0.0
+    overloaded_brokers: list = field(default_factory=list)
+    broker_failures: dict = field(default_factory=dict)
+    dependent_applications: int = 0
+    exclusive_topics: int = 0
+    exclusive_subscribers: int = 0
+    publishers: int = 0
+    subscribers: int = 0
+    publisher_dependents: int = 0
+    
+    @property
+    def impacted_applications(self):
+        """Number of impacted applications"""
+        return len(self.impacted) if self.impacted is not None else 0
+    
+    @property
+    def impact_percentage(self):
+        """Percentage of all applications impacted"""
+        if self.total_applications == 0:
+            return 0.0
+        return (self.impacted_applications / self.total_applications) * 100
+    
+    @property
+    def severity(self):
+        """Impact severity: LOW, MODERATE, HIGH or SEVERE"""
+        if self.impact_percentage < 10:
+            return 'LOW'
+        if self.impact_percentage < 30:
+            return 'MODERATE'
+        if self.impact_percentage < 60:
+            return 'HIGH'
+        return 'SEVERE'
+    
+    @property
+    def resilience_score(self):
+        """Resilience against this failure on a 0-10 scale"""
+        return max(0, 10 - (self.impact_percentage / 10))
+
+@dataclass(slots=True)
+class FailureSimulations:
+    """
+    Results of the failure simulations of the critical components
+    
+    Attributes:
+        impacts (dict): Component type -> FailureImpact of its simulated critical component
+        availability (AvailabilityResult): Availability under random failures, if simulated
+    """
+    impacts: dict = field(default_factory=dict)
+    availability: object = None
+    
+    @property
+    def resilience_scores(self):
+        """Component type -> {'impact_percentage', 'resilience_score'}"""
+        return {component_type: {'impact_percentage': impact.impact_percentage,
+                                 'resilience_score': impact.resilience_score}
+                for component_type, impact in self.impacts.items()}
+    
+    def overlap(self, first_type, second_type):
+        """
+        Count the applications impacted by two of the simulated failures
+        
+        Args:
+            first_type (str): Component type of the first failure (e.g. 'broker')
+            second_type (str): Component type of the second failure (e.g. 'node')
+            
+        Returns:
+            int: Number of applications impacted by both failures
+        """
+        return self.impacts[first_type].impacted.overlap(self.impacts[second_type].impacted)
+    
+    @property
+    def overall_score(self):
+        """
+        Average resilience score over the simulated failures, counting the
+        resilience under random failures as one more score (None if there are none)
+        """
+        scores = [impact.resilience_score for impact in self.impacts.values()]
+        if self.availability is not None:
+            scores.append(self.availability.resilience_score)
+        if not scores:
+            return None
+        return sum(scores) / len(scores)
+
+def simulate_failure(G, failed_component, component_type, index=None):
     """
     Simulate the failure of a specific component and assess system impact
     
@@ -16,351 +157,286 @@ def simulate_failure(G, failed_component, component_type):
         G: NetworkX graph object
         failed_component: The node ID of the component to simulate failure for
         component_type: The type of component (Broker, Node, Application, Topic)
+        index: TypedIndex of G (built if not given)
         
     Returns:
-        set: Set of impacted nodes
+        FailureImpact: Impact of the failure (see print_failure_impact for the report)
     """
-    print(f"\n=== Simulating Failure of {failed_component} ({component_type}) ===")
+    if index is None:
+        index = get_typed_index(G)
     
-    impacted_nodes = set()
+    bitsets = get_application_bitsets(index)
+    result = FailureImpact(failed_component, component_type, bitsets.empty(), len(bitsets))
     
     if component_type == "Broker":
         # Find topics routed by this broker
-        affected_topics = [node for node in G.successors(failed_component) 
-                          if G.nodes[node].get('type') == 'Topic' and G[failed_component][node].get('type') == 'ROUTES']
-        
-        print(f"Broker {failed_component} routes {len(affected_topics)} topics")
+        affected_topics = index.routed_topics(failed_component)
+        result.routed_topics = len(affected_topics)
         
         # Find applications using these topics
-        for topic in affected_topics:
-            publishers = [node for node in G.predecessors(topic) 
-                         if G.nodes[node].get('type') == 'Application' and G[node][topic].get('type') == 'PUBLISHES_TO']
-            
-            subscribers = [node for node in G.predecessors(topic) 
-                          if G.nodes[node].get('type') == 'Application' and G[node][topic].get('type') == 'SUBSCRIBES_TO']
-            
-            impacted_nodes.update(publishers)
-            impacted_nodes.update(subscribers)
+        broker_impact = get_broker_impact(index)
+        row = broker_impact['broker_rows'].get(failed_component)
+        if row is not None:
+            result.impacted = bitsets.from_csr_row(broker_impact['impact'], row)
+        
+        # Check whether the broker holds the broker network together
+        broker_tree = get_block_cut_tree(index, 'Broker')
+        if broker_tree.is_articulation_point(failed_component):
+            result.segment_sizes = broker_tree.component_sizes_after_removal(failed_component)
         
-        print(f"Impact: {len(impacted_nodes)} applications affected")
-        if impacted_nodes:
-            print("Affected applications:")
-            # Limit list to first 10 applications if there are many
-            app_list = sorted(impacted_nodes)
-            display_apps = app_list[:10]
-            for app in display_apps:
-                print(f"  - {app}")
-            if len(app_list) > 10:
-                print(f"  ... and {len(app_list) - 10} more applications")
-
         # Calculate effect on remaining broker load
-        remaining_brokers = [node for node, attrs in G.nodes(data=True) 
-                            if attrs.get('type') == 'Broker' and node != failed_component]
+        remaining_brokers = [node for node in index.nodes_of_type('Broker') if node != failed_component]
+        result.remaining = len(remaining_brokers)
         
         if remaining_brokers:
-            # Find current load on remaining brokers
-            current_topics_per_broker = {}
-            for broker in remaining_brokers:
-                topics = [node for node in G.successors(broker) 
-                         if G.nodes[node].get('type') == 'Topic' and G[broker][node].get('type') == 'ROUTES']
-                current_topics_per_broker[broker] = len(topics)
-            
             # Calculate theoretical redistribution
-            avg_additional_load = len(affected_topics) / len(remaining_brokers)
-            print(f"\nLoad impact on remaining brokers:")
-            print(f"  {len(affected_topics)} topics must be redistributed among {len(remaining_brokers)} brokers")
-            print(f"  Average additional load per broker: {avg_additional_load:.1f} topics")
+            result.additional_load = len(affected_topics) / len(remaining_brokers)
             
             # Identify brokers that might be overloaded
-            potential_overloads = []
-            for broker, current_topics in current_topics_per_broker.items():
-                new_total = current_topics + avg_additional_load
+            for broker in remaining_brokers:
+                current_topics = len(index.routed_topics(broker))
+                new_total = current_topics + result.additional_load
                 if new_total > 1.5 * current_topics:  # 50% increase is significant
-                    potential_overloads.append(broker)
-            
-            if potential_overloads:
-                print("  Warning: These brokers may become overloaded:")
-                for broker in potential_overloads[:5]:  # Limit list
-                    print(f"    - {broker}")
-                if len(potential_overloads) > 5:
-                    print(f"    ... and {len(potential_overloads) - 5} more brokers")
+                    result.overloaded_brokers.append(broker)
     
     elif component_type == "Node":
         # Find services running on this node
-        affected_services = [node for node in G.predecessors(failed_component) 
-                            if G[node][failed_component].get('type') == 'RUNS_ON']
-        
-        print(f"Node {failed_component} hosts {len(affected_services)} services")
+        affected_services = index.hosted_services(failed_component)
+        affected_brokers = index.hosted_services(failed_component, 'Broker')
+        result.hosted_services = len(affected_services)
+        result.hosted_applications = len(index.hosted_services(failed_component, 'Application'))
+        result.hosted_brokers = len(affected_brokers)
         
-        # Categorize affected services
-        affected_apps = []
-        affected_brokers = []
+        # Check whether the node holds the infrastructure network together
+        node_tree = get_block_cut_tree(index, 'Node')
+        if node_tree.is_articulation_point(failed_component):
+            result.segment_sizes = node_tree.component_sizes_after_removal(failed_component)
         
-        for service in affected_services:
-            if G.nodes[service].get('type') == 'Application':
-                affected_apps.append(service)
-            elif G.nodes[service].get('type') == 'Broker':
-                affected_brokers.append(service)
-        
-        print(f"Directly affected: {len(affected_apps)} applications, {len(affected_brokers)} brokers")
-        
-        # Add directly affected services to impacted nodes
-        impacted_nodes.update(affected_services)
+        # Services on the node go down with it
+        result.failed_services = affected_services
+        result.impacted = bitsets.from_names(affected_services)
         
         # For affected brokers, analyze cascade impact
-        broker_impacted_nodes = set()
         for broker in affected_brokers:
-            broker_impacted = simulate_failure(G, broker, "Broker")
-            broker_impacted_nodes.update(broker_impacted)
-        
-        # Add indirectly affected nodes
-        impacted_nodes.update(broker_impacted_nodes)
+            broker_failure = simulate_failure(G, broker, "Broker", index)
+            result.broker_failures[broker] = broker_failure
+            result.impacted = result.impacted | broker_failure.impacted
         
         # Calculate capacity impact on remaining nodes
-        remaining_nodes = [node for node, attrs in G.nodes(data=True) 
-                          if attrs.get('type') == 'Node' and node != failed_component]
+        remaining_nodes = [node for node in index.nodes_of_type('Node') if node != failed_component]
+        result.remaining = len(remaining_nodes)
         
         if remaining_nodes and affected_services:
-            print(f"\nCapacity impact analysis:")
-            print(f"  {len(affected_services)} services must be redistributed among {len(remaining_nodes)} nodes")
-            
-            # Get current load on remaining nodes
-            current_load = {}
-            for node in remaining_nodes:
-                services = [n for n in G.predecessors(node) 
-                           if G[n][node].get('type') == 'RUNS_ON']
-                current_load[node] = len(services)
-            
-            avg_current_load = sum(current_load.values()) / len(current_load)
-            avg_additional_load = len(affected_services) / len(remaining_nodes)
-            new_avg_load = avg_current_load + avg_additional_load
-            
-            print(f"  Current average load: {avg_current_load:.1f} services per node")
-            print(f"  Additional average load: {avg_additional_load:.1f} services per node")
-            print(f"  New average load: {new_avg_load:.1f} services per node")
-            
-            # Show potential capacity concerns
-            if new_avg_load > avg_current_load * 1.3:  # 30% increase
-                print("  Warning: System may experience capacity issues after redistribution")
-        
-        # Count total affected applications
-        affected_app_count = sum(1 for node in impacted_nodes if G.nodes[node].get('type') == 'Application')
-        print(f"Total applications affected: {affected_app_count}")
+            result.current_load = sum(len(index.hosted_services(node)) for node in remaining_nodes) / len(remaining_nodes)
+            result.additional_load = len(affected_services) / len(remaining_nodes)
     
     elif component_type == "Application":
         # Find applications that depend on this one
-        dependent_apps = [node for node in G.predecessors(failed_component) 
-                         if G.nodes[node].get('type') == 'Application' and G[node][failed_component].get('type') == 'DEPENDS_ON']
-        
-        impacted_nodes.update(dependent_apps)
+        dependent_apps = bitsets.from_names(index.dependents(failed_component))
         
         # Find topics exclusively published by this application
-        exclusive_topics = []
-        for topic, attrs in G.nodes(data=True):
-            if attrs.get('type') == 'Topic':
-                publishers = [n for n in G.predecessors(topic) 
-                             if G.nodes[n].get('type') == 'Application' and G[n][topic].get('type') == 'PUBLISHES_TO']
-                if publishers == [failed_component]:
-                    exclusive_topics.append(topic)
+        exclusive_topics = [topic for topic in index.published_topics(failed_component)
+                            if index.publishers(topic) == (failed_component,)]
         
         # Find applications that subscribe to exclusively published topics
-        additional_impacted = set()
-        for topic in exclusive_topics:
-            subscribers = [n for n in G.predecessors(topic) 
-                          if G.nodes[n].get('type') == 'Application' and G[n][topic].get('type') == 'SUBSCRIBES_TO']
-            additional_impacted.update(subscribers)
-        
-        # Add to total impacted nodes
-        impacted_nodes.update(additional_impacted)
-        
-        # Summarize impact
-        direct_deps = len(dependent_apps)
-        subscribers_to_exclusive = len(additional_impacted - set(dependent_apps))
-        
-        print(f"Application {failed_component} failure impacts:")
-        print(f"  - {direct_deps} directly dependent applications")
-        if exclusive_topics:
-            print(f"  - Exclusively publishes to {len(exclusive_topics)} topics")
-            print(f"  - {subscribers_to_exclusive} additional applications affected via topic subscriptions")
+        additional_impacted = bitsets.from_names(
+            app for topic in exclusive_topics for app in index.subscribers(topic))
+        result.impacted = dependent_apps | additional_impacted
         
-        # List impacted applications
-        if impacted_nodes:
-            print("\nImpacted applications:")
-            app_list = sorted(impacted_nodes)
-            display_apps = app_list[:10]
-            for app in display_apps:
-                print(f"  - {app}")
-            if len(app_list) > 10:
-                print(f"  ... and {len(app_list) - 10} more applications")
+        result.dependent_applications = len(dependent_apps)
+        result.exclusive_topics = len(exclusive_topics)
+        result.exclusive_subscribers = len(additional_impacted - dependent_apps)
     
     elif component_type == "Topic":
         # Find applications publishing to or subscribing from this topic
-        publishers = [node for node in G.predecessors(failed_component) 
-                     if G.nodes[node].get('type') == 'Application' and G[node][failed_component].get('type') == 'PUBLISHES_TO']
-        
-        subscribers = [node for node in G.predecessors(failed_component) 
-                      if G.nodes[node].get('type') == 'Application' and G[node][failed_component].get('type') == 'SUBSCRIBES_TO']
-        
-        # Add to impacted nodes
-        impacted_nodes.update(publishers)
-        impacted_nodes.update(subscribers)
-        
-        # Analyze dependency chain
-        subscription_map = {}
-        for app in subscribers:
-            # Check if subscribers depend on publishers
-            for pub in publishers:
-                if app != pub:  # Skip self-dependencies
-                    for u, v, attrs in G.edges(data=True):
-                        if (u == app and v == pub and attrs.get('type') == 'DEPENDS_ON'):
-                            if app not in subscription_map:
-                                subscription_map[app] = []
-                            subscription_map[app].append(pub)
-        
-        # Summarize impact
-        print(f"Topic {failed_component} failure impacts:")
-        print(f"  - {len(publishers)} publisher applications")
-        print(f"  - {len(subscribers)} subscriber applications")
-        
-        if subscription_map:
-            print(f"  - {len(subscription_map)} applications with direct dependencies on publishers")
-        
-        # List impacted applications
-        if impacted_nodes:
-            print("\nImpacted applications:")
-            app_list = sorted(impacted_nodes)
-            display_apps = app_list[:10]
-            for app in display_apps:
-                print(f"  - {app}")
-            if len(app_list) > 10:
-                print(f"  ... and {len(app_list) - 10} more applications")
-    
-    # Calculate the percentage of system impacted
-    total_apps = sum(1 for node, attrs in G.nodes(data=True) if attrs.get('type') == 'Application')
-    impacted_apps = sum(1 for node in impacted_nodes if G.nodes[node].get('type') == 'Application')
-    
-    if total_apps > 0:
-        impact_percentage = (impacted_apps / total_apps) * 100
-        print(f"\nSystem Impact: {impact_percentage:.1f}% of applications affected")
-        
-        # Provide an impact severity assessment
-        if impact_percentage < 10:
-            print("Impact Assessment: LOW - System can tolerate this failure with minimal disruption")
-        elif impact_percentage < 30:
-            print("Impact Assessment: MODERATE - Significant but manageable disruption")
-        elif impact_percentage < 60:
-            print("Impact Assessment: HIGH - Major system disruption")
-        else:
-            print("Impact Assessment: SEVERE - Critical system failure")
-        
-        # Provide resilience recommendations
-        print("\nResilience Recommendations:")
-        if component_type == "Broker":
-            print("  - Implement broker redundancy and load balancing")
-            print("  - Consider multi-broker topic replication")
-        elif component_type == "Node":
-            print("  - Distribute critical services across multiple nodes")
-            print("  - Implement automated service migration capabilities")
-        elif component_type == "Application":
-            print("  - Reduce exclusive topic publishing")
-            print("  - Implement application redundancy for critical publishers")
-        elif component_type == "Topic":
-            print("  - Consider topic partitioning to distribute message load")
-            print("  - Implement message replay capabilities for recovery")
-    
-    return impacted_nodes
+        publishers = index.publishers(failed_component)
+        subscribers = index.subscribers(failed_component)
+        result.impacted = bitsets.from_names(publishers + subscribers)
+        
+        # Count subscribers depending on a publisher (skipping self-dependencies)
+        result.publishers = len(publishers)
+        result.subscribers = len(subscribers)
+        result.publisher_dependents = sum(
+            1 for app in subscribers
+            if any(app != pub and pub in index.dependencies(app) for pub in publishers))
+    
+    return result
 
-def run_failure_simulations(G, critical_components):
+def run_failure_simulations(G, critical_components, index=None, availability=None):
     """
     Run failure simulations on the identified critical components
     
     Args:
         G: NetworkX graph object
         critical_components: Dictionary with critical component information
+        index: TypedIndex of G (built if not given)
+        availability: AvailabilityResult included in the resilience score (optional,
+                      see pubsub_availability.simulate_availability)
         
     Returns:
-        dict: Dictionary with simulation results
+        FailureSimulations: Simulation results (see print_failure_simulations for the report)
+    """
+    if index is None:
+        index = get_typed_index(G)
+    
+    simulations = FailureSimulations(availability=availability)
+    for component_type in ('broker', 'node', 'application', 'topic'):
+        if component_type in critical_components:
+            simulations.impacts[component_type] = simulate_failure(
+                G, critical_components[component_type]['node'], component_type.capitalize(), index)
+    
+    return simulations
+
+def _print_application_list(applications):
+    """Print up to 10 impacted applications"""
+    app_list = sorted(applications)
+    for app in app_list[:10]:
+        print(f"  - {app}")
+    if len(app_list) > 10:
+        print(f"  ... and {len(app_list) - 10} more applications")
+
+def print_failure_impact(impact):
+    """
+    Print the report of one simulated failure
+    
+    Args:
+        impact: FailureImpact object
+    """
+    component = impact.component
+    print(f"\n=== Simulating Failure of {component} ({impact.component_type}) ===")
+    
+    if impact.component_type == "Broker":
+        print(f"Broker {component} routes {impact.routed_topics} topics")
+        print(f"Impact: {len(impact.impacted)} applications affected")
+        if impact.impacted:
+            print("Affected applications:")
+            _print_application_list(impact.impacted)
+        if impact.segment_sizes:
+            print(f"Broker network splits into {len(impact.segment_sizes)} segments " +
+                  f"({', '.join(str(size) for size in impact.segment_sizes)} brokers)")
+        
+        if impact.remaining:
+            print(f"\nLoad impact on remaining brokers:")
+            print(f"  {impact.routed_topics} topics must be redistributed among {impact.remaining} brokers")
+            print(f"  Average additional load per broker: {impact.additional_load:.1f} topics")
+            if impact.overloaded_brokers:
+                print("  Warning: These brokers may become overloaded:")
+                for broker in impact.overloaded_brokers[:5]:  # Limit list
+                    print(f"    - {broker}")
+                if len(impact.overloaded_brokers) > 5:
+                    print(f"    ... and {len(impact.overloaded_brokers) - 5} more brokers")
+    
+    elif impact.component_type == "Node":
+        print(f"Node {component} hosts {impact.hosted_services} services")
+        print(f"Directly affected: {impact.hosted_applications} applications, {impact.hosted_brokers} brokers")
+        if impact.segment_sizes:
+            print(f"Infrastructure network splits into {len(impact.segment_sizes)} segments " +
+                  f"({', '.join(str(size) for size in impact.segment_sizes)} nodes)")
+        
+        for broker_failure in impact.broker_failures.values():
+            print_failure_impact(broker_failure)
+        
+        if impact.remaining and impact.hosted_services:
+            new_avg_load = impact.current_load + impact.additional_load
+            print(f"\nCapacity impact analysis:")
+            print(f"  {impact.hosted_services} services must be redistributed among {impact.remaining} nodes")
+            print(f"  Current average load: {impact.current_load:.1f} services per node")
+            print(f"  Additional average load: {impact.additional_load:.1f} services per node")
+            print(f"  New average load: {new_avg_load:.1f} services per node")
+            if new_avg_load > impact.current_load * 1.3:  # 30% increase
+                print("  Warning: System may experience capacity issues after redistribution")
+        
+        print(f"Total applications affected: {impact.impacted_applications}")
+    
+    elif impact.component_type == "Application":
+        print(f"Application {component} failure impacts:")
+        print(f"  - {impact.dependent_applications} directly dependent applications")
+        if impact.exclusive_topics:
+            print(f"  - Exclusively publishes to {impact.exclusive_topics} topics")
+            print(f"  - {impact.exclusive_subscribers} additional applications affected via topic subscriptions")
+        if impact.impacted:
+            print("\nImpacted applications:")
+            _print_application_list(impact.impacted)
+    
+    elif impact.component_type == "Topic":
+        print(f"Topic {component} failure impacts:")
+        print(f"  - {impact.publishers} publisher applications")
+        print(f"  - {impact.subscribers} subscriber applications")
+        if impact.publisher_dependents:
+            print(f"  - {impact.publisher_dependents} applications with direct dependencies on publishers")
+        if impact.impacted:
+            print("\nImpacted applications:")
+            _print_application_list(impact.impacted)
+    
+    if impact.total_applications > 0:
+        print(f"\nSystem Impact: {impact.impact_percentage:.1f}% of applications affected")
+        
+        # Impact severity assessment
+        descriptions = {
+            'LOW': "System can tolerate this failure with minimal disruption",
+            'MODERATE': "Significant but manageable disruption",
+            'HIGH': "Major system disruption",
+            'SEVERE': "Critical system failure"
+        }
+        print(f"Impact Assessment: {impact.severity} - {descriptions[impact.severity]}")
+        
+        print("\nResilience Recommendations:")
+        for recommendation in RESILIENCE_RECOMMENDATIONS.get(impact.component_type, ()):
+            print(f"  - {recommendation}")
+
+def print_failure_simulations(simulations):
     """
-    simulation_results = {}
+    Print the report of the failure simulations and the system resilience assessment
     
-    if not critical_components:
+    Args:
+        simulations: FailureSimulations object
+    """
+    if not simulations.impacts and simulations.availability is None:
         print("\nNo critical components identified for failure simulation.")
-        return simulation_results
+        return
     
     print("\n=== Failure Impact Simulation ===")
     print("Analyzing the potential impact of critical component failures")
     
-    # Simulate broker failure
-    if 'broker' in critical_components:
-        critical_broker = critical_components['broker']['node']
-        print(f"\nSimulating failure of critical broker: {critical_broker}")
-        simulation_results['broker'] = simulate_failure(G, critical_broker, "Broker")
-    
-    # Simulate node failure
-    if 'node' in critical_components:
-        critical_node = critical_components['node']['node']
-        print(f"\nSimulating failure of critical node: {critical_node}")
-        simulation_results['node'] = simulate_failure(G, critical_node, "Node")
-    
-    # Simulate application failure
-    if 'application' in critical_components:
-        critical_app = critical_components['application']['node']
-        print(f"\nSimulating failure of critical application: {critical_app}")
-        simulation_results['application'] = simulate_failure(G, critical_app, "Application")
-    
-    # Simulate topic failure (optional)
-    if 'topic' in critical_components:
-        critical_topic = critical_components['topic']['node']
-        print(f"\nSimulating failure of critical topic: {critical_topic}")
-        simulation_results['topic'] = simulate_failure(G, critical_topic, "Topic")
-    
-    # Print overall system resilience summary
+    for component_type, impact in simulations.impacts.items():
+        print(f"\nSimulating failure of critical {component_type}: {impact.component}")
+        print_failure_impact(impact)
+    
     print("\n=== System Resilience Assessment ===")
-    resilience_scores = {}
+    for component_type, scores in simulations.resilience_scores.items():
+        print(f"Resilience against {component_type} failure: {scores['resilience_score']:.1f}/10")
+        print(f"  - Impact: {scores['impact_percentage']:.1f}% of applications affected")
     
-    if simulation_results:
-        # Calculate application impact percentages
-        total_apps = sum(1 for node, attrs in G.nodes(data=True) if attrs.get('type') == 'Application')
-        
-        for component_type, impact in simulation_results.items():
-            impacted_apps = sum(1 for node in impact if G.nodes.get(node, {}).get('type') == 'Application')
-            impact_percentage = (impacted_apps / total_apps) * 100 if total_apps > 0 else 0
-            resilience_score = max(0, 10 - (impact_percentage / 10))  # 0-10 scale
-            
-            resilience_scores[component_type] = {
-                'impact_percentage': impact_percentage,
-                'resilience_score': resilience_score
-            }
-            
-            print(f"Resilience against {component_type} failure: {resilience_score:.1f}/10")
-            print(f"  - Impact: {impact_percentage:.1f}% of applications affected")
+    availability = simulations.availability
+    if availability is not None:
+        print(f"Resilience under random failures: {availability.resilience_score:.1f}/10")
+        print(f"  - Expected availability: {availability.expected_availability * 100:.1f}% of applications")
     
-    if resilience_scores:
-        # Calculate overall resilience score (weighted average)
-        overall_score = sum(score['resilience_score'] for score in resilience_scores.values()) / len(resilience_scores)
-        print(f"\nOverall system resilience score: {overall_score:.1f}/10")
-        
-        # Interpret the score
-        if overall_score >= 8.0:
-            print("System exhibits high resilience against critical component failures")
-        elif overall_score >= 6.0:
-            print("System shows moderate resilience but has some vulnerability to failures")
-        else:
-            print("System has significant vulnerability to critical component failures")
-            print("Consider implementing redundancy and decoupling strategies")
-    
-    return simulation_results
+    overall_score = simulations.overall_score
+    print(f"\nOverall system resilience score: {overall_score:.1f}/10")
+    
+    # Interpret the score
+    if overall_score >= 8.0:
+        print("System exhibits high resilience against critical component failures")
+    elif overall_score >= 6.0:
+        print("System shows moderate resilience but has some vulnerability to failures")
+    else:
+        print("System has significant vulnerability to critical component failures")
+        print("Consider implementing redundancy and decoupling strategies")
 
 if __name__ == "__main__":
     import sys
     
     from pubsub_config import SystemConfig, parse_args
+    from pubsub_log import configure_logging
     from pubsub_graph import create_complete_graph
     from pubsub_critical import identify_critical_components, get_simulation_targets
     
     try:
         # Parse arguments
         config, args = parse_args()
+        configure_logging()
+        config.print_summary()
         
         # Create graph
         print("Creating graph model...")
@@ -379,6 +455,7 @@ if __name__ == "__main__":
         
         # Run failure simulations
         simulation_results = run_failure_simulations(G, simulation_targets)
+        print_failure_simulations(simulation_results)
         
         print("\nFailure simulation complete.")
         
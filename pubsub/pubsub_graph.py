@@ -7,8 +7,15 @@ of a publish-subscribe system, including node and relationship creation.
 """
 
 import random
+from itertools import islice
 import networkx as nx
 from py2neo import Graph, Node, Relationship
+from pubsub_placement import create_placement
+from pubsub_compact import PubSubGraphBuilder
+from pubsub_index import attach_layers
+from pubsub_log import get_logger
+
+logger = get_logger(__name__)
 
 def connect_to_neo4j(use_neo4j=True, uri="bolt://localhost:7687", user="neo4j", password="password"):
     """
@@ -24,7 +31,7 @@ def connect_to_neo4j(use_neo4j=True, uri="bolt://localhost:7687", user="neo4j",
         Graph or None: Neo4j graph connection or None if not using Neo4j
     """
     if not use_neo4j:
-        print("Skipping Neo4j connection")
+        logger.info("Skipping Neo4j connection")
         return None
     
     try:
@@ -32,19 +39,145 @@ def connect_to_neo4j(use_neo4j=True, uri="bolt://localhost:7687", user="neo4j",
         graph = Graph(uri, auth=(user, password))
         # Clear existing database to avoid conflicts
         graph.run("MATCH (n) DETACH DELETE n")
-        print("Connected to Neo4j and cleared existing data")
+        logger.info("Connected to Neo4j and cleared existing data")
         return graph
     except Exception as e:
-        print(f"Error connecting to Neo4j: {e}")
-        print("Continuing without Neo4j database")
+        logger.warning("Error connecting to Neo4j: %s", e)
+        logger.warning("Continuing without Neo4j database")
         return None
 
+class BatchedGraphWriter:
+    """
+    Buffers node and relationship creation for a Neo4j database and writes
+    them as parameterized UNWIND statements, one per label/type and batch
+    
+    Any other query sent through run() first flushes pending writes, so the
+    writer can be passed wherever a py2neo Graph is expected.
+    
+    Attributes:
+        graph: Neo4j graph connection (anything with a py2neo-style run method)
+        batch_size (int): Maximum number of rows sent in a single statement
+        round_trips (int): Number of statements sent to the database so far
+    """
+    def __init__(self, graph, batch_size=1000):
+        """
+        Initialize the writer around an existing connection
+        
+        Args:
+            graph: Neo4j graph connection
+            batch_size (int, optional): Rows per UNWIND statement. Defaults to 1000.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        
+        self.graph = graph
+        self.batch_size = batch_size
+        self.round_trips = 0
+        
+        # label -> list of node property dicts
+        self._pending_nodes = {}
+        # (source label, relationship type, target label) -> list of rows
+        self._pending_relationships = {}
+        # Labels that already have an index on name for relationship matching
+        self._indexed_labels = set()
+    
+    def add_node(self, label, properties):
+        """
+        Queue a node for creation
+        
+        Args:
+            label (str): Node label
+            properties (dict): Node properties, including name
+        """
+        rows = self._pending_nodes.setdefault(label, [])
+        rows.append(properties)
+        if len(rows) >= self.batch_size:
+            self._flush_nodes(label)
+    
+    def add_relationship(self, source_label, source_name, rel_type, target_label, target_name, properties):
+        """
+        Queue a relationship between two nodes identified by label and name
+        
+        Args:
+            source_label (str): Label of the source node
+            source_name (str): Name of the source node
+            rel_type (str): Relationship type
+            target_label (str): Label of the target node
+            target_name (str): Name of the target node
+            properties (dict): Relationship properties
+        """
+        key = (source_label, rel_type, target_label)
+        rows = self._pending_relationships.setdefault(key, [])
+        rows.append({"source": source_name, "target": target_name, "properties": properties})
+        if len(rows) >= self.batch_size:
+            # Endpoints may still be buffered, so nodes always go first
+            self._flush_all_nodes()
+            self._flush_relationships(key)
+    
+    def flush(self):
+        """Write all pending nodes and relationships to the database"""
+        self._flush_all_nodes()
+        for key in list(self._pending_relationships):
+            self._flush_relationships(key)
+    
+    def run(self, query, parameters=None, **kwparameters):
+        """
+        Flush pending writes and run a query on the underlying connection
+        
+        Args:
+            query (str): Cypher query
+            parameters (dict, optional): Query parameters
+            
+        Returns:
+            Cursor: Result of the underlying run call
+        """
+        self.flush()
+        return self._run(query, parameters, **kwparameters)
+    
+    def _run(self, query, parameters=None, **kwparameters):
+        """Send a single statement and count the round trip"""
+        self.round_trips += 1
+        return self.graph.run(query, parameters, **kwparameters)
+    
+    def _flush_all_nodes(self):
+        """Write all pending nodes"""
+        for label in list(self._pending_nodes):
+            self._flush_nodes(label)
+    
+    def _flush_nodes(self, label):
+        """Write pending nodes of one label"""
+        rows = self._pending_nodes.pop(label, None)
+        if rows:
+            self._run(f"UNWIND $rows AS row CREATE (n:{label}) SET n = row", {"rows": rows})
+    
+    def _flush_relationships(self, key):
+        """Write pending relationships of one source label/type/target label"""
+        rows = self._pending_relationships.pop(key, None)
+        if not rows:
+            return
+        
+        source_label, rel_type, target_label = key
+        for label in (source_label, target_label):
+            self._ensure_name_index(label)
+        
+        query = (f"UNWIND $rows AS row "
+                 f"MATCH (a:{source_label} {{name: row.source}}) "
+                 f"MATCH (b:{target_label} {{name: row.target}}) "
+                 f"CREATE (a)-[r:{rel_type}]->(b) SET r = row.properties")
+        self._run(query, {"rows": rows})
+    
+    def _ensure_name_index(self, label):
+        """Create an index on name so relationship MATCH clauses avoid label scans"""
+        if label not in self._indexed_labels:
+            self._run(f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.name)")
+            self._indexed_labels.add(label)
+
 def create_node(graph, label, name, properties=None):
     """
     Create a node either in Neo4j or as a dictionary
     
     Args:
-        graph: Neo4j graph connection or None
+        graph: Neo4j graph connection, BatchedGraphWriter or None
         label (str): Node label
         name (str): Node name
         properties (dict, optional): Additional node properties
@@ -56,7 +189,11 @@ def create_node(graph, label, name, properties=None):
         properties = {}
     properties["name"] = name
     
-    if graph is not None:
+    if isinstance(graph, BatchedGraphWriter):
+        # Queue for a batched write and hand back the dictionary representation
+        graph.add_node(label, properties)
+        return {"label": label, "name": name, "properties": properties}
+    elif graph is not None:
         # Create in Neo4j
         node = Node(label, **properties)
         graph.create(node)
@@ -71,7 +208,7 @@ def create_relationship(graph, source_node, rel_type, target_node, properties=No
     Create a relationship either in Neo4j or as a dictionary
     
     Args:
-        graph: Neo4j graph connection or None
+        graph: Neo4j graph connection, BatchedGraphWriter or None
         source_node: Source node
         rel_type (str): Relationship type
         target_node: Target node
@@ -83,7 +220,17 @@ def create_relationship(graph, source_node, rel_type, target_node, properties=No
     if properties is None:
         properties = {}
     
-    if graph is not None:
+    if isinstance(graph, BatchedGraphWriter):
+        # Nodes created through the writer are dictionaries carrying their label
+        graph.add_relationship(source_node["label"], source_node["name"], rel_type,
+                               target_node["label"], target_node["name"], properties)
+        return {
+            "source": source_node["name"],
+            "target": target_node["name"],
+            "type": rel_type,
+            "properties": properties
+        }
+    elif graph is not None:
         # Create in Neo4j
         rel = Relationship(source_node, rel_type, target_node, **properties)
         graph.create(rel)
@@ -178,7 +325,7 @@ def create_infrastructure_connections(graph, nodes, brokers, connection_density=
     
     return relationships if graph is None else None
 
-def create_service_distribution(graph, brokers, nodes, applications, topics, config):
+def create_service_distribution(graph, brokers, nodes, applications, topics, config, placement="least_loaded"):
     """
     Distribute services across infrastructure and create messaging relationships
     
@@ -189,6 +336,7 @@ def create_service_distribution(graph, brokers, nodes, applications, topics, con
         applications: List of application objects
         topics: List of topic objects
         config: System configuration object
+        placement: Placement strategy name or PlacementStrategy subclass (see pubsub_placement)
         
     Returns:
         list or None: List of created relationships if not using Neo4j, None otherwise
@@ -205,30 +353,23 @@ def create_service_distribution(graph, brokers, nodes, applications, topics, con
                 relationships.append(rel)
     else:
         # Otherwise distribute randomly but try to avoid overloading
-        node_load = {node["name"] if isinstance(node, dict) else node["name"]: 0 for node in nodes}
+        broker_placement = create_placement(placement, nodes)
         for broker in brokers:
-            # Find least loaded node
-            target_node_name = min(node_load.items(), key=lambda x: x[1])[0]
-            target_node = next(node for node in nodes if (node["name"] if isinstance(node, dict) else node["name"]) == target_node_name)
+            # Brokers count as heavier load
+            target_node = broker_placement.place(weight=2)
             
             rel = create_relationship(graph, broker, "RUNS_ON", target_node)
             if graph is None:
                 relationships.append(rel)
-            
-            node_load[target_node_name] += 2  # Brokers count as heavier load
     
     # Place applications on nodes - with load balancing
-    node_load = {node["name"] if isinstance(node, dict) else node["name"]: 0 for node in nodes}
+    app_placement = create_placement(placement, nodes)
     for app in applications:
-        # Find least loaded node
-        target_node_name = min(node_load.items(), key=lambda x: x[1])[0]
-        target_node = next(node for node in nodes if (node["name"] if isinstance(node, dict) else node["name"]) == target_node_name)
+        target_node = app_placement.place(weight=1)
         
         rel = create_relationship(graph, app, "RUNS_ON", target_node)
         if graph is None:
             relationships.append(rel)
-        
-        node_load[target_node_name] += 1
     
     # Assign topics to brokers for routing - with load balancing
     # Calculate how many topics each broker should handle
@@ -285,107 +426,177 @@ def create_service_distribution(graph, brokers, nodes, applications, topics, con
     
     return relationships if graph is None else None
 
-def create_derived_relationships(graph, config):
+def create_derived_relationships(graph, config, relationships=None):
     """
     Create derived relationships between components
     
+    An application depends on another if it subscribes to a topic that the other
+    publishes to, and on every broker that routes a topic it publishes or subscribes to.
+    Both rules are evaluated as sparse matrix products (see pubsub_matrix).
+    
     Args:
         graph: Neo4j graph connection or None
         config: System configuration object
+        relationships: List of relationship dictionaries created so far (in-memory mode)
         
     Returns:
         list or None: List of derived relationships if not using Neo4j, None otherwise
     """
     if graph is not None:
-        # Use Neo4j for creating derived relationships
-        
-        # Create derived DEPENDS_ON relationships
-        # An application depends on another if it subscribes to a topic that the other publishes to
+        # Read the messaging layer back once and write the derived pairs in batches
         query = """
-        MATCH (pub:Application)-[:PUBLISHES_TO]->(t:Topic)<-[:SUBSCRIBES_TO]-(sub:Application)
-        WHERE pub <> sub
-        MERGE (sub)-[r:DEPENDS_ON]->(pub)
-        RETURN pub.name, sub.name, count(t) as topic_count
+        MATCH (s)-[r:PUBLISHES_TO|SUBSCRIBES_TO|ROUTES]->(t:Topic)
+        RETURN s.name as source, t.name as target, type(r) as type
         """
-        graph.run(query)
+        messaging_relationships = graph.run(query).data()
+        derived = derive_dependencies(messaging_relationships)
         
-        # Create application-broker dependencies
-        # An application depends on a broker if the broker routes topics that the application publishes to or subscribes to
-        query = """
-        MATCH (app:Application)-[:PUBLISHES_TO|SUBSCRIBES_TO]->(t:Topic)<-[:ROUTES]-(b:Broker)
-        MERGE (app)-[r:DEPENDS_ON]->(b)
-        RETURN app.name, b.name, count(t) as topic_count
-        """
-        graph.run(query)
+        writer = graph if isinstance(graph, BatchedGraphWriter) else BatchedGraphWriter(graph)
+        for rel in derived:
+            writer.add_relationship("Application", rel["source"], "DEPENDS_ON",
+                                    rel["target_label"], rel["target"], rel["properties"])
+        writer.flush()
+        logger.info("Derived %d DEPENDS_ON relationships", len(derived))
         return None
     else:
-        # For in-memory mode, we'd need to implement this logic in Python
-        # This would require knowledge of all relationships created so far
-        print("Skipping derived relationships (Neo4j not available)")
-        return []
+        derived = derive_dependencies(relationships or [])
+        logger.info("Derived %d DEPENDS_ON relationships in memory", len(derived))
+        return derived
 
-def neo4j_to_networkx(graph, all_relationships=None):
+def derive_dependencies(relationships):
+    """
+    Compute derived DEPENDS_ON relationships from relationship dictionaries
+    
+    Args:
+        relationships: List of relationship dictionaries
+        
+    Returns:
+        list: DEPENDS_ON relationship dictionaries with a topic_count property
+    """
+    from pubsub_matrix import derive_dependency_pairs
+    
+    app_pairs, broker_pairs = derive_dependency_pairs(relationships)
+    
+    derived = []
+    for pairs, target_label in ((app_pairs, "Application"), (broker_pairs, "Broker")):
+        derived.extend({"source": source, "target": target, "type": "DEPENDS_ON",
+                        "target_label": target_label, "properties": {"topic_count": count}}
+                       for source, target, count in pairs)
+    return derived
+
+def neo4j_to_networkx(graph, all_relationships=None, all_nodes=None, chunk_size=10000):
     """
     Extract graph data from Neo4j or create from dictionaries and convert to NetworkX
     
     Args:
         graph: Neo4j graph connection or None
         all_relationships: List of relationships if not using Neo4j
+        all_nodes: List of node dictionaries if not using Neo4j
+        chunk_size (int): Number of records streamed into the graph at a time in Neo4j mode
         
     Returns:
-        DiGraph: NetworkX directed graph
+        DiGraph: NetworkX directed graph, with all typed relationships also kept
+            in a layered edge store (see pubsub_index.get_layers), since the
+            DiGraph holds only one edge per pair of nodes
+    
+    Raises:
+        ValueError: If chunk_size is smaller than 1
     """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    
     G = nx.DiGraph()
+    layers = PubSubGraphBuilder()
     
     if graph is not None:
-        # Neo4j mode - extract from database
-        # Add nodes from Neo4j
-        for label in ["Application", "Broker", "Topic", "Node"]:
-            query = f"MATCH (n:{label}) RETURN n.name as name, labels(n) as labels"
-            result = graph.run(query).data()
-            for record in result:
-                G.add_node(record["name"], type=label)
+        # Neo4j mode - stream one node query and one relationship query from the
+        # database, so peak memory is bounded by the chunk size, not the result set
+        query = """
+        MATCH (n) WHERE any(label IN labels(n) WHERE label IN $labels)
+        RETURN n.name as name, [label IN labels(n) WHERE label IN $labels][0] as label,
+               properties(n) as properties
+        """
+        cursor = graph.run(query, labels=["Application", "Broker", "Topic", "Node"])
+        for chunk in _iter_chunks(cursor, chunk_size):
+            # The label becomes the node type, as in in-memory mode
+            for name, label, properties in chunk:
+                properties = {k: v for k, v in properties.items() if k not in ("name", "type")}
+                G.add_node(name, **properties, type=label)
+                layers.add_node(name, label, properties)
         
-        # Add edges from Neo4j
-        for rel_type in ["RUNS_ON", "PUBLISHES_TO", "SUBSCRIBES_TO", "ROUTES", "DEPENDS_ON", "CONNECTS_TO"]:
-            query = f"MATCH (a)-[r:{rel_type}]->(b) RETURN a.name as source, b.name as target, type(r) as type"
-            result = graph.run(query).data()
-            for record in result:
-                G.add_edge(record["source"], record["target"], type=record["type"])
+        query = """
+        MATCH (a)-[r]->(b) WHERE type(r) IN $types
+        RETURN a.name as source, b.name as target, type(r) as type, properties(r) as properties
+        """
+        cursor = graph.run(query, types=["RUNS_ON", "PUBLISHES_TO", "SUBSCRIBES_TO", "ROUTES", "DEPENDS_ON", "CONNECTS_TO"])
+        for chunk in _iter_chunks(cursor, chunk_size):
+            G.add_edges_from(
+                (source, target, {**properties, "type": rel_type})
+                for source, target, rel_type, properties in chunk
+            )
+            for source, target, rel_type, properties in chunk:
+                layers.add_edge(source, target, rel_type, properties)
     else:
-        # In-memory mode - create from dictionaries
-        # This is a simplified version and would need to be expanded for a full implementation
-        # For demonstration purposes only
-        print("Creating NetworkX graph from in-memory data")
-        
-        # Add some sample nodes
-        G.add_node("App-1", type="Application")
-        G.add_node("Broker-1", type="Broker")
-        G.add_node("Topic-1", type="Topic")
-        G.add_node("Node-1", type="Node")
+        # In-memory mode - bulk load the node and relationship dictionaries
+        logger.info("Creating NetworkX graph from in-memory data")
         
-        # Add some sample edges
-        G.add_edge("App-1", "Topic-1", type="PUBLISHES_TO")
-        G.add_edge("Broker-1", "Topic-1", type="ROUTES")
-        G.add_edge("App-1", "Node-1", type="RUNS_ON")
-    
+        # The label becomes the node type; the Application role property would clash with it
+        for node in all_nodes or []:
+            properties = {k: v for k, v in node["properties"].items() if k not in ("name", "type")}
+            G.add_node(node["name"], **properties, type=node["label"])
+            layers.add_node(node["name"], node["label"], properties)
+        G.add_edges_from(
+            (rel["source"], rel["target"], {**rel["properties"], "type": rel["type"]})
+            for rel in all_relationships or []
+        )
+        for rel in all_relationships or []:
+            layers.add_edge(rel["source"], rel["target"], rel["type"], rel["properties"])
+    
+    attach_layers(G, layers.build())
     return G
 
-def create_complete_graph(config, use_neo4j=True):
+def _iter_chunks(records, chunk_size):
+    """
+    Split an iterable of records into lists of at most chunk_size records
+    
+    Args:
+        records: Iterable of records, e.g. a py2neo cursor
+        chunk_size (int): Maximum number of records per chunk
+        
+    Returns:
+        generator: Generator of record lists
+    """
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def create_complete_graph(config, use_neo4j=True, batch_size=1000, placement="least_loaded", bulk_dir=None):
     """
     Create a complete graph model of the pub-sub system
     
     Args:
         config: System configuration object
         use_neo4j (bool): Whether to use Neo4j
+        batch_size (int): Rows per batched Neo4j write, or 0 to create
+            nodes and relationships one at a time
+        placement (str): Service placement strategy (see pubsub_placement)
+        bulk_dir (str): If set, build the model in memory and write it as
+            neo4j-admin import CSV files to this directory instead of Neo4j
         
     Returns:
         tuple: (NetworkX graph, components dictionary)
     """
-    # Connect to Neo4j if needed
-    graph_db = connect_to_neo4j(use_neo4j)
+    # Connect to Neo4j if needed; the bulk backend writes files for an offline import
+    graph_db = connect_to_neo4j(use_neo4j and not bulk_dir)
     
-    print("\n=== Creating System Model ===")
+    # Buffer writes into UNWIND batches instead of one round trip per entity
+    if graph_db is not None and batch_size:
+        graph_db = BatchedGraphWriter(graph_db, batch_size)
+    
+    logger.info("\n=== Creating System Model ===")
     
     # Create system components
     brokers, nodes, applications, topics = create_system(graph_db, config)
@@ -394,10 +605,8 @@ def create_complete_graph(config, use_neo4j=True):
     infra_relationships = create_infrastructure_connections(graph_db, nodes, brokers)
     
     # Create service distribution and messaging relationships
-    service_relationships = create_service_distribution(graph_db, brokers, nodes, applications, topics, config)
-    
-    # Create derived relationships
-    derived_relationships = create_derived_relationships(graph_db, config)
+    service_relationships = create_service_distribution(graph_db, brokers, nodes, applications, topics, config,
+                                                        placement)
     
     # Gather all relationships for in-memory mode
     all_relationships = []
@@ -406,13 +615,18 @@ def create_complete_graph(config, use_neo4j=True):
             all_relationships.extend(infra_relationships)
         if service_relationships:
             all_relationships.extend(service_relationships)
-        if derived_relationships:
-            all_relationships.extend(derived_relationships)
+    
+    # Create derived relationships
+    derived_relationships = create_derived_relationships(graph_db, config, all_relationships)
+    if graph_db is None and derived_relationships:
+        all_relationships.extend(derived_relationships)
     
     # Convert to NetworkX graph
-    G = neo4j_to_networkx(graph_db, all_relationships)
+    G = neo4j_to_networkx(graph_db, all_relationships, brokers + nodes + applications + topics)
     
-    print(f"Created system model with {G.number_of_nodes()} nodes and {G.number_of_edges()} edges")
+    logger.info("Created system model with %d nodes and %d edges", G.number_of_nodes(), G.number_of_edges())
+    if isinstance(graph_db, BatchedGraphWriter):
+        logger.info("Neo4j writes completed in %d round trips (batch size %d)", graph_db.round_trips, batch_size)
     
     components = {
         "brokers": brokers,
@@ -421,16 +635,26 @@ def create_complete_graph(config, use_neo4j=True):
         "topics": topics
     }
     
+    if bulk_dir:
+        from pubsub_bulk import write_bulk_import_files, validate_bulk_import_files
+        files = write_bulk_import_files(components, all_relationships, bulk_dir)
+        counts = validate_bulk_import_files(files['nodes'], files['relationships'])
+        logger.info("Validated %d nodes and %d relationships for import", counts['nodes'], counts['relationships'])
+    
     return G, components
 
 if __name__ == "__main__":
     from pubsub_config import SystemConfig, parse_args
+    from pubsub_log import configure_logging
     
     # Default configuration if run directly
     config, args = parse_args()
+    configure_logging()
+    config.print_summary()
     
     # Create graph with in-memory or Neo4j storage
-    G, components = create_complete_graph(config, use_neo4j=not args.no_neo4j)
+    G, components = create_complete_graph(config, use_neo4j=not args.no_neo4j, batch_size=args.batch_size,
+                                          placement=args.placement, bulk_dir=args.bulk_dir)
     
     print("\nGraph creation complete.")
     print(f"Created {len(components['brokers'])} brokers, {len(components['nodes'])} nodes, " +
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+"""
+Incremental Criticality Module for the Publish-Subscribe System Model
+
+This module provides IncrementalCriticality, which keeps the component
+metrics and critical components of identify_critical_components up to date
+while components and relationships are added or removed, instead of
+rerunning the identification on the whole graph after every change.
+
+Each delta updates the counters of the components it touches and
+re-evaluates the rules for those components only, so a change costs about
+the degree of its endpoints. Changes to a CONNECTS_TO layer recompute the
+articulation points of the affected connected component of that layer.
+Adding or removing a component changes the totals used as denominators by
+the ratio rules, so it also re-evaluates every component whose rules use
+that total.
+"""
+
+from pubsub_threshold import CriticalityThresholds
+from pubsub_index import typed_edges
+from pubsub_connectivity import BlockCutTree
+from pubsub_critical import evaluate_broker, evaluate_node, evaluate_application, evaluate_topic
+
+# Keys of the per-type results, as used by identify_critical_components
+COMPONENT_KEYS = {'Broker': 'broker', 'Node': 'node', 'Application': 'application', 'Topic': 'topic'}
+TOTAL_KEYS = {'Broker': 'brokers', 'Node': 'nodes', 'Application': 'applications', 'Topic': 'topics'}
+
+# Component types whose rules use the total count of a type
+TOTAL_DEPENDENTS = {
+    'Broker': ('Node',),
+    'Node': (),
+    'Application': ('Broker', 'Node', 'Application', 'Topic'),
+    'Topic': ('Broker',)
+}
+
+# Layers whose articulation points feed the criticality rules
+LAYER_TYPES = ('Broker', 'Node')
+
+class IncrementalCriticality:
+    """
+    Critical component identification maintained under topology deltas
+    
+    The engine holds its own copy of the typed relationships of the graph
+    it was built from (including parallel relationships kept in an attached
+    layered edge store) and does not modify the graph. Every update method
+    returns a change feed: a list of dictionaries with the 'node', its
+    'type', the 'change' ('became_critical', 'no_longer_critical',
+    'reasons_changed' or 'removed'), its current 'reasons' and a readable
+    'message'.
+    
+    DEPENDS_ON relationships between applications are derived like
+    derive_dependencies does: a subscriber depends on each other publisher
+    of a topic it subscribes to. PUBLISHES_TO and SUBSCRIBES_TO deltas add
+    the DEPENDS_ON relationship of a pair when it gains its first shared
+    topic and remove it when it loses its last one, so callers do not send
+    them. The relationships of the initial graph are taken as they are.
+    
+    Attributes:
+        thresholds: CriticalityThresholds used by the rules
+        total_components (dict): Number of components per type
+        component_metrics (dict): Metric dictionaries, as returned by compute_component_metrics
+    """
+    def __init__(self, G, config, thresholds=None):
+        """
+        Build the counters and evaluate all rules once
+        
+        Args:
+            G: NetworkX graph object
+            config: SystemConfig object
+            thresholds: CriticalityThresholds to use (calculated from config if not given)
+        """
+        self.thresholds = thresholds if thresholds is not None else CriticalityThresholds(config)
+        self.total_components = {'brokers': 0, 'nodes': 0, 'applications': 0, 'topics': 0}
+        self.component_metrics = {
+            'broker_connections': {},
+            'node_loads': {},
+            'app_dependencies': {},
+            'app_exclusive_topics': {},
+            'topic_subscribers': {},
+            'broker_impacted_apps': {},
+            'node_broker_hosts': {}
+        }
+        
+        self._node_types = {}
+        self._order = {}
+        self._next_order = 0
+        self._edges = set()
+        self._incident = {}
+        
+        self._publishers = {}
+        self._subscribers = {}
+        self._routing_brokers = {}
+        self._hosts = {}
+        self._impacted = {}
+        self._layers = {node_type: {} for node_type in LAYER_TYPES}
+        self._articulation_points = {node_type: set() for node_type in LAYER_TYPES}
+        self._critical_broker_hosts = {}
+        self._critical = {}
+        self._topic_links = {}
+        self._deriving = False
+        
+        self._dirty = set()
+        self._dirty_types = set()
+        self._removed = []
+        self._layer_seeds = {node_type: set() for node_type in LAYER_TYPES}
+        self._layer_rebuild = set()
+        
+        for node, attrs in G.nodes(data=True):
+            self._insert_node(node, attrs.get('type'))
+        for u, v, edge_type in typed_edges(G):
+            self._insert_edge(u, v, edge_type)
+        
+        # Count the topics linking each subscriber to each publisher from now on
+        self._deriving = True
+        for topic, subscribers in self._subscribers.items():
+            if self._node_types[topic] == 'Topic':
+                self._count_topic_links(subscribers, self._publishers.get(topic, ()), 1)
+        self._refresh()
+    
+    def add_node(self, node, node_type):
+        """
+        Add a component
+        
+        Args:
+            node: Component name
+            node_type (str): Component type (Broker, Node, Application or Topic)
+        
+        Returns:
+            list: Change feed
+        """
+        self._insert_node(node, node_type)
+        return self._refresh()
+    
+    def remove_node(self, node):
+        """
+        Remove a component and all its relationships
+        
+        Args:
+            node: Component name
+        
+        Returns:
+            list: Change feed
+        """
+        self._delete_node(node)
+        return self._refresh()
+    
+    def add_edge(self, source, target, edge_type):
+        """
+        Add a relationship between two existing components
+        
+        Args:
+            source: Source component name
+            target: Target component name
+            edge_type (str): Relationship type (e.g. 'PUBLISHES_TO')
+        
+        Returns:
+            list: Change feed
+        """
+        self._insert_edge(source, target, edge_type)
+        return self._refresh()
+    
+    def remove_edge(self, source, target, edge_type):
+        """
+        Remove a relationship
+        
+        Args:
+            source: Source component name
+            target: Target component name
+            edge_type (str): Relationship type
+        
+        Returns:
+            list: Change feed
+        """
+        self._delete_edge(source, target, edge_type)
+        return self._refresh()
+    
+    def apply(self, deltas):
+        """
+        Apply several deltas and re-evaluate the affected components once
+        
+        Args:
+            deltas: Iterable of tuples naming an update method and its arguments,
+                e.g. ('add_node', 'Topic-9', 'Topic') or
+                ('remove_edge', 'App-1', 'Topic-9', 'PUBLISHES_TO')
+        
+        Returns:
+            list: Change feed
+        """
+        operations = {
+            'add_node': self._insert_node,
+            'remove_node': self._delete_node,
+            'add_edge': self._insert_edge,
+            'remove_edge': self._delete_edge
+        }
+        for delta in deltas:
+            if delta[0] not in operations:
+                raise ValueError(f"Unknown delta operation: {delta[0]}")
+            operations[delta[0]](*delta[1:])
+        return self._refresh()
+    
+    def is_critical(self, node):
+        """Check whether a component is currently critical"""
+        return node in self._critical
+    
+    def critical_components(self):
+        """
+        Get the current critical components
+        
+        Returns:
+            dict: Lists of critical component entries by type, in graph node order
+        """
+        critical_components = {key: [] for key in COMPONENT_KEYS.values()}
+        for node in sorted(self._critical, key=self._order.__getitem__):
+            critical_components[COMPONENT_KEYS[self._node_types[node]]].append(self._critical[node])
+        return critical_components
+    
+    def result(self):
+        """
+        Get the current state in the format of identify_critical_components
+        
+        Returns:
+            dict: Dictionary with critical component information and component metrics
+        """
+        return {
+            'critical_components': self.critical_components(),
+            'component_metrics': self.component_metrics,
+            'thresholds': self.thresholds
+        }
+    
+    def _insert_node(self, node, node_type):
+        """Add a component to the counters"""
+        if node in self._node_types:
+            if self._node_types[node] != node_type:
+                raise ValueError(f"Component {node} already exists with type {self._node_types[node]}")
+            return
+        
+        self._node_types[node] = node_type
+        self._order[node] = self._next_order
+        self._next_order += 1
+        self._incident[node] = set()
+        
+        metrics = self.component_metrics
+        if node_type == 'Broker':
+            metrics['broker_connections'][node] = 0
+            metrics['broker_impacted_apps'][node] = 0
+            self._impacted[node] = {}
+        elif node_type == 'Node':
+            metrics['node_loads'][node] = 0
+            metrics['node_broker_hosts'][node] = 0
+        elif node_type == 'Application':
+            metrics['app_dependencies'][node] = 0
+        elif node_type == 'Topic':
+            metrics['topic_subscribers'][node] = 0
+        
+        if node_type in LAYER_TYPES:
+            self._layers[node_type][node] = {}
+            self._layer_seeds[node_type].add(node)
+        self._change_total(node_type, 1)
+        self._dirty.add(node)
+    
+    def _delete_node(self, node):
+        """Remove a component and its relationships from the counters"""
+        if node not in self._node_types:
+            raise ValueError(f"Unknown component: {node}")
+        
+        for key in list(self._incident[node]):
+            # Removing a publication or subscription may already have removed a derived dependency
+            if key in self._edges:
+                self._delete_edge(*key)
+        
+        node_type = self._node_types[node]
+        for metric in self.component_metrics.values():
+            metric.pop(node, None)
+        self._impacted.pop(node, None)
+        if node_type in LAYER_TYPES:
+            del self._layers[node_type][node]
+            self._articulation_points[node_type].discard(node)
+        self._change_total(node_type, -1)
+        
+        if node in self._critical:
+            self._removed.append(self._change(node, 'removed', []))
+            del self._critical[node]
+        del self._node_types[node]
+        del self._order[node]
+        del self._incident[node]
+        self._dirty.discard(node)
+    
+    def _change_total(self, node_type, delta):
+        """Update the count of a component type and mark the rules that use it"""
+        if node_type not in TOTAL_KEYS:
+            return
+        key = TOTAL_KEYS[node_type]
+        before = self.total_components[key]
+        self.total_components[key] = before + delta
+        self._dirty_types.update(TOTAL_DEPENDENTS[node_type])
+        
+        # Articulation points are only reported for layers of at least 3 components
+        if node_type in LAYER_TYPES and (before > 2) != (before + delta > 2):
+            self._layer_rebuild.add(node_type)
+    
+    def _insert_edge(self, u, v, edge_type):
+        """Add a relationship to the counters"""
+        for node in (u, v):
+            if node not in self._node_types:
+                raise ValueError(f"Unknown component: {node}")
+        key = (u, v, edge_type)
+        if key in self._edges:
+            return
+        self._edges.add(key)
+        self._incident[u].add(key)
+        self._incident[v].add(key)
+        self._update_edge(u, v, edge_type, 1)
+    
+    def _delete_edge(self, u, v, edge_type):
+        """Remove a relationship from the counters"""
+        key = (u, v, edge_type)
+        if key not in self._edges:
+            raise ValueError(f"Unknown relationship: {u} -[{edge_type}]-> {v}")
+        self._edges.remove(key)
+        self._incident[u].discard(key)
+        self._incident[v].discard(key)
+        self._update_edge(u, v, edge_type, -1)
+    
+    def _update_edge(self, u, v, edge_type, delta):
+        """
+        Apply the metric changes of adding (delta 1) or removing (delta -1) a relationship
+        
+        Relationships are filtered the same way TypedIndex filters them.
+        """
+        metrics = self.component_metrics
+        source_type = self._node_types[u]
+        target_type = self._node_types[v]
+        
+        if edge_type == 'PUBLISHES_TO':
+            if source_type == 'Application' and target_type == 'Topic':
+                publishers = self._publishers.setdefault(v, set())
+                if len(publishers) == 1:
+                    self._set_exclusive(next(iter(publishers)), v, False)
+                _update_set(publishers, u, delta)
+                if len(publishers) == 1:
+                    self._set_exclusive(next(iter(publishers)), v, True)
+                for broker in self._routing_brokers.get(v, ()):
+                    self._update_impact(broker, u, delta)
+                self._count_topic_links(self._subscribers.get(v, ()), (u,), delta)
+        elif edge_type == 'SUBSCRIBES_TO':
+            if source_type == 'Application':
+                subscribers = self._subscribers.setdefault(v, set())
+                _update_set(subscribers, u, delta)
+                if target_type == 'Topic':
+                    metrics['topic_subscribers'][v] = len(subscribers)
+                    self._dirty.add(v)
+                    self._count_topic_links((u,), self._publishers.get(v, ()), delta)
+                for broker in self._routing_brokers.get(v, ()):
+                    self._update_impact(broker, u, delta)
+        elif edge_type == 'ROUTES':
+            if target_type == 'Topic' and source_type == 'Broker':
+                metrics['broker_connections'][u] += delta
+                _update_set(self._routing_brokers.setdefault(v, set()), u, delta)
+                for app in self._publishers.get(v, ()):
+                    self._update_impact(u, app, delta)
+                for app in self._subscribers.get(v, ()):
+                    self._update_impact(u, app, delta)
+                self._dirty.add(u)
+        elif edge_type == 'RUNS_ON':
+            _update_set(self._hosts.setdefault(u, set()), v, delta)
+            if target_type == 'Node':
+                metrics['node_loads'][v] += delta
+                if source_type == 'Broker':
+                    metrics['node_broker_hosts'][v] += delta
+                self._dirty.add(v)
+                if u in self._critical and source_type == 'Broker':
+                    self._update_critical_host(v, delta)
+        elif edge_type == 'DEPENDS_ON':
+            if source_type == 'Application' and target_type == 'Application':
+                metrics['app_dependencies'][v] += delta
+                self._dirty.add(v)
+        elif edge_type == 'CONNECTS_TO':
+            if source_type == target_type and source_type in LAYER_TYPES:
+                layer = self._layers[source_type]
+                for a, b in ((u, v), (v, u)):
+                    count = layer[a].get(b, 0) + delta
+                    if count:
+                        layer[a][b] = count
+                    else:
+                        del layer[a][b]
+                self._layer_seeds[source_type].update((u, v))
+    
+    def _count_topic_links(self, subscribers, publishers, delta):
+        """Count the topics linking subscribers to publishers and keep their derived DEPENDS_ON relationships"""
+        if not self._deriving:
+            return
+        for subscriber in list(subscribers):
+            for publisher in list(publishers):
+                if subscriber == publisher:
+                    continue
+                pair = (subscriber, publisher)
+                previous = self._topic_links.get(pair, 0)
+                count = previous + delta
+                if count:
+                    self._topic_links[pair] = count
+                else:
+                    del self._topic_links[pair]
+                
+                key = (subscriber, publisher, 'DEPENDS_ON')
+                if not previous and key not in self._edges:
+                    self._insert_edge(*key)
+                elif not count and key in self._edges:
+                    self._delete_edge(*key)
+    
+    def _set_exclusive(self, app, topic, exclusive):
+        """Record whether an application is the sole publisher of a topic"""
+        exclusive_topics = self.component_metrics['app_exclusive_topics']
+        if exclusive:
+            topics = exclusive_topics.setdefault(app, [])
+            topics.append(topic)
+            topics.sort(key=self._order.__getitem__)
+        else:
+            exclusive_topics[app].remove(topic)
+            if not exclusive_topics[app]:
+                del exclusive_topics[app]
+        self._dirty.add(app)
+    
+    def _update_impact(self, broker, app, delta):
+        """Count one (routed topic, application role) pair linking a broker to an application"""
+        impacted = self._impacted[broker]
+        count = impacted.get(app, 0) + delta
+        if count:
+            impacted[app] = count
+        else:
+            del impacted[app]
+        self.component_metrics['broker_impacted_apps'][broker] = len(impacted)
+        self._dirty.add(broker)
+    
+    def _update_critical_host(self, node, delta):
+        """Count the critical brokers hosted on a node"""
+        count = self._critical_broker_hosts.get(node, 0) + delta
+        if count:
+            self._critical_broker_hosts[node] = count
+        else:
+            del self._critical_broker_hosts[node]
+        self._dirty.add(node)
+    
+    def _refresh_layer(self, node_type):
+        """Recompute the articulation points of the layer components touched since the last refresh"""
+        layer = self._layers[node_type]
+        seeds = self._layer_seeds[node_type]
+        if node_type in self._layer_rebuild:
+            seeds = set(layer)
+        
+        # Articulation points stay local to the connected component around each change
+        affected = set()
+        for seed in seeds:
+            if seed in layer and seed not in affected:
+                affected.update(_connected_component(layer, seed))
+        self._layer_seeds[node_type] = set()
+        if not affected:
+            return
+        
+        points = self._articulation_points[node_type]
+        new_points = set()
+        if self.total_components[TOTAL_KEYS[node_type]] > 2:
+            new_points = BlockCutTree(affected, _layer_edges(layer, affected)).articulation_points
+        for node in affected:
+            if (node in points) != (node in new_points):
+                self._dirty.add(node)
+        points.difference_update(affected)
+        points.update(new_points)
+    
+    def _refresh(self):
+        """Re-evaluate the rules for every component marked dirty and return the change feed"""
+        changes = self._removed
+        self._removed = []
+        
+        for node_type in LAYER_TYPES:
+            self._refresh_layer(node_type)
+        self._layer_rebuild = set()
+        
+        for node_type in self._dirty_types:
+            self._dirty.update(node for node, t in self._node_types.items() if t == node_type)
+        self._dirty_types = set()
+        
+        # Brokers first: the node rules depend on which brokers are critical
+        dirty_by_type = {}
+        for node in self._dirty:
+            dirty_by_type.setdefault(self._node_types[node], []).append(node)
+        self._dirty = set()
+        
+        metrics = self.component_metrics
+        totals = self.total_components
+        thresholds = self.thresholds
+        for broker in dirty_by_type.get('Broker', ()):
+            was_critical = broker in self._critical
+            entry = evaluate_broker(broker, metrics, totals, thresholds, self._articulation_points['Broker'])
+            self._record(broker, entry, changes)
+            if was_critical != (entry is not None):
+                for node in self._hosts.get(broker, ()):
+                    if self._node_types[node] == 'Node':
+                        self._update_critical_host(node, 1 if entry else -1)
+        
+        dirty_nodes = set(dirty_by_type.get('Node', ())).union(self._dirty)
+        self._dirty = set()
+        for node in dirty_nodes:
+            entry = evaluate_node(node, metrics, totals, thresholds, self._articulation_points['Node'],
+                                  self._critical_broker_hosts)
+            self._record(node, entry, changes)
+        for app in dirty_by_type.get('Application', ()):
+            self._record(app, evaluate_application(app, metrics, totals, thresholds), changes)
+        for topic in dirty_by_type.get('Topic', ()):
+            self._record(topic, evaluate_topic(topic, metrics, totals, thresholds), changes)
+        
+        changes.sort(key=lambda change: self._order.get(change['node'], -1))
+        return changes
+    
+    def _record(self, node, entry, changes):
+        """Store the new evaluation of a component and append its change, if any"""
+        previous = self._critical.get(node)
+        if entry is None:
+            if previous is not None:
+                del self._critical[node]
+                changes.append(self._change(node, 'no_longer_critical', []))
+            return
+        
+        self._critical[node] = entry
+        if previous is None:
+            changes.append(self._change(node, 'became_critical', entry['reasons']))
+        elif previous['reasons'] != entry['reasons']:
+            changes.append(self._change(node, 'reasons_changed', entry['reasons']))
+    
+    def _change(self, node, change, reasons):
+        """Build a change feed entry"""
+        messages = {
+            'became_critical': f"{node} became critical",
+            'no_longer_critical': f"{node} is no longer critical",
+            'reasons_changed': f"{node} is critical for different reasons",
+            'removed': f"{node} was removed while critical"
+        }
+        return {
+            'node': node,
+            'type': self._node_types[node],
+            'change': change,
+            'reasons': list(reasons),
+            'message': messages[change]
+        }
+
+def _update_set(values, value, delta):
+    """Add (delta 1) or remove (delta -1) a value from a set"""
+    if delta > 0:
+        values.add(value)
+    else:
+        values.discard(value)
+
+def _connected_component(layer, start):
+    """Find the nodes connected to a node in a layer adjacency"""
+    component = {start}
+    stack = [start]
+    while stack:
+        for neighbor in layer[stack.pop()]:
+            if neighbor not in component:
+                component.add(neighbor)
+                stack.append(neighbor)
+    return component
+
+def _layer_edges(layer, nodes):
+    """Get the connections between a set of layer nodes"""
+    return [(u, v) for u in nodes for v in layer[u]]
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Typed Index Module for the Publish-Subscribe System Model
+
+This module provides TypedIndex, a precomputed index of the typed
+neighborhoods that the analysis modules query (publishers and subscribers
+of a topic, topics routed by a broker, services hosted on a node, ...).
+It is built in a single pass over the graph edges and shared by all
+analysis functions, which would otherwise re-filter neighbor lists by node
+and edge type on every lookup.
+
+Indexes are cached per graph and invalidated by a version counter kept in
+G.graph['version']; code that modifies a graph after it has been indexed
+calls mark_graph_modified(G).
+
+Graph builders may attach a layered edge store (a PubSubGraph with one
+adjacency layer per relationship type) with attach_layers(). The index then
+reads edges from the layers, so parallel relationships of different types
+between two components, which a DiGraph collapses into one edge, are all
+indexed.
+"""
+
+import weakref
+
+_index_cache = weakref.WeakKeyDictionary()
+
+def graph_version(G):
+    """
+    Get the modification version of a graph
+    
+    Args:
+        G: NetworkX graph object
+        
+    Returns:
+        int: Version counter (0 for a graph that was never marked modified)
+    """
+    return G.graph.get('version', 0)
+
+def mark_graph_modified(G):
+    """
+    Increment the version counter of a graph, invalidating its indexes
+    
+    Args:
+        G: NetworkX graph object
+    """
+    G.graph['version'] = graph_version(G) + 1
+
+def attach_layers(G, layers):
+    """
+    Attach a layered edge store to a graph
+    
+    Args:
+        G: NetworkX graph object
+        layers: PubSubGraph holding the same nodes and all typed edges of G
+    """
+    G.graph['layers'] = layers
+    G.graph['layers_version'] = graph_version(G)
+
+def get_layers(G):
+    """
+    Get the layered edge store of a graph, if it is attached and current
+    
+    Args:
+        G: NetworkX graph object
+        
+    Returns:
+        PubSubGraph: Layered edge store, or None if missing or outdated
+    """
+    layers = G.graph.get('layers')
+    if (layers is None or G.graph.get('layers_version') != graph_version(G) or
+            layers.num_nodes != G.number_of_nodes()):
+        return None
+    return layers
+
+class TypedIndex:
+    """
+    Precomputed typed adjacency of a publish-subscribe graph
+    
+    All accessors return tuples (empty if the component has no such
+    neighbors), in graph edge order. Edges are read from the attached
+    layered edge store when there is a current one, and from G otherwise.
+    
+    Attributes:
+        version (int): Graph version the index was built from
+        edge_type_counts (dict): Number of edges per relationship type
+    """
+    def __init__(self, G):
+        """
+        Build the index in one pass over the nodes and edges of G (or its layers)
+        
+        Args:
+            G: NetworkX graph object with 'type' node and edge attributes
+        """
+        self.version = graph_version(G)
+        self._size = (G.number_of_nodes(), G.number_of_edges())
+        
+        self._node_types = {}
+        nodes_of_type = {}
+        for node, attrs in G.nodes(data=True):
+            node_type = attrs.get('type')
+            self._node_types[node] = node_type
+            nodes_of_type.setdefault(node_type, []).append(node)
+        
+        publishers = {}
+        subscribers = {}
+        published_topics = {}
+        routed_topics = {}
+        hosted_services = {}
+        hosts = {}
+        dependents = {}
+        dependencies = {}
+        connections = {}
+        self.edge_type_counts = {}
+        
+        node_types = self._node_types
+        for u, v, edge_type in typed_edges(G):
+            self.edge_type_counts[edge_type] = self.edge_type_counts.get(edge_type, 0) + 1
+            source_type = node_types[u]
+            target_type = node_types[v]
+            
+            if edge_type == 'PUBLISHES_TO':
+                if source_type == 'Application' and target_type == 'Topic':
+                    publishers.setdefault(v, []).append(u)
+                    published_topics.setdefault(u, []).append(v)
+            elif edge_type == 'SUBSCRIBES_TO':
+                if source_type == 'Application':
+                    subscribers.setdefault(v, []).append(u)
+            elif edge_type == 'ROUTES':
+                if target_type == 'Topic':
+                    routed_topics.setdefault(u, []).append(v)
+            elif edge_type == 'RUNS_ON':
+                hosted_services.setdefault((v, None), []).append(u)
+                hosted_services.setdefault((v, source_type), []).append(u)
+                hosts.setdefault(u, []).append(v)
+            elif edge_type == 'DEPENDS_ON':
+                if source_type == 'Application':
+                    dependents.setdefault(v, []).append(u)
+                    if target_type == 'Application':
+                        dependencies.setdefault(u, []).append(v)
+            elif edge_type == 'CONNECTS_TO':
+                if source_type == target_type:
+                    connections.setdefault(source_type, []).append((u, v))
+        
+        self._nodes_of_type = _freeze(nodes_of_type)
+        self._publishers = _freeze(publishers)
+        self._subscribers = _freeze(subscribers)
+        self._published_topics = _freeze(published_topics)
+        self._routed_topics = _freeze(routed_topics)
+        self._hosted_services = _freeze(hosted_services)
+        self._hosts = _freeze(hosts)
+        self._dependents = _freeze(dependents)
+        self._dependencies = _freeze(dependencies)
+        self._connections = _freeze(connections)
+    
+    def is_current(self, G):
+        """
+        Check whether the index still describes a graph
+        
+        Args:
+            G: NetworkX graph object
+            
+        Returns:
+            bool: True if the graph version and size match the indexed graph
+        """
+        return (self.version == graph_version(G) and
+                self._size == (G.number_of_nodes(), G.number_of_edges()))
+    
+    def node_type(self, node):
+        """Get the type of a node (None if unknown)"""
+        return self._node_types.get(node)
+    
+    def nodes_of_type(self, node_type):
+        """Get all nodes of a type, in graph node order"""
+        return self._nodes_of_type.get(node_type, ())
+    
+    def type_counts(self):
+        """
+        Count nodes per type
+        
+        Returns:
+            dict: Dictionary mapping node types to counts, in order of first appearance
+        """
+        return {node_type: len(nodes) for node_type, nodes in self._nodes_of_type.items()}
+    
+    def publishers(self, topic):
+        """Get the applications that publish to a topic"""
+        return self._publishers.get(topic, ())
+    
+    def subscribers(self, topic):
+        """Get the applications that subscribe to a topic"""
+        return self._subscribers.get(topic, ())
+    
+    def published_topics(self, app):
+        """Get the topics an application publishes to"""
+        return self._published_topics.get(app, ())
+    
+    def routed_topics(self, broker):
+        """Get the topics routed by a broker"""
+        return self._routed_topics.get(broker, ())
+    
+    def hosted_services(self, node, service_type=None):
+        """
+        Get the services running on a node
+        
+        Args:
+            node: Infrastructure node name
+            service_type (str): Only return services of this type, or None for all
+            
+        Returns:
+            tuple: Service names
+        """
+        return self._hosted_services.get((node, service_type), ())
+    
+    def hosts(self, service):
+        """Get the nodes a service runs on"""
+        return self._hosts.get(service, ())
+    
+    def dependents(self, component):
+        """Get the applications that depend on an application or broker"""
+        return self._dependents.get(component, ())
+    
+    def dependencies(self, app):
+        """Get the applications an application depends on"""
+        return self._dependencies.get(app, ())
+    
+    def connections(self, node_type):
+        """
+        Get the CONNECTS_TO edges between components of one type
+        
+        Args:
+            node_type (str): Component type (e.g. 'Broker' or 'Node')
+            
+        Returns:
+            tuple: (source, target) pairs
+        """
+        return self._connections.get(node_type, ())
+
+def typed_edges(G):
+    """
+    Iterate over the (source, target, relationship type) edges of a graph
+    
+    Args:
+        G: NetworkX graph object
+        
+    Returns:
+        generator: Generator of edge triples, from the layers of G if current
+    """
+    layers = get_layers(G)
+    if layers is None:
+        for u, v, attrs in G.edges(data=True):
+            yield u, v, attrs.get('type')
+        return
+    
+    names = layers.node_names()
+    for rel_type in layers.edge_types:
+        sources, targets = layers.edges(rel_type)
+        for u, v in zip(sources.tolist(), targets.tolist()):
+            yield names[u], names[v], rel_type
+
+def _freeze(lists):
+    """Convert the list values of an index dictionary to tuples"""
+    return {key: tuple(values) for key, values in lists.items()}
+
+def get_typed_index(G):
+    """
+    Get the typed index of a graph, building it if missing or outdated
+    
+    Args:
+        G: NetworkX graph object
+        
+    Returns:
+        TypedIndex: Index for the current version of G
+    """
+    index = _index_cache.get(G)
+    if index is None or not index.is_current(G):
+        index = TypedIndex(G)
+        _index_cache[G] = index
+    return index
@@ -9,6 +9,11 @@ to/from CSV files, enabling data persistence and exchange.
 import os
 import csv
 import networkx as nx
+from pubsub_compact import PubSubGraphBuilder
+from pubsub_index import attach_layers, get_layers
+from pubsub_log import get_logger
+
+logger = get_logger(__name__)
 
 def export_graph_to_csv(G, export_dir="graph_data"):
     """
@@ -55,22 +60,26 @@ def export_graph_to_csv(G, export_dir="graph_data"):
         # Write header
         writer.writerow(['source', 'target', 'type', 'properties'])
         
-        # Write edge data
-        for source, target, attrs in G.edges(data=True):
-            # Extract edge type
-            edge_type = attrs.get('type', '')
-            
-            # Collect other properties
-            properties = {}
-            for key, value in attrs.items():
-                if key != 'type':
-                    properties[key] = value
-            
-            writer.writerow([source, target, edge_type, str(properties)])
+        # Write edge data; the layered edge store also holds parallel edges of different types
+        layers = get_layers(G)
+        if layers is not None:
+            for edge_type in layers.edge_types:
+                for source, target, properties in layers.iter_edges(edge_type):
+                    writer.writerow([source, target, edge_type, str(properties)])
+        else:
+            for source, target, attrs in G.edges(data=True):
+                # Extract edge type
+                edge_type = attrs.get('type', '')
+                
+                # Collect other properties
+                properties = {}
+                for key, value in attrs.items():
+                    if key != 'type':
+                        properties[key] = value
+                
+                writer.writerow([source, target, edge_type, str(properties)])
     
-    print(f"Graph exported to CSV files:")
-    print(f"  Nodes: {node_file}")
-    print(f"  Edges: {edge_file}")
+    logger.info("Graph exported to CSV files:\n  Nodes: %s\n  Edges: %s", node_file, edge_file)
     
     return node_file, edge_file
 
@@ -83,10 +92,12 @@ def import_graph_from_csv(node_file, edge_file):
         edge_file: Path to edges CSV file
         
     Returns:
-        DiGraph: NetworkX directed graph object
+        DiGraph: NetworkX directed graph object, with all typed edges also kept
+            in a layered edge store (see pubsub_index.get_layers)
     """
     # Create a new directed graph
     G = nx.DiGraph()
+    layers = PubSubGraphBuilder()
     
     # Import nodes
     with open(node_file, 'r', newline='') as f:
@@ -122,6 +133,9 @@ def import_graph_from_csv(node_file, edge_file):
                     except:
                         # If parsing fails, continue without additional properties
                         pass
+                
+                layers.add_node(node_id, node_type,
+                                {key: value for key, value in G.nodes[node_id].items() if key != 'type'})
     
     # Import edges
     with open(edge_file, 'r', newline='') as f:
@@ -138,6 +152,7 @@ def import_graph_from_csv(node_file, edge_file):
                 
                 # Add edge with type attribute
                 G.add_edge(source, target, type=edge_type)
+                properties = {}
                 
                 # Add other properties if available
                 if len(row) >= 4:
@@ -154,13 +169,17 @@ def import_graph_from_csv(node_file, edge_file):
                                     value = value.strip()
                                     if key != 'type':
                                         G[source][target][key] = value
+                                        properties[key] = value
                     except:
                         # If parsing fails, continue without additional properties
                         pass
+                
+                layers.add_edge(source, target, edge_type, properties)
+    
+    attach_layers(G, layers.build())
     
-    print(f"Graph imported from CSV files:")
-    print(f"  Nodes: {G.number_of_nodes()} (from {node_file})")
-    print(f"  Edges: {G.number_of_edges()} (from {edge_file})")
+    logger.info("Graph imported from CSV files:\n  Nodes: %d (from %s)\n  Edges: %d (from %s)",
+                G.number_of_nodes(), node_file, G.number_of_edges(), edge_file)
     
     return G
 
@@ -210,7 +229,7 @@ def export_component_metrics_to_csv(metrics, export_dir="graph_data"):
                     row = [component_id, data]
                 writer.writerow(row)
     
-    print(f"Component metrics exported to CSV files in {export_dir}")
+    logger.info("Component metrics exported to CSV files in %s", export_dir)
     return files
 
 def export_critical_components_to_csv(critical_components, export_dir="graph_data"):
@@ -234,7 +253,7 @@ def export_critical_components_to_csv(critical_components, export_dir="graph_dat
         writer = csv.writer(f)
         
         # Write header
-        writer.writerow(['component_type', 'component_id', 'reasons', 'metrics'])
+        writer.writerow(['component_type', 'component_id', 'reasons', 'metrics', 'score'])
         
         # Write critical component data
         for component_type, components in critical_components.items():
@@ -242,10 +261,47 @@ def export_critical_components_to_csv(critical_components, export_dir="graph_dat
                 component_id = component_info['node']
                 reasons = '; '.join(component_info.get('reasons', []))
                 metrics = str(component_info.get('metrics', {}))
+                score = component_info.get('score', '')
                 
-                writer.writerow([component_type, component_id, reasons, metrics])
+                writer.writerow([component_type, component_id, reasons, metrics, score])
     
-    print(f"Critical components exported to {file_path}")
+    logger.info("Critical components exported to %s", file_path)
+    return file_path
+
+def export_criticality_ranking_to_csv(ranking, export_dir="graph_data"):
+    """
+    Export the criticality rankings (overall and per component type) to CSV file
+    
+    Args:
+        ranking: CriticalityRanking object
+        export_dir: Directory to store CSV file
+        
+    Returns:
+        str: Path to created CSV file
+    """
+    from pubsub_scoring import COMPONENT_TYPES
+    
+    # Create directory if it doesn't exist
+    if not os.path.exists(export_dir):
+        os.makedirs(export_dir)
+    
+    file_path = os.path.join(export_dir, "criticality_ranking.csv")
+    
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        
+        # Write header
+        writer.writerow(['ranking', 'rank', 'component_type', 'component_id', 'score', 'rule_scores'])
+        
+        # Write the overall ranking, then one ranking per component type
+        for ranking_name in ('all',) + COMPONENT_TYPES:
+            entries = ranking.top(None if ranking_name == 'all' else ranking_name)
+            for rank, entry in enumerate(entries, 1):
+                rule_scores = '; '.join(f"{rule}={score:.4f}" for rule, score in entry['rule_scores'].items())
+                writer.writerow([ranking_name, rank, entry['type'], entry['node'], f"{entry['score']:.4f}",
+                                 rule_scores])
+    
+    logger.info("Criticality ranking exported to %s", file_path)
     return file_path
 
 def export_recommendations_to_csv(recommendations, export_dir="graph_data"):
@@ -276,18 +332,220 @@ def export_recommendations_to_csv(recommendations, export_dir="graph_data"):
             for recommendation in recs:
                 writer.writerow([category, recommendation])
     
-    print(f"Recommendations exported to {file_path}")
+    logger.info("Recommendations exported to %s", file_path)
+    return file_path
+
+def export_threshold_sweep_to_csv(sweep_rows, export_dir="graph_data"):
+    """
+    Export a threshold sensitivity sweep to CSV file
+    
+    Args:
+        sweep_rows: Rows returned by ThresholdSensitivity.sweep
+        export_dir: Directory to store CSV file
+        
+    Returns:
+        str: Path to created CSV file
+    """
+    # Create directory if it doesn't exist
+    if not os.path.exists(export_dir):
+        os.makedirs(export_dir)
+    
+    file_path = os.path.join(export_dir, "threshold_sweep.csv")
+    
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        
+        # Write header
+        writer.writerow(['rule', 'component_type', 'threshold', 'critical_count', 'is_current', 'added', 'removed'])
+        
+        # Write one row per rule and threshold, membership changes since the previous row joined by ';'
+        for row in sweep_rows:
+            writer.writerow([row['rule'], row['component_type'], row['threshold'], row['critical_count'],
+                             row['is_current'], ';'.join(map(str, row['added'])),
+                             ';'.join(map(str, row['removed']))])
+    
+    logger.info("Threshold sweep exported to %s", file_path)
+    return file_path
+
+def export_pareto_layers_to_csv(ranking, export_dir="graph_data"):
+    """
+    Export the Pareto layers of every component type to CSV file
+    
+    Args:
+        ranking: Result of pareto_ranking
+        export_dir: Directory to store CSV file
+        
+    Returns:
+        str: Path to created CSV file
+    """
+    # Create directory if it doesn't exist
+    if not os.path.exists(export_dir):
+        os.makedirs(export_dir)
+    
+    file_path = os.path.join(export_dir, "pareto_layers.csv")
+    
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        
+        # Write header
+        writer.writerow(['component_type', 'component_id', 'layer', 'metrics'])
+        
+        # Write one row per component, metrics as name=value pairs
+        for component_type, result in ranking.items():
+            for layer, components in enumerate(result['layers']):
+                for component, vector in components:
+                    metrics = '; '.join(f"{name}={value:g}" for name, value in zip(result['metrics'], vector))
+                    writer.writerow([component_type, component, layer, metrics])
+    
+    logger.info("Pareto layers exported to %s", file_path)
+    return file_path
+
+def export_failure_sweep_to_csv(sweep, export_dir="graph_data"):
+    """
+    Export the failure impact of every component to CSV file
+    
+    Args:
+        sweep: FailureSweep object
+        export_dir: Directory to store CSV file
+        
+    Returns:
+        str: Path to created CSV file
+    """
+    # Create directory if it doesn't exist
+    if not os.path.exists(export_dir):
+        os.makedirs(export_dir)
+    
+    file_path = os.path.join(export_dir, "failure_sweep.csv")
+    
+    counts = sweep.impacted_counts.tolist()
+    percentages = sweep.impact_percentages.tolist()
+    scores = sweep.resilience_scores.tolist()
+    
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        
+        # Write header
+        writer.writerow(['component_type', 'component_id', 'impacted_applications', 'impact_percentage',
+                         'resilience_score'])
+        
+        # Write one row per component, in sweep order
+        for component_type, rows in sweep.type_rows.items():
+            for row in range(rows.start, rows.stop):
+                writer.writerow([component_type.lower(), sweep.components[row], counts[row],
+                                 f"{percentages[row]:.2f}", f"{scores[row]:.2f}"])
+    
+    logger.info("Failure sweep exported to %s", file_path)
+    return file_path
+
+def export_cascades_to_csv(cascades, export_dir="graph_data"):
+    """
+    Export the waves of cascading failure simulations to CSV file
+    
+    Args:
+        cascades: Dictionary mapping component types to CascadeResult objects
+        export_dir: Directory to store CSV file
+        
+    Returns:
+        str: Path to created CSV file
+    """
+    # Create directory if it doesn't exist
+    if not os.path.exists(export_dir):
+        os.makedirs(export_dir)
+    
+    file_path = os.path.join(export_dir, "cascades.csv")
+    
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        
+        # Write header
+        writer.writerow(['initial_failure', 'wave', 'component_id', 'component_type', 'cause'])
+        
+        # Write one row per failed component, initial failures in wave 0
+        for cascade in cascades.values():
+            initial = ';'.join(str(component) for component in cascade.initial)
+            for wave_number, wave in enumerate(cascade.waves):
+                for component in wave:
+                    writer.writerow([initial, wave_number, component, cascade.types[component].lower(),
+                                     cascade.causes.get(component, 'initial')])
+    
+    logger.info("Cascade waves exported to %s", file_path)
+    return file_path
+
+def export_contingency_to_csv(result, export_dir="graph_data"):
+    """
+    Export the most impacting combinations of a contingency analysis to CSV file
+    
+    Args:
+        result: ContingencyResult object
+        export_dir: Directory to store CSV file
+        
+    Returns:
+        str: Path to created CSV file
+    """
+    # Create directory if it doesn't exist
+    if not os.path.exists(export_dir):
+        os.makedirs(export_dir)
+    
+    file_path = os.path.join(export_dir, "contingency.csv")
+    
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        
+        # Write header
+        writer.writerow(['rank', 'components', 'impacted_applications', 'impact_percentage', 'above_threshold'])
+        
+        # Write the combinations above the threshold, or the most impacting ones without a threshold
+        entries = result.exceeding if result.threshold is not None and result.exceeding else result.worst
+        for rank, entry in enumerate(entries, 1):
+            above = result.threshold is not None and entry['impact_percentage'] > result.threshold
+            writer.writerow([rank, ';'.join(str(component) for component in entry['components']),
+                             entry['impacted_applications'], f"{entry['impact_percentage']:.2f}", above])
+    
+    logger.info("Contingency combinations exported to %s", file_path)
+    return file_path
+
+def export_availability_to_csv(availability, export_dir="graph_data"):
+    """
+    Export the simulated availability of each application to CSV file
+    
+    Args:
+        availability: AvailabilityResult object
+        export_dir: Directory to store CSV file
+        
+    Returns:
+        str: Path to created CSV file
+    """
+    # Create directory if it doesn't exist
+    if not os.path.exists(export_dir):
+        os.makedirs(export_dir)
+    
+    file_path = os.path.join(export_dir, "availability.csv")
+    
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        
+        # Write header
+        writer.writerow(['application', 'availability', 'scenarios'])
+        
+        # Write one row per application, least available first
+        for entry in availability.least_available(len(availability.applications)):
+            writer.writerow([entry['application'], f"{entry['availability']:.6f}", availability.scenarios])
+    
+    logger.info("Application availability exported to %s", file_path)
     return file_path
 
 if __name__ == "__main__":
     import sys
     
     from pubsub_config import SystemConfig, parse_args
+    from pubsub_log import configure_logging
     from pubsub_graph import create_complete_graph
     
     try:
         # Parse arguments
         config, args = parse_args()
+        configure_logging()
+        config.print_summary()
         
         # Check for import mode
         if len(sys.argv) > 1 and sys.argv[1] == "import" and len(sys.argv) >= 4:
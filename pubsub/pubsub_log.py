@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Logging Module for the Publish-Subscribe System Model
+
+This module provides the loggers the pubsub modules report progress
+through. They are children of the 'pubsub' logger, which only has a
+NullHandler, so library use is silent until configure_logging attaches a
+handler at the wanted level. Messages use %-style arguments, so nothing is
+formatted for levels that are switched off.
+"""
+
+import logging
+import sys
+
+LOGGER_NAME = 'pubsub'
+
+logging.getLogger(LOGGER_NAME).addHandler(logging.NullHandler())
+
+def get_logger(module_name):
+    """
+    Get the logger of a pubsub module
+    
+    Args:
+        module_name (str): Module name (e.g. __name__)
+    
+    Returns:
+        Logger: Child of the 'pubsub' logger
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{module_name}")
+
+def configure_logging(level=logging.INFO, stream=None):
+    """
+    Print pubsub log messages at or above a level
+    
+    Args:
+        level: Logging level (e.g. logging.INFO or 'WARNING')
+        stream: Stream to write to (stdout if not given)
+    
+    Returns:
+        Logger: The configured 'pubsub' logger
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        if not isinstance(handler, logging.NullHandler):
+            logger.removeHandler(handler)
+    
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
@@ -10,6 +10,9 @@ import sys
 import time
 import argparse
 import os
+from pubsub_log import get_logger, configure_logging
+
+logger = get_logger(__name__)
 
 def run_complete_analysis(config, args):
     """
@@ -20,13 +23,18 @@ def run_complete_analysis(config, args):
         args: Parsed command line arguments
     """
     from pubsub_graph import create_complete_graph
-    from pubsub_analysis import analyze_graph
+    from pubsub_analysis import analyze_graph, print_graph_analysis
     from pubsub_critical import identify_critical_components, print_critical_summary, get_simulation_targets
-    from pubsub_failure import run_failure_simulations
-    from pubsub_recommendations import generate_improvement_recommendations
+    from pubsub_scoring import print_criticality_ranking
+    from pubsub_failure import run_failure_simulations, print_failure_simulations
+    from pubsub_recommendations import generate_improvement_recommendations, print_recommendations
     from pubsub_viz import generate_visualizations
     from pubsub_io import export_graph_to_csv, export_component_metrics_to_csv
     from pubsub_io import export_critical_components_to_csv, export_recommendations_to_csv
+    from pubsub_io import export_criticality_ranking_to_csv
+    from pubsub_index import get_typed_index
+    from pubsub_centrality import centrality_options, centrality_rule_options
+    from pubsub_threshold import threshold_policy_options
     
     start_time = time.time()
     
@@ -37,42 +45,79 @@ def run_complete_analysis(config, args):
             print(f"Error: Specified CSV files not found")
             sys.exit(1)
             
-        print(f"Importing graph from CSV files...")
+        logger.info("Importing graph from CSV files...")
         G = import_graph_from_csv(args.nodes_csv, args.edges_csv)
     else:
         # Create graph model
-        print("=== Creating System Model ===")
-        G, components = create_complete_graph(config, use_neo4j=not args.no_neo4j)
+        logger.info("=== Creating System Model ===")
+        G, components = create_complete_graph(config, use_neo4j=not args.no_neo4j, batch_size=args.batch_size,
+                                              placement=args.placement, bulk_dir=args.bulk_dir)
+    
+    # Index typed neighborhoods once for all analysis steps
+    index = get_typed_index(G)
+    centrality_rule = centrality_rule_options(args)
+    threshold_policy = threshold_policy_options(args)
     
     # Run basic analysis
-    analyze_graph(G)
+    analysis = analyze_graph(G, index, centrality_options(args))
+    if not args.quiet:
+        print_graph_analysis(analysis)
     
     # Identify critical components
-    print("\n=== Identifying Critical Components ===")
-    critical_analysis = identify_critical_components(G, config)
-    print_critical_summary(critical_analysis)
+    logger.info("\n=== Identifying Critical Components ===")
+    critical_analysis = identify_critical_components(G, config, index, centrality_rule, threshold_policy, args.top_k)
+    if not args.quiet:
+        print_critical_summary(critical_analysis)
+        print_criticality_ranking(critical_analysis['ranking'])
+    
+    # Sweep the thresholds if requested
+    if args.threshold_sweep:
+        run_threshold_sweep(G, critical_analysis, args, index)
+    
+    # Rank components by Pareto dominance if requested
+    if args.pareto:
+        run_pareto_ranking(critical_analysis, args)
     
     # Prepare for failure simulations
     simulation_targets = get_simulation_targets(critical_analysis)
     
+    # Simulate random failures if requested, to include them in the resilience score
+    availability = run_availability(G, args, index) if args.availability else None
+    
     # Run failure simulations
-    print("\n=== Running Failure Simulations ===")
-    simulation_results = run_failure_simulations(G, simulation_targets)
+    logger.info("\n=== Running Failure Simulations ===")
+    simulation_results = run_failure_simulations(G, simulation_targets, index, availability)
+    if not args.quiet:
+        print_failure_simulations(simulation_results)
+    
+    # Propagate the failures transitively if requested
+    if args.cascade:
+        run_cascades(G, simulation_targets, args, index)
+    
+    # Sweep the failure of every component if requested
+    if args.failure_sweep:
+        run_failure_sweep(args, index)
+    
+    # Evaluate combined failures if requested
+    if args.contingency:
+        run_contingency(G, args, index)
     
     # Generate improvement recommendations
-    print("\n=== Generating Recommendations ===")
-    recommendations = generate_improvement_recommendations(G, critical_analysis, config)
+    logger.info("\n=== Generating Recommendations ===")
+    recommendations = generate_improvement_recommendations(G, critical_analysis, config, index)
+    if not args.quiet:
+        print_recommendations(recommendations)
     
     # Create visualizations
     if not args.no_viz:
-        print("\n=== Creating Visualizations ===")
+        logger.info("\n=== Creating Visualizations ===")
         generate_visualizations(G, config, critical_analysis)
         
         # Generate web-based visualization if requested
         if args.web_viz:
             from pubsub_web_viz import generate_web_visualization_with_analysis
             web_dir = args.web_dir if args.web_dir else "web_viz"
-            print(f"\n=== Creating Web-based Visualization ({web_dir}) ===")
+            logger.info("\n=== Creating Web-based Visualization (%s) ===", web_dir)
             html_path = generate_web_visualization_with_analysis(
                 G, 
                 critical_analysis, 
@@ -81,13 +126,13 @@ def run_complete_analysis(config, args):
                 web_dir
             )
     else:
-        print("\nSkipping visualizations (--no-viz flag used)")
+        logger.info("\nSkipping visualizations (--no-viz flag used)")
 
     
     # Export data if requested
     if args.export_csv:
         export_dir = args.export_dir
-        print(f"\n=== Exporting Data to CSV ({export_dir}) ===")
+        logger.info("\n=== Exporting Data to CSV (%s) ===", export_dir)
         
         # Export graph structure
         node_file, edge_file = export_graph_to_csv(G, export_dir)
@@ -97,6 +142,7 @@ def run_complete_analysis(config, args):
         
         # Export critical components
         critical_file = export_critical_components_to_csv(critical_analysis['critical_components'], export_dir)
+        ranking_file = export_criticality_ranking_to_csv(critical_analysis['ranking'], export_dir)
         
         # Export recommendations
         if recommendations:
@@ -105,12 +151,140 @@ def run_complete_analysis(config, args):
     end_time = time.time()
     elapsed_time = end_time - start_time
     
-    print(f"\n=== Analysis Complete ({elapsed_time:.2f} seconds) ===")
-    print(f"Created model with {G.number_of_nodes()} nodes and {G.number_of_edges()} edges")
-    print(f"Identified {sum(len(components) for components in critical_analysis['critical_components'].values())} critical components")
+    logger.info("\n=== Analysis Complete (%.2f seconds) ===", elapsed_time)
+    logger.info("Created model with %d nodes and %d edges", G.number_of_nodes(), G.number_of_edges())
+    logger.info("Identified %d critical components",
+                sum(len(components) for components in critical_analysis['critical_components'].values()))
     
     return G, critical_analysis, recommendations
 
+def run_threshold_sweep(G, critical_analysis, args, index):
+    """
+    Report how the critical components change with each threshold
+    
+    Args:
+        G: NetworkX graph object
+        critical_analysis: Results of critical component identification
+        args: Parsed command line arguments
+        index: TypedIndex of G
+    """
+    from pubsub_sensitivity import threshold_sensitivity, print_sensitivity_summary
+    
+    sensitivity = threshold_sensitivity(G, critical_analysis, index)
+    if not args.quiet:
+        print_sensitivity_summary(sensitivity)
+    
+    if args.export_csv:
+        from pubsub_io import export_threshold_sweep_to_csv
+        export_threshold_sweep_to_csv(sensitivity.sweep(), args.export_dir)
+    if not args.no_viz:
+        from pubsub_viz import visualize_threshold_sensitivity
+        visualize_threshold_sensitivity(sensitivity)
+
+def run_pareto_ranking(critical_analysis, args):
+    """
+    Report the Pareto skyline and layers of each component type
+    
+    Args:
+        critical_analysis: Results of critical component identification
+        args: Parsed command line arguments
+    """
+    from pubsub_skyline import pareto_ranking, print_pareto_summary
+    
+    ranking = pareto_ranking(critical_analysis['component_metrics'])
+    if not args.quiet:
+        print_pareto_summary(ranking)
+    
+    if args.export_csv:
+        from pubsub_io import export_pareto_layers_to_csv
+        export_pareto_layers_to_csv(ranking, args.export_dir)
+
+def run_failure_sweep(args, index):
+    """
+    Report the failure impact of every component
+    
+    Args:
+        args: Parsed command line arguments
+        index: TypedIndex of the graph
+    """
+    from pubsub_sweep import get_failure_sweep, print_failure_sweep
+    
+    sweep = get_failure_sweep(index)
+    if not args.quiet:
+        print_failure_sweep(sweep, args.top_k)
+    
+    if args.export_csv:
+        from pubsub_io import export_failure_sweep_to_csv
+        export_failure_sweep_to_csv(sweep, args.export_dir)
+
+def run_cascades(G, simulation_targets, args, index):
+    """
+    Report the cascading failure of each simulation target
+    
+    Args:
+        G: NetworkX graph object
+        simulation_targets: Critical components to simulate (see get_simulation_targets)
+        args: Parsed command line arguments
+        index: TypedIndex of G
+    """
+    from pubsub_cascade import CascadeRules, run_cascade_simulations, print_cascade_simulations
+    
+    rules = CascadeRules(starvation=args.cascade_starvation)
+    cascades = run_cascade_simulations(G, simulation_targets, rules, index)
+    if not args.quiet:
+        print_cascade_simulations(cascades)
+    
+    if args.export_csv:
+        from pubsub_io import export_cascades_to_csv
+        export_cascades_to_csv(cascades, args.export_dir)
+
+def run_contingency(G, args, index):
+    """
+    Report the combinations of components whose joint failure impacts the most applications
+    
+    Args:
+        G: NetworkX graph object
+        args: Parsed command line arguments
+        index: TypedIndex of G
+    """
+    from pubsub_contingency import contingency_analysis, print_contingency
+    
+    result = contingency_analysis(G, args.contingency, args.contingency_types, args.contingency_threshold,
+                                  args.top_k, args.workers, index=index)
+    if not args.quiet:
+        print_contingency(result, args.top_k)
+    
+    if args.export_csv:
+        from pubsub_io import export_contingency_to_csv
+        export_contingency_to_csv(result, args.export_dir)
+
+def run_availability(G, args, index):
+    """
+    Report the availability of the applications under random component failures
+    
+    Args:
+        G: NetworkX graph object
+        args: Parsed command line arguments
+        index: TypedIndex of G
+    
+    Returns:
+        AvailabilityResult: Simulated availability, included in the resilience score
+    """
+    from pubsub_availability import parse_failure_probabilities, simulate_availability, print_availability
+    from pubsub_cascade import CascadeRules
+    
+    probabilities = parse_failure_probabilities(args.failure_probability or ())
+    availability = simulate_availability(G, probabilities, CascadeRules(starvation=args.cascade_starvation),
+                                         args.availability_scenarios, args.availability_tolerance,
+                                         seed=args.availability_seed, workers=args.workers, index=index)
+    if not args.quiet:
+        print_availability(availability, args.top_k)
+    
+    if args.export_csv:
+        from pubsub_io import export_availability_to_csv
+        export_availability_to_csv(availability, args.export_dir)
+    return availability
+
 def parse_extended_args():
     """
     Parse command line arguments with additional analysis options
@@ -126,8 +300,75 @@ def parse_extended_args():
     parser.add_argument('--apps', type=int, default=10, help='Number of applications (default: 10)')
     parser.add_argument('--topics', type=int, default=25, help='Number of topics (default: 25)')
     parser.add_argument('--no-neo4j', action='store_true', help='Skip Neo4j database operations')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='Rows per batched Neo4j write, 0 to write one entity at a time (default: 1000)')
+    parser.add_argument('--placement', choices=['least_loaded', 'capacity_weighted', 'random'], default='least_loaded',
+                        help='Strategy for placing brokers and applications on nodes (default: least_loaded)')
+    parser.add_argument('--bulk-dir', type=str, default=None,
+                        help='Write neo4j-admin import CSV files to this directory instead of writing to Neo4j')
     parser.add_argument('--no-viz', action='store_true', help='Skip visualizations')
     
+    # Centrality options
+    parser.add_argument('--centrality', choices=['betweenness', 'harmonic', 'degree'], default='betweenness',
+                        help='Centrality measure for the infrastructure and dependency layers (default: betweenness)')
+    parser.add_argument('--centrality-mode', choices=['exact', 'approximate'], default='exact',
+                        help='Compute centrality from all sources or from sampled pivots (default: exact)')
+    parser.add_argument('--centrality-pivots', type=int, default=None,
+                        help='Number of sampled pivots for approximate centrality')
+    parser.add_argument('--centrality-epsilon', type=float, default=None,
+                        help='Error bound for approximate centrality, used when no pivot count is given')
+    parser.add_argument('--centrality-threshold', type=float, default=None,
+                        help='Also flag nodes and applications with centrality above this value as critical')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for centrality computation, contingency analysis and '
+                             'availability simulation (default: 1)')
+    
+    parser.add_argument('--threshold-sweep', action='store_true',
+                        help='Report how the critical components change with each threshold')
+    parser.add_argument('--pareto', action='store_true',
+                        help='Report the components not dominated on every metric and the Pareto layers below them')
+    parser.add_argument('--cascade', action='store_true',
+                        help='Propagate the failure of each critical component transitively until nothing else fails')
+    parser.add_argument('--cascade-starvation', choices=['any', 'all'], default='any',
+                        help='Fail applications in a cascade when any or all of their subscribed topics '
+                             'are lost (default: any)')
+    parser.add_argument('--failure-sweep', action='store_true',
+                        help='Simulate the failure of every component and rank them by impact')
+    parser.add_argument('--contingency', type=int, default=None, metavar='K',
+                        help='Evaluate the joint failure of every combination of K components')
+    parser.add_argument('--contingency-types', nargs='+', choices=['broker', 'node', 'application', 'topic'],
+                        default=['node'], help='Types of the components combined in contingency analysis (default: node)')
+    parser.add_argument('--contingency-threshold', type=float, default=30.0,
+                        help='List the combinations impacting more than this percentage of applications (default: 30)')
+    parser.add_argument('--availability', action='store_true',
+                        help='Simulate random component failures and include the expected availability '
+                             'in the resilience score')
+    parser.add_argument('--failure-probability', nargs='+', metavar='TYPE=P', default=None,
+                        help='Failure probability of a component type for availability simulation '
+                             '(default: node=0.01 broker=0.01 application=0.001 topic=0)')
+    parser.add_argument('--availability-scenarios', type=int, default=100000,
+                        help='Maximum number of simulated failure scenarios (default: 100000)')
+    parser.add_argument('--availability-tolerance', type=float, default=0.001,
+                        help='Stop once the standard error of the expected availability is at most this value '
+                             '(default: 0.001)')
+    parser.add_argument('--availability-seed', type=int, default=None,
+                        help='Seed of the failure scenarios, for reproducible availability simulation')
+    parser.add_argument('--top-k', type=int, default=10,
+                        help='Number of most critical components ranked per type and overall (default: 10)')
+    parser.add_argument('--thresholds', choices=['config', 'distribution'], default='config',
+                        help='Calculate thresholds from the system configuration or the measured '
+                             'metric distributions (default: config)')
+    parser.add_argument('--threshold-quantile', type=float, default=0.95,
+                        help='Quantile above which a metric is critical with distribution thresholds (default: 0.95)')
+    parser.add_argument('--threshold-sigma', type=float, default=None,
+                        help='Use mean + this many standard deviations with distribution thresholds instead')
+    
+    # Output options
+    parser.add_argument('--quiet', action='store_true',
+                        help='Skip the printed reports and only log warnings (results are still exported)')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default='INFO',
+                        help='Level of the progress messages (default: INFO)')
+    
     # Web visualization options
     parser.add_argument('--web-viz', action='store_true', help='Generate web-based visualization')
     parser.add_argument('--web-dir', type=str, help='Directory for web visualization files (default: web_viz)')
@@ -169,6 +410,9 @@ def run_module(module_name, config, args):
     """
     from pubsub_graph import create_complete_graph
     from pubsub_io import import_graph_from_csv
+    from pubsub_index import get_typed_index
+    from pubsub_centrality import centrality_options, centrality_rule_options
+    from pubsub_threshold import threshold_policy_options
     
     # Check if we should import from CSV
     if args.import_csv:
@@ -176,40 +420,70 @@ def run_module(module_name, config, args):
             print(f"Error: Specified CSV files not found")
             sys.exit(1)
             
-        print(f"Importing graph from CSV files...")
+        logger.info("Importing graph from CSV files...")
         G = import_graph_from_csv(args.nodes_csv, args.edges_csv)
     else:
         # Create graph model (required for all modules)
-        print("=== Creating System Model ===")
-        G, components = create_complete_graph(config, use_neo4j=not args.no_neo4j)
+        logger.info("=== Creating System Model ===")
+        G, components = create_complete_graph(config, use_neo4j=not args.no_neo4j, batch_size=args.batch_size,
+                                              placement=args.placement, bulk_dir=args.bulk_dir)
+    
+    # Index typed neighborhoods once for all analysis steps
+    index = get_typed_index(G)
+    centrality_rule = centrality_rule_options(args)
+    threshold_policy = threshold_policy_options(args)
     
     if module_name == 'basic':
-        from pubsub.pubsub_analysis import analyze_graph
-        analyze_graph(G)
+        from pubsub_analysis import analyze_graph, print_graph_analysis
+        analysis = analyze_graph(G, index, centrality_options(args))
+        if not args.quiet:
+            print_graph_analysis(analysis)
         
     elif module_name == 'critical':
         from pubsub_critical import identify_critical_components, print_critical_summary
-        critical_analysis = identify_critical_components(G, config)
-        print_critical_summary(critical_analysis)
+        from pubsub_scoring import print_criticality_ranking
+        critical_analysis = identify_critical_components(G, config, index, centrality_rule, threshold_policy, args.top_k)
+        if not args.quiet:
+            print_critical_summary(critical_analysis)
+            print_criticality_ranking(critical_analysis['ranking'])
+        
+        if args.threshold_sweep:
+            run_threshold_sweep(G, critical_analysis, args, index)
+        if args.pareto:
+            run_pareto_ranking(critical_analysis, args)
         
         # Export if requested
         if args.export_csv:
             from pubsub_io import export_component_metrics_to_csv, export_critical_components_to_csv
+            from pubsub_io import export_criticality_ranking_to_csv
             export_component_metrics_to_csv(critical_analysis['component_metrics'], args.export_dir)
             export_critical_components_to_csv(critical_analysis['critical_components'], args.export_dir)
+            export_criticality_ranking_to_csv(critical_analysis['ranking'], args.export_dir)
         
     elif module_name == 'failure':
         from pubsub_critical import identify_critical_components, get_simulation_targets
-        from pubsub_failure import run_failure_simulations
-        critical_analysis = identify_critical_components(G, config)
+        from pubsub_failure import run_failure_simulations, print_failure_simulations
+        critical_analysis = identify_critical_components(G, config, index, centrality_rule, threshold_policy, args.top_k)
         simulation_targets = get_simulation_targets(critical_analysis)
-        run_failure_simulations(G, simulation_targets)
+        availability = run_availability(G, args, index) if args.availability else None
+        simulation_results = run_failure_simulations(G, simulation_targets, index, availability)
+        if not args.quiet:
+            print_failure_simulations(simulation_results)
+        
+        if args.cascade:
+            run_cascades(G, simulation_targets, args, index)
+        if args.failure_sweep:
+            run_failure_sweep(args, index)
+        if args.contingency:
+            run_contingency(G, args, index)
         
     elif module_name == 'recommendations':
         from pubsub_critical import identify_critical_components
-        from pubsub_recommendations import generate_improvement_recommendations
-        critical_analysis = identify_critical_components(G, config)
-        recommendations = generate_improvement_recommendations(G, critical_analysis, config)
+        from pubsub_recommendations import generate_improvement_recommendations, print_recommendations
+        critical_analysis = identify_critical_components(G, config, index, centrality_rule, threshold_policy, args.top_k)
+        recommendations = generate_improvement_recommendations(G, critical_analysis, config, index)
+        if not args.quiet:
+            print_recommendations(recommendations)
         
         # Export if requested
         if args.export_csv and recommendations:
@@ -219,7 +493,7 @@ def run_module(module_name, config, args):
     elif module_name == 'viz':
         from pubsub_critical import identify_critical_components
         from pubsub_viz import generate_visualizations
-        critical_analysis = identify_critical_components(G, config)
+        critical_analysis = identify_critical_components(G, config, index, centrality_rule, threshold_policy, args.top_k)
         generate_visualizations(G, config, critical_analysis)
     
     elif module_name == 'web_viz':
@@ -227,13 +501,13 @@ def run_module(module_name, config, args):
         from pubsub_web_viz import generate_web_visualization_with_analysis, prepare_simulation_data
         
         # Identify critical components
-        critical_analysis = identify_critical_components(G, config)
+        critical_analysis = identify_critical_components(G, config, index, centrality_rule, threshold_policy, args.top_k)
         
         # Prepare simulation data
-        simulation_results = prepare_simulation_data(G, critical_analysis['critical_components'])
+        simulation_results = prepare_simulation_data(G, critical_analysis['critical_components'], index)
         
         # Generate recommendations
-        recommendations = generate_improvement_recommendations(G, critical_analysis, config)
+        recommendations = generate_improvement_recommendations(G, critical_analysis, config, index)
         
         # Generate web visualization
         web_dir = args.web_dir if args.web_dir else "web_viz"
@@ -251,13 +525,16 @@ def run_module(module_name, config, args):
         from pubsub_io import export_graph_to_csv
         export_graph_to_csv(G, args.export_dir)
     
-    print(f"\n=== {module_name.capitalize()} Analysis Complete ===")
+    logger.info("\n=== %s Analysis Complete ===", module_name.capitalize())
 
 def main():
     """Main entry point for the program"""
     try:
         # Parse arguments
         config, args = parse_extended_args()
+        configure_logging('WARNING' if args.quiet else args.log_level)
+        if not args.quiet:
+            config.print_summary()
         
         # Check if a specific module was requested
         if args.basic_only:
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Sparse Matrix Module for the Publish-Subscribe System Model
+
+This module provides functions for representing the messaging layer of the
+publish-subscribe system as sparse incidence matrices and for computing
+derived relationships with sparse matrix products.
+
+It also provides the broker impact matrix, the boolean product of ROUTES
+(broker x topic) and the topic x application usage matrix, whose rows give
+the distinct applications affected by each broker. It is cached per typed
+index and shared by critical component identification and failure
+simulation.
+"""
+
+import weakref
+import numpy as np
+import scipy.sparse as sp
+
+_impact_cache = weakref.WeakKeyDictionary()
+
+def build_incidence_matrices(relationships):
+    """
+    Build PUBLISHES_TO, SUBSCRIBES_TO and ROUTES incidence matrices
+    
+    Args:
+        relationships: Iterable of relationship dictionaries (source, target, type)
+        
+    Returns:
+        dict: Dictionary with 'publishes' and 'subscribes' (application x topic)
+              and 'routes' (broker x topic) CSR matrices, plus the 'applications',
+              'topics' and 'brokers' name arrays giving the row/column order
+    """
+    sources = {"PUBLISHES_TO": [], "SUBSCRIBES_TO": [], "ROUTES": []}
+    targets = {"PUBLISHES_TO": [], "SUBSCRIBES_TO": [], "ROUTES": []}
+    for rel in relationships:
+        rel_type = rel["type"]
+        if rel_type in sources:
+            sources[rel_type].append(rel["source"])
+            targets[rel_type].append(rel["target"])
+    
+    pub_count = len(sources["PUBLISHES_TO"])
+    sub_count = len(sources["SUBSCRIBES_TO"])
+    
+    # Assign dense ids with a single vectorized pass per component type
+    applications, app_ids = np.unique(
+        np.array(sources["PUBLISHES_TO"] + sources["SUBSCRIBES_TO"], dtype=object).astype(str),
+        return_inverse=True)
+    topics, topic_ids = np.unique(
+        np.array(targets["PUBLISHES_TO"] + targets["SUBSCRIBES_TO"] + targets["ROUTES"], dtype=object).astype(str),
+        return_inverse=True)
+    brokers, broker_ids = np.unique(
+        np.array(sources["ROUTES"], dtype=object).astype(str), return_inverse=True)
+    
+    shape = (len(applications), len(topics))
+    publishes = _incidence(app_ids[:pub_count], topic_ids[:pub_count], shape)
+    subscribes = _incidence(app_ids[pub_count:], topic_ids[pub_count:pub_count + sub_count], shape)
+    routes = _incidence(broker_ids, topic_ids[pub_count + sub_count:], (len(brokers), len(topics)))
+    
+    return {
+        'publishes': publishes,
+        'subscribes': subscribes,
+        'routes': routes,
+        'applications': applications,
+        'topics': topics,
+        'brokers': brokers
+    }
+
+def _incidence(rows, cols, shape):
+    """Build a CSR incidence matrix; duplicate relationships are summed"""
+    data = np.ones(len(rows), dtype=np.int32)
+    return sp.csr_matrix((data, (rows, cols)), shape=shape)
+
+def compute_dependency_matrices(matrices):
+    """
+    Compute derived DEPENDS_ON relationships as sparse matrix products
+    
+    Entry [s, p] of SUB @ PUB.T counts the topics application s subscribes to
+    and application p publishes to. Entry [a, b] of (PUB + SUB) @ ROUTES.T
+    counts the topics application a uses that broker b routes.
+    
+    Args:
+        matrices: Result of build_incidence_matrices
+        
+    Returns:
+        tuple: (app_dependencies, broker_dependencies) - CSR matrices of
+               application x application and application x broker topic counts
+    """
+    publishes = matrices['publishes']
+    subscribes = matrices['subscribes']
+    
+    app_dependencies = (subscribes @ publishes.T).tocoo()
+    # An application never depends on itself
+    off_diagonal = app_dependencies.row != app_dependencies.col
+    app_dependencies = sp.csr_matrix(
+        (app_dependencies.data[off_diagonal],
+         (app_dependencies.row[off_diagonal], app_dependencies.col[off_diagonal])),
+        shape=app_dependencies.shape)
+    
+    broker_dependencies = ((publishes + subscribes) @ matrices['routes'].T).tocsr()
+    broker_dependencies.eliminate_zeros()
+    
+    return app_dependencies, broker_dependencies
+
+def matrix_to_pairs(matrix, row_names, col_names):
+    """
+    Convert a sparse weight matrix into (source, target, weight) triples
+    
+    Args:
+        matrix: Sparse matrix
+        row_names: Names of the matrix rows
+        col_names: Names of the matrix columns
+        
+    Returns:
+        list: List of (source name, target name, weight) tuples
+    """
+    coo = matrix.tocoo()
+    return list(zip(row_names[coo.row].tolist(), col_names[coo.col].tolist(), coo.data.tolist()))
+
+def derive_dependency_pairs(relationships):
+    """
+    Compute all derived DEPENDS_ON pairs with their shared topic counts
+    
+    Args:
+        relationships: Iterable of relationship dictionaries
+        
+    Returns:
+        tuple: (app_pairs, broker_pairs) - lists of (dependent application,
+               dependency, topic_count) tuples for application and broker dependencies
+    """
+    matrices = build_incidence_matrices(relationships)
+    app_dependencies, broker_dependencies = compute_dependency_matrices(matrices)
+    
+    app_pairs = matrix_to_pairs(app_dependencies, matrices['applications'], matrices['applications'])
+    broker_pairs = matrix_to_pairs(broker_dependencies, matrices['applications'], matrices['brokers'])
+    return app_pairs, broker_pairs
+
+def build_broker_impact_matrix(index):
+    """
+    Compute which applications use the topics routed by each broker
+    
+    Entry [b, a] of ROUTES @ USES is True when broker b routes a topic that
+    application a publishes to or subscribes to, so the number of stored
+    entries in row b is the number of distinct applications impacted by b.
+    
+    Args:
+        index: TypedIndex of the graph
+        
+    Returns:
+        dict: Dictionary with the 'impact' broker x application boolean CSR
+              matrix, the 'brokers' and 'applications' name lists giving its
+              row/column order, 'broker_rows' mapping broker names to rows, and
+              the 'uses' topic x application matrix with its 'topics' row order
+    """
+    brokers = list(index.nodes_of_type('Broker'))
+    topics = index.nodes_of_type('Topic')
+    applications = list(index.nodes_of_type('Application'))
+    topic_ids = {topic: i for i, topic in enumerate(topics)}
+    app_ids = {app: i for i, app in enumerate(applications)}
+    
+    route_rows = []
+    route_cols = []
+    for row, broker in enumerate(brokers):
+        for topic in index.routed_topics(broker):
+            route_rows.append(row)
+            route_cols.append(topic_ids[topic])
+    
+    use_rows = []
+    use_cols = []
+    for row, topic in enumerate(topics):
+        for app in index.publishers(topic):
+            use_rows.append(row)
+            use_cols.append(app_ids[app])
+        for app in index.subscribers(topic):
+            use_rows.append(row)
+            use_cols.append(app_ids[app])
+    
+    routes = boolean_incidence(route_rows, route_cols, (len(brokers), len(topics)))
+    uses = boolean_incidence(use_rows, use_cols, (len(topics), len(applications)))
+    impact = (routes @ uses).tocsr()
+    impact.eliminate_zeros()
+    
+    return {
+        'impact': impact,
+        'brokers': brokers,
+        'applications': applications,
+        'broker_rows': {broker: row for row, broker in enumerate(brokers)},
+        'uses': uses,
+        'topics': topics
+    }
+
+def boolean_incidence(rows, cols, shape):
+    """Build a boolean CSR incidence matrix; duplicate relationships collapse"""
+    data = np.ones(len(rows), dtype=bool)
+    return sp.csr_matrix((data, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+                         shape=shape)
+
+def get_broker_impact(index):
+    """
+    Get the broker impact matrix of a typed index, computing it if missing
+    
+    Args:
+        index: TypedIndex of the graph
+        
+    Returns:
+        dict: Result of build_broker_impact_matrix
+    """
+    impact = _impact_cache.get(index)
+    if impact is None:
+        impact = build_broker_impact_matrix(index)
+        _impact_cache[index] = impact
+    return impact
+
+def impacted_application_counts(broker_impact):
+    """
+    Count the distinct applications impacted by every broker
+    
+    Args:
+        broker_impact: Result of build_broker_impact_matrix
+        
+    Returns:
+        dict: Dictionary mapping broker names to impacted application counts
+    """
+    counts = np.diff(broker_impact['impact'].indptr)
+    return dict(zip(broker_impact['brokers'], counts.tolist()))
+
+def impacted_applications(broker_impact, broker):
+    """
+    Get the applications impacted by the failure of one broker
+    
+    Args:
+        broker_impact: Result of build_broker_impact_matrix
+        broker: Broker name
+        
+    Returns:
+        set: Names of the applications using a topic routed by the broker
+    """
+    row = broker_impact['broker_rows'].get(broker)
+    if row is None:
+        return set()
+    impact = broker_impact['impact']
+    applications = broker_impact['applications']
+    return {applications[col] for col in impact.indices[impact.indptr[row]:impact.indptr[row + 1]].tolist()}
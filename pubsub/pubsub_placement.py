@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Service Placement Module for the Publish-Subscribe System Model
+
+This module provides placement strategies for distributing brokers and
+applications across infrastructure nodes. Load-based strategies keep the
+nodes in a min-heap keyed on load, so each placement costs O(log N).
+"""
+
+import heapq
+import random
+from abc import ABC, abstractmethod
+
+def node_name(node):
+    """
+    Get the name of a node object (Neo4j node or dictionary representation)
+    
+    Args:
+        node: Node object
+        
+    Returns:
+        str: Node name
+    """
+    return node["name"]
+
+def node_property(node, key, default=None):
+    """
+    Get a property of a node object (Neo4j node or dictionary representation)
+    
+    Args:
+        node: Node object
+        key (str): Property name
+        default: Value returned if the property is missing
+        
+    Returns:
+        Property value or default
+    """
+    # py2neo nodes are dict subclasses too, so test for the plain dictionary form
+    if type(node) is dict:
+        return node.get("properties", {}).get(key, default)
+    value = node.get(key)
+    return default if value is None else value
+
+class PlacementStrategy(ABC):
+    """
+    Base class for service placement strategies
+    
+    Subclasses implement place(), which chooses a host node for a service
+    and records the load the service adds to it.
+    
+    Attributes:
+        nodes (list): Candidate host nodes
+    """
+    def __init__(self, nodes):
+        """
+        Initialize the strategy with the candidate host nodes
+        
+        Args:
+            nodes: List of node objects
+        """
+        if not nodes:
+            raise ValueError("Placement requires at least one node")
+        self.nodes = list(nodes)
+        self._loads = [0] * len(self.nodes)
+    
+    @abstractmethod
+    def place(self, weight=1):
+        """
+        Choose a host node for a service
+        
+        Args:
+            weight (int): Load the service adds to its host
+            
+        Returns:
+            Node object the service is placed on
+        """
+    
+    def loads(self):
+        """
+        Get the current load of every node
+        
+        Returns:
+            dict: Dictionary mapping node names to their load
+        """
+        return {node_name(node): load for node, load in zip(self.nodes, self._loads)}
+
+class LeastLoadedPlacement(PlacementStrategy):
+    """
+    Places each service on the node with the lowest total load, breaking
+    ties by node order
+    """
+    def __init__(self, nodes):
+        super().__init__(nodes)
+        self._heap = [(self._priority(index), index) for index in range(len(self.nodes))]
+        heapq.heapify(self._heap)
+    
+    def _priority(self, index):
+        """Heap key of a node; lower values are preferred"""
+        return self._loads[index]
+    
+    def place(self, weight=1):
+        _, index = self._heap[0]
+        self._loads[index] += weight
+        heapq.heapreplace(self._heap, (self._priority(index), index))
+        return self.nodes[index]
+
+class CapacityWeightedPlacement(LeastLoadedPlacement):
+    """
+    Places each service on the node with the lowest load relative to its
+    capacity attribute (nodes without a capacity count as capacity 1)
+    """
+    def __init__(self, nodes):
+        self._capacities = [max(1, int(node_property(node, "capacity", 1))) for node in nodes]
+        super().__init__(nodes)
+    
+    def _priority(self, index):
+        return self._loads[index] / self._capacities[index]
+
+class RandomPlacement(PlacementStrategy):
+    """
+    Places each service on a uniformly random node
+    """
+    def place(self, weight=1):
+        index = random.randrange(len(self.nodes))
+        self._loads[index] += weight
+        return self.nodes[index]
+
+PLACEMENT_STRATEGIES = {
+    "least_loaded": LeastLoadedPlacement,
+    "capacity_weighted": CapacityWeightedPlacement,
+    "random": RandomPlacement
+}
+
+def create_placement(strategy, nodes):
+    """
+    Create a placement strategy for a list of nodes
+    
+    Args:
+        strategy: Strategy name from PLACEMENT_STRATEGIES, or a PlacementStrategy subclass
+        nodes: List of node objects
+        
+    Returns:
+        PlacementStrategy: Strategy instance
+    """
+    if isinstance(strategy, str):
+        if strategy not in PLACEMENT_STRATEGIES:
+            raise ValueError(f"Unknown placement strategy '{strategy}'. " +
+                             f"Choose from: {', '.join(PLACEMENT_STRATEGIES)}")
+        strategy = PLACEMENT_STRATEGIES[strategy]
+    return strategy(nodes)
@@ -6,10 +6,14 @@ This module provides functions for generating targeted recommendations
 for improving system resilience based on critical component analysis.
 """
 
-import networkx as nx
 import numpy as np
+from pubsub_index import get_typed_index
+from pubsub_connectivity import get_block_cut_tree
+from pubsub_log import get_logger
 
-def generate_improvement_recommendations(G, critical_components_analysis, config):
+logger = get_logger(__name__)
+
+def generate_improvement_recommendations(G, critical_components_analysis, config, index=None):
     """
     Generate targeted recommendations for improving system resilience
     based on critical component analysis
@@ -18,23 +22,20 @@ def generate_improvement_recommendations(G, critical_components_analysis, config
         G: NetworkX graph object
         critical_components_analysis: Results from critical component identification
         config: SystemConfig object
+        index: TypedIndex of G (built if not given)
         
     Returns:
-        dict: Dictionary of categorized recommendations
+        dict: Dictionary of categorized recommendations, empty if no critical components
+            were identified (see print_recommendations for the report)
     """
+    if index is None:
+        index = get_typed_index(G)
+    
     critical_components = critical_components_analysis['critical_components']
     component_metrics = critical_components_analysis['component_metrics']
     thresholds = critical_components_analysis['thresholds']
     
-    print("\n=== System Improvement Recommendations ===")
-    
     if not any(critical_components.values()):
-        print("No critical components were identified based on current thresholds.")
-        print("This suggests your system may already have good resilience characteristics.")
-        print("Consider the following general recommendations for distributed pub-sub systems:")
-        print("  1. Implement broker clustering for high availability")
-        print("  2. Distribute application deployments across multiple nodes")
-        print("  3. Consider message persistence for critical topics")
         return {}
     
     # Organize recommendations by type
@@ -47,10 +48,10 @@ def generate_improvement_recommendations(G, critical_components_analysis, config
     
     # Count total components by type for reference
     total_components = {
-        'brokers': sum(1 for _, attrs in G.nodes(data=True) if attrs.get('type') == 'Broker'),
-        'nodes': sum(1 for _, attrs in G.nodes(data=True) if attrs.get('type') == 'Node'),
-        'applications': sum(1 for _, attrs in G.nodes(data=True) if attrs.get('type') == 'Application'),
-        'topics': sum(1 for _, attrs in G.nodes(data=True) if attrs.get('type') == 'Topic')
+        'brokers': len(index.nodes_of_type('Broker')),
+        'nodes': len(index.nodes_of_type('Node')),
+        'applications': len(index.nodes_of_type('Application')),
+        'topics': len(index.nodes_of_type('Topic'))
     }
     
     # === BROKER RECOMMENDATIONS ===
@@ -159,34 +160,38 @@ def generate_improvement_recommendations(G, critical_components_analysis, config
     
     # Analyze infrastructure connectivity
     if config.num_nodes > 2:
-        # Create node-only subgraph
-        node_subgraph = nx.Graph()
-        node_nodes = [n for n, attrs in G.nodes(data=True) if attrs.get('type') == 'Node']
-        for n in node_nodes:
-            node_subgraph.add_node(n)
-        
-        for u, v, attrs in G.edges(data=True):
-            if (u in node_nodes and v in node_nodes and 
-                attrs.get('type') == 'CONNECTS_TO'):
-                node_subgraph.add_edge(u, v)
-        
-        # Check connectivity
-        try:
-            # If network has articulation points, suggest redundant connections
-            articulation_points = list(nx.articulation_points(node_subgraph))
-            if articulation_points:
-                recommendations['redundancy'].append(
-                    f"Add redundant network connections to improve resilience against infrastructure failures " +
-                    f"({len(articulation_points)} critical connection points identified)"
-                )
-        except nx.NetworkXError:
-            # Graph may not be connected
+        # If network has articulation points, suggest redundant connections
+        node_tree = get_block_cut_tree(index, 'Node')
+        articulation_points = node_tree.articulation_points
+        if articulation_points:
+            max_segments = max(node_tree.separated_components(node) for node in articulation_points)
             recommendations['redundancy'].append(
-                "Network topology analysis indicates potential disconnection points. " +
-                "Review infrastructure connectivity."
+                f"Add redundant network connections to improve resilience against infrastructure failures " +
+                f"({len(articulation_points)} critical connection points identified, " +
+                f"a single failure splits the network into up to {max_segments} segments)"
             )
     
-    # Print recommendations by category
+    # Return recommendations for potential further use
+    return recommendations
+
+def print_recommendations(recommendations):
+    """
+    Print the improvement recommendations by category
+    
+    Args:
+        recommendations: Result of generate_improvement_recommendations
+    """
+    print("\n=== System Improvement Recommendations ===")
+    
+    if not recommendations:
+        print("No critical components were identified based on current thresholds.")
+        print("This suggests your system may already have good resilience characteristics.")
+        print("Consider the following general recommendations for distributed pub-sub systems:")
+        print("  1. Implement broker clustering for high availability")
+        print("  2. Distribute application deployments across multiple nodes")
+        print("  3. Consider message persistence for critical topics")
+        return
+    
     # Redundancy recommendations
     if recommendations['redundancy']:
         print("\n1. Redundancy Recommendations:")
@@ -219,9 +224,6 @@ def generate_improvement_recommendations(G, critical_components_analysis, config
         print("  2. Load balancing across brokers and nodes")
         print("  3. Decoupling of tightly-coupled application dependencies")
         print("  4. Advanced monitoring and alerting for critical components")
-    
-    # Return recommendations for potential further use
-    return recommendations
 
 def analyze_load_balance(broker_connections, node_loads, config):
     """
@@ -252,9 +254,9 @@ def analyze_load_balance(broker_connections, node_loads, config):
             imbalance_threshold = 0.4
         
         if broker_cv > imbalance_threshold:
-            print("  - Broker load is imbalanced. Consider redistributing topics among brokers:")
+            logger.info("  - Broker load is imbalanced. Consider redistributing topics among brokers:")
             for broker, count in broker_connections.items():
-                print(f"    * {broker}: {count} topics")
+                logger.info("    * %s: %d topics", broker, count)
     
     # Check node utilization balance if we have more than one node
     if len(node_loads) > 1:
@@ -269,9 +271,9 @@ def analyze_load_balance(broker_connections, node_loads, config):
             imbalance_threshold = 0.4
         
         if node_cv > imbalance_threshold:
-            print("  - Node utilization is imbalanced. Consider redistributing services:")
+            logger.info("  - Node utilization is imbalanced. Consider redistributing services:")
             for node, count in node_loads.items():
-                print(f"    * {node}: {count} services")
+                logger.info("    * %s: %d services", node, count)
     
     return broker_cv, node_cv
 
@@ -279,12 +281,15 @@ if __name__ == "__main__":
     import sys
     
     from pubsub_config import SystemConfig, parse_args
+    from pubsub_log import configure_logging
     from pubsub_graph import create_complete_graph
     from pubsub_critical import identify_critical_components
     
     try:
         # Parse arguments
         config, args = parse_args()
+        configure_logging()
+        config.print_summary()
         
         # Create graph
         print("Creating graph model...")
@@ -296,6 +301,7 @@ if __name__ == "__main__":
         
         # Generate recommendations
         recommendations = generate_improvement_recommendations(G, critical_analysis, config)
+        print_recommendations(recommendations)
         
         print("\nRecommendation generation complete.")
         
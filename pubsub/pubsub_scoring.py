@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Criticality Scoring Module for the Publish-Subscribe System Model
+
+This module turns the boolean criticality rules into a continuous score
+per component. Every rule metric is mapped onto [0, 1) relative to its
+threshold (0.5 at the threshold itself), so the score of a component, the
+largest of its rule scores, reaches one half when some rule metric reaches
+its threshold and keeps ordering components on either side of it.
+
+Scores are streamed into bounded top-k heaps per component type and across
+all types, so ranking the k most critical of n components costs
+O(n log k) and keeps only k entries with their rule scores.
+"""
+
+import heapq
+from pubsub_sensitivity import THRESHOLD_RULES, rule_metric_values
+from pubsub_connectivity import get_block_cut_tree
+
+# Component types in the order they are scored (nodes inherit broker scores)
+COMPONENT_TYPES = ('broker', 'node', 'application', 'topic')
+
+def rule_score(value, threshold):
+    """
+    Map a rule metric onto [0, 1) relative to its threshold
+    
+    Args:
+        value (float): Metric value of a component
+        threshold (float): Threshold of the rule
+    
+    Returns:
+        float: value / (value + threshold), which is 0.5 at the threshold
+    """
+    if value <= 0:
+        return 0.0
+    if threshold <= 0:
+        return 1.0
+    return value / (value + threshold)
+
+def split_score(tree, component):
+    """
+    Score how badly removing a component splits its layer
+    
+    Args:
+        tree: BlockCutTree of the component's layer
+        component: Layer component
+    
+    Returns:
+        float: 0 if the layer stays connected, otherwise 0.5 plus half the share
+               of the component's connected part cut off from the largest piece
+    """
+    pieces = tree.component_sizes_after_removal(component)
+    if len(pieces) < 2:
+        return 0.0
+    remaining = sum(pieces)
+    return 0.5 + 0.5 * (remaining - pieces[0]) / remaining
+
+class TopK:
+    """
+    Bounded min-heap keeping the k largest items pushed into it
+    """
+    def __init__(self, k):
+        """
+        Create an empty heap
+        
+        Args:
+            k (int): Number of items to keep
+        """
+        self.k = k
+        self._heap = []
+    
+    def __len__(self):
+        return len(self._heap)
+    
+    def push(self, item):
+        """
+        Offer an item, in O(log k)
+        
+        Args:
+            item (tuple): Comparable item whose first field is the ranking key
+        """
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+    
+    def items(self):
+        """Get the kept items, largest first"""
+        return sorted(self._heap, reverse=True)
+
+class CriticalityRanking:
+    """
+    Continuous criticality scores with top-k rankings per type and overall
+    
+    Attributes:
+        k (int): Number of components kept per ranking
+    """
+    def __init__(self, k=10):
+        """
+        Create an empty ranking
+        
+        Args:
+            k (int): Number of components kept per ranking
+        """
+        self.k = k
+        self._scores = {}
+        self._overall = TopK(k)
+        self._by_type = {component_type: TopK(k) for component_type in COMPONENT_TYPES}
+    
+    def add(self, component_type, component, rule_scores):
+        """
+        Score a component and offer it to the rankings
+        
+        Args:
+            component_type (str): 'broker', 'node', 'application' or 'topic'
+            component: Component name
+            rule_scores (dict): Dictionary mapping rule names to rule scores
+        
+        Returns:
+            float: Criticality score of the component
+        """
+        score = max(rule_scores.values(), default=0.0)
+        # Ties on the strongest rule go to the component with more strong rules
+        spread = sum(rule_scores.values()) / len(rule_scores) if rule_scores else 0.0
+        self._scores[component] = score
+        
+        item = (score, spread, str(component), component_type, component, rule_scores)
+        self._by_type[component_type].push(item)
+        self._overall.push(item)
+        return score
+    
+    def score(self, component):
+        """Get the criticality score of a component (0 if it was not scored)"""
+        return self._scores.get(component, 0.0)
+    
+    def top(self, component_type=None, k=None):
+        """
+        Get the most critical components
+        
+        Args:
+            component_type (str): Component type to rank (all types if not given)
+            k (int): Number of components (at most the ranking's k)
+        
+        Returns:
+            list: Entries with 'node', 'type', 'score' and 'rule_scores', most critical first
+        """
+        heap = self._overall if component_type is None else self._by_type[component_type]
+        items = heap.items()[:k]
+        return [{'node': component, 'type': item_type, 'score': score, 'rule_scores': rule_scores}
+                for score, _, _, item_type, component, rule_scores in items]
+
+def rank_components(index, component_metrics, total_components, thresholds, k=10, centrality_threshold=None):
+    """
+    Score every component from all its rule metrics and rank the most critical
+    
+    Args:
+        index: TypedIndex of the graph
+        component_metrics: Component metrics (see compute_component_metrics)
+        total_components (dict): Number of components per type
+        thresholds: CriticalityThresholds object
+        k (int): Number of components kept per ranking
+        centrality_threshold (float): Threshold of the centrality rule, if enabled
+    
+    Returns:
+        CriticalityRanking: Scores and top-k rankings
+    """
+    ranking = CriticalityRanking(k)
+    values = rule_metric_values(component_metrics, total_components, thresholds)
+    rules_of_type = {}
+    for rule, component_type, _, _ in THRESHOLD_RULES:
+        rules_of_type.setdefault(component_type, []).append(rule)
+    
+    # Layer splits only count with at least 3 components, as in the boolean rules
+    trees = {}
+    for component_type, node_type, total in (('broker', 'Broker', 'brokers'), ('node', 'Node', 'nodes')):
+        if total_components[total] > 2:
+            trees[component_type] = get_block_cut_tree(index, node_type)
+    
+    centralities = {}
+    if centrality_threshold is not None:
+        centralities = {'node': component_metrics.get('node_centrality', {}),
+                        'application': component_metrics.get('app_centrality', {})}
+    
+    for component_type in COMPONENT_TYPES:
+        for component in index.nodes_of_type(component_type.capitalize()):
+            rule_scores = {rule: rule_score(values[rule].get(component, 0), getattr(thresholds, rule))
+                           for rule in rules_of_type[component_type]}
+            if component_type in trees:
+                rule_scores['articulation_point'] = split_score(trees[component_type], component)
+            if component_type == 'node':
+                # Hosting a broker counts half as much as the broker, reaching 0.5 with a critical one
+                broker_scores = [ranking.score(broker) for broker in index.hosted_services(component, 'Broker')]
+                if broker_scores:
+                    rule_scores['critical_broker_host'] = 0.25 + max(broker_scores) / 2
+            if component_type in centralities:
+                rule_scores['centrality'] = rule_score(centralities[component_type].get(component, 0),
+                                                       centrality_threshold)
+            ranking.add(component_type, component, rule_scores)
+    
+    return ranking
+
+def print_criticality_ranking(ranking, k=None):
+    """
+    Print the most critical components across all types
+    
+    Args:
+        ranking: CriticalityRanking object
+        k (int): Number of components to print (the ranking's k if not given)
+    """
+    entries = ranking.top(k=k)
+    print(f"\nMost Critical Components (top {len(entries)} by criticality score):")
+    for idx, entry in enumerate(entries):
+        strongest = max(entry['rule_scores'], key=entry['rule_scores'].get)
+        print(f"  {idx+1}. {entry['node']} ({entry['type']}): {entry['score']:.2f} - strongest rule: {strongest}")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Threshold Sensitivity Module for the Publish-Subscribe System Model
+
+This module provides ThresholdSensitivity for asking how the set of
+critical components changes with the criticality thresholds, without
+rerunning the identification for every candidate value.
+
+Each threshold rule compares one per-component metric against a threshold,
+so the metric values of every rule are sorted once and the critical set for
+any threshold is a suffix of that order, found by binary search. A sweep
+reports membership changes between consecutive thresholds, which telescope
+to O(n) components per rule, so sweeping g thresholds of n components
+costs O(n log n + g log n) in total.
+"""
+
+import bisect
+import numpy as np
+from pubsub_index import get_typed_index
+
+# Threshold rules: (CriticalityThresholds attribute, component type, comparison, description)
+THRESHOLD_RULES = (
+    ('broker_topic_coverage', 'broker', '>', 'Share of all topics routed by a broker'),
+    ('broker_application_impact', 'broker', '>', 'Share of all applications using a broker'),
+    ('node_service_density', 'node', '>', 'Share of all services hosted on a node'),
+    ('node_broker_hosting', 'node', '>', 'Share of all brokers hosted on a node'),
+    ('app_dependency_ratio', 'application', '>', 'Share of other applications depending on an application'),
+    ('app_publisher_uniqueness', 'application', '>=', 'Topics an application is the sole publisher for'),
+    ('topic_subscriber_breadth', 'topic', '>', 'Share of all applications subscribing to a topic')
+)
+
+def rule_metric_values(component_metrics, total_components, thresholds):
+    """
+    Compute the metric compared against each threshold, per component
+    
+    Args:
+        component_metrics: Component metrics (see compute_component_metrics)
+        total_components (dict): Number of components per type
+        thresholds: CriticalityThresholds object (None keeps topics of any subscriber count)
+    
+    Returns:
+        dict: Dictionary mapping rule names to {component: metric value} dictionaries
+    """
+    applications = total_components['applications']
+    total_services = applications + total_components['brokers']
+    app_exclusive_topics = component_metrics['app_exclusive_topics']
+    apps = list(component_metrics['app_dependencies'])
+    apps.extend(app for app in app_exclusive_topics if app not in component_metrics['app_dependencies'])
+    minimum_subs = thresholds.topic_criticality_minimum_subs if thresholds is not None else 0
+    
+    return {
+        'broker_topic_coverage': {
+            broker: count / max(1, total_components['topics'])
+            for broker, count in component_metrics['broker_connections'].items()},
+        'broker_application_impact': {
+            broker: count / max(1, applications)
+            for broker, count in component_metrics['broker_impacted_apps'].items()},
+        'node_service_density': {
+            node: count / max(1, total_services)
+            for node, count in component_metrics['node_loads'].items()},
+        'node_broker_hosting': {
+            node: count / max(1, total_components['brokers'])
+            for node, count in component_metrics['node_broker_hosts'].items()},
+        'app_dependency_ratio': {
+            app: component_metrics['app_dependencies'].get(app, 0) / max(1, applications - 1)
+            for app in apps},
+        'app_publisher_uniqueness': {
+            app: len(app_exclusive_topics.get(app, [])) for app in apps},
+        # Topics below the minimum subscriber count are never critical under this rule
+        'topic_subscriber_breadth': {
+            topic: count / max(1, applications)
+            for topic, count in component_metrics['topic_subscribers'].items()
+            if count >= minimum_subs}
+    }
+
+class ThresholdSensitivity:
+    """
+    Sorted per-rule metric values answering threshold what-if queries
+    
+    Attributes:
+        thresholds: CriticalityThresholds the sweep is relative to
+        rules (list): Names of the threshold rules
+    """
+    def __init__(self, component_metrics, total_components, thresholds):
+        """
+        Sort the metric values of every threshold rule once
+        
+        Args:
+            component_metrics: Component metrics (see compute_component_metrics)
+            total_components (dict): Number of components per type
+            thresholds: CriticalityThresholds object
+        """
+        self.thresholds = thresholds
+        self.rules = [rule for rule, _, _, _ in THRESHOLD_RULES]
+        self._rule_info = {rule: (component_type, comparison, description)
+                           for rule, component_type, comparison, description in THRESHOLD_RULES}
+        
+        self._values = {}
+        self._components = {}
+        for rule, values in rule_metric_values(component_metrics, total_components, thresholds).items():
+            order = sorted(values.items(), key=lambda item: item[1])
+            self._components[rule] = [component for component, _ in order]
+            self._values[rule] = [value for _, value in order]
+    
+    def component_type(self, rule):
+        """Get the component type a rule applies to"""
+        return self._rule_info[rule][0]
+    
+    def description(self, rule):
+        """Get a short description of the metric a rule thresholds"""
+        return self._rule_info[rule][2]
+    
+    def current_threshold(self, rule):
+        """Get the threshold currently used by a rule"""
+        return getattr(self.thresholds, rule)
+    
+    def metric_values(self, rule):
+        """Get the metric values of a rule in ascending order"""
+        return self._values[rule]
+    
+    def _cut(self, rule, threshold):
+        """Position of the first critical component in the sorted order"""
+        if self._rule_info[rule][1] == '>':
+            return bisect.bisect_right(self._values[rule], threshold)
+        return bisect.bisect_left(self._values[rule], threshold)
+    
+    def critical_count(self, rule, threshold):
+        """
+        Count the components a rule flags at a threshold
+        
+        Args:
+            rule (str): Rule name (a CriticalityThresholds attribute)
+            threshold (float): Threshold value
+        
+        Returns:
+            int: Number of flagged components
+        """
+        return len(self._values[rule]) - self._cut(rule, threshold)
+    
+    def critical_set(self, rule, threshold):
+        """
+        Get the components a rule flags at a threshold
+        
+        Args:
+            rule (str): Rule name
+            threshold (float): Threshold value
+        
+        Returns:
+            list: Flagged components, by ascending metric value
+        """
+        return self._components[rule][self._cut(rule, threshold):]
+    
+    def membership_delta(self, rule, threshold, reference=None):
+        """
+        Get the components that gain or lose the rule when its threshold moves
+        
+        Args:
+            rule (str): Rule name
+            threshold (float): New threshold value
+            reference (float): Threshold to compare with (the current one if not given)
+        
+        Returns:
+            tuple: (added, removed) - lists of components flagged only at the new
+                   threshold and only at the reference threshold
+        """
+        if reference is None:
+            reference = self.current_threshold(rule)
+        new_cut = self._cut(rule, threshold)
+        reference_cut = self._cut(rule, reference)
+        components = self._components[rule]
+        if new_cut < reference_cut:
+            return components[new_cut:reference_cut], []
+        return [], components[reference_cut:new_cut]
+    
+    def curve(self, rule):
+        """
+        Get the full step curve of critical counts for a rule
+        
+        Args:
+            rule (str): Rule name
+        
+        Returns:
+            list: (threshold, critical_count) pairs at every distinct metric value,
+                  where the count changes
+        """
+        values = self._values[rule]
+        return [(value, self.critical_count(rule, value)) for value in sorted(set(values))]
+    
+    def sweep(self, grid=None):
+        """
+        Evaluate every rule over a set of thresholds
+        
+        Args:
+            grid: None for the full curve of each rule, an int for that many evenly
+                spaced thresholds from 0 to the largest metric value, or a dict
+                mapping rule names to lists of thresholds
+        
+        Returns:
+            list: Rows with 'rule', 'component_type', 'threshold', 'critical_count',
+                  'added' and 'removed' and 'is_current', in ascending threshold order
+                  per rule. 'added' and 'removed' are relative to the previous row of
+                  the rule, or to the current threshold for its first row, so the
+                  critical set of any row follows from the current one
+        """
+        rows = []
+        for rule in self.rules:
+            current = self.current_threshold(rule)
+            values = self._values[rule]
+            if isinstance(grid, dict):
+                rule_grid = list(grid.get(rule, []))
+            elif isinstance(grid, int):
+                rule_grid = np.linspace(0, values[-1] if values else 1, grid).tolist()
+            else:
+                rule_grid = sorted(set(values))
+            
+            previous = current
+            for threshold in sorted(set(rule_grid + [current])):
+                added, removed = self.membership_delta(rule, threshold, previous)
+                previous = threshold
+                rows.append({
+                    'rule': rule,
+                    'component_type': self.component_type(rule),
+                    'threshold': threshold,
+                    'critical_count': self.critical_count(rule, threshold),
+                    'added': added,
+                    'removed': removed,
+                    'is_current': threshold == current
+                })
+        return rows
+
+def threshold_sensitivity(G, critical_components_analysis, index=None):
+    """
+    Build the threshold sensitivity of a critical component analysis
+    
+    Args:
+        G: NetworkX graph object
+        critical_components_analysis: Results of critical component identification
+        index: TypedIndex of G (built if not given)
+    
+    Returns:
+        ThresholdSensitivity: Sensitivity relative to the analysis thresholds
+    """
+    if index is None:
+        index = get_typed_index(G)
+    
+    total_components = {
+        'brokers': len(index.nodes_of_type('Broker')),
+        'nodes': len(index.nodes_of_type('Node')),
+        'applications': len(index.nodes_of_type('Application')),
+        'topics': len(index.nodes_of_type('Topic'))
+    }
+    return ThresholdSensitivity(critical_components_analysis['component_metrics'], total_components,
+                                critical_components_analysis['thresholds'])
+
+def print_sensitivity_summary(sensitivity):
+    """
+    Print how many components each threshold rule flags and the next change when it is lowered
+    
+    Args:
+        sensitivity: ThresholdSensitivity object
+    """
+    print("\nThreshold Sensitivity:")
+    for rule in sensitivity.rules:
+        current = sensitivity.current_threshold(rule)
+        values = sensitivity.metric_values(rule)
+        count = sensitivity.critical_count(rule, current)
+        print(f"  {sensitivity.description(rule)}: {count} of {len(values)} flagged at {current:.2f}")
+        
+        # The highest unflagged value is the next one to cross when the threshold drops
+        cut = len(values) - count
+        if cut > 0:
+            next_value = values[cut - 1]
+            next_count = cut - bisect.bisect_left(values, next_value)
+            print(f"    - lowering it past {next_value:.2f} flags {next_count} more")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Streaming Sketch Module for the Publish-Subscribe System Model
+
+This module provides MetricSketch, a mergeable one-pass summary of a
+stream of metric values. It combines a KLL quantile sketch, which keeps
+O(k log(n / k)) values and answers quantile queries within a rank error of
+about 1.7 / k, with running moments (count, mean and variance) merged with
+Chan's parallel formula. Sketches built on separate shards of a graph can
+be merged into the sketch of the whole graph.
+"""
+
+import math
+import random
+
+class MetricSketch:
+    """
+    Mergeable quantile and moment sketch of a stream of numbers
+    
+    Attributes:
+        k (int): Capacity of the top compactor, which sets the accuracy
+        count (int): Number of values added
+        mean (float): Mean of the values added
+    """
+    def __init__(self, k=200, seed=None):
+        """
+        Create an empty sketch
+        
+        Args:
+            k (int): Compactor capacity (larger is more accurate and uses more memory)
+            seed: Seed of the random compaction offsets
+        """
+        self.k = k
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._minimum = math.inf
+        self._maximum = -math.inf
+        self._random = random.Random(seed)
+        self._compactors = [[]]
+        self._size = 0
+    
+    def _capacity(self, level):
+        """Capacity of a compactor; lower levels shrink geometrically"""
+        depth = len(self._compactors) - level - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+    
+    def _max_size(self):
+        """Number of stored values that triggers a compaction"""
+        return sum(self._capacity(level) for level in range(len(self._compactors)))
+    
+    def add(self, value):
+        """
+        Add one value
+        
+        Args:
+            value (float): Metric value
+        """
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self._minimum = min(self._minimum, value)
+        self._maximum = max(self._maximum, value)
+        
+        self._compactors[0].append(value)
+        self._size += 1
+        if self._size >= self._max_size():
+            self._compress()
+    
+    def update(self, values):
+        """Add every value of an iterable"""
+        for value in values:
+            self.add(value)
+    
+    def _compress(self):
+        """Compact the lowest full level, promoting every other sorted value with double weight"""
+        for level, compactor in enumerate(self._compactors):
+            if len(compactor) >= self._capacity(level):
+                if level + 1 == len(self._compactors):
+                    self._compactors.append([])
+                compactor.sort()
+                # An odd value out stays behind so no weight is lost
+                kept = [compactor.pop()] if len(compactor) % 2 else []
+                offset = self._random.randint(0, 1)
+                self._compactors[level + 1].extend(compactor[offset::2])
+                self._compactors[level] = kept
+                self._size = sum(len(values) for values in self._compactors)
+                return
+    
+    def merge(self, other):
+        """
+        Merge another sketch into this one
+        
+        Args:
+            other: MetricSketch of another part of the stream
+        
+        Returns:
+            MetricSketch: This sketch
+        """
+        if other.count == 0:
+            return self
+        
+        # Chan's formula for combining means and squared deviations
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self._minimum = min(self._minimum, other._minimum)
+        self._maximum = max(self._maximum, other._maximum)
+        
+        while len(self._compactors) < len(other._compactors):
+            self._compactors.append([])
+        for level, values in enumerate(other._compactors):
+            self._compactors[level].extend(values)
+        self._size = sum(len(values) for values in self._compactors)
+        while self._size >= self._max_size():
+            self._compress()
+        return self
+    
+    @property
+    def std(self):
+        """Population standard deviation of the values added"""
+        return math.sqrt(self._m2 / self.count) if self.count else 0.0
+    
+    @property
+    def minimum(self):
+        """Smallest value added (None if empty)"""
+        return self._minimum if self.count else None
+    
+    @property
+    def maximum(self):
+        """Largest value added (None if empty)"""
+        return self._maximum if self.count else None
+    
+    def quantile(self, q):
+        """
+        Estimate a quantile of the values added
+        
+        Args:
+            q (float): Quantile between 0 and 1
+        
+        Returns:
+            float: Estimated value (exact while no compaction has happened), or None if empty
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        if not self.count:
+            return None
+        
+        weighted = sorted((value, 2 ** level)
+                          for level, values in enumerate(self._compactors) for value in values)
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return min(max(value, self._minimum), self._maximum)
+        return self._maximum
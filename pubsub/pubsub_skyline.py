@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Pareto Ranking Module for the Publish-Subscribe System Model
+
+This module ranks components by Pareto dominance over their metric
+vectors instead of thresholds. A component dominates another when it is at
+least as high on every metric and higher on one; the skyline is the set of
+non-dominated components and removing it repeatedly gives successive
+Pareto layers.
+
+Layers are computed with a sort-based skyline algorithm on the distinct
+metric vectors: vectors are sorted in descending lexicographic order, so
+every dominator comes before the vectors it dominates and only the
+remaining metrics need comparing, and each vector goes to the first layer
+without a dominator. Being dominated by a layer is monotone in the layer
+number, so that layer is found by binary search. With two metrics a layer
+is checked through its highest second metric and with three through a
+staircase of its last two metrics, giving O(n log^2 n) overall; with more
+metrics each probed layer is checked with vectorized comparisons.
+"""
+
+import bisect
+from functools import partial
+import numpy as np
+
+# Metrics of each component type: (component_metrics key, metric name, value transform)
+PARETO_METRICS = {
+    'broker': (('broker_connections', 'topic_count', None),
+               ('broker_impacted_apps', 'impacted_apps', None)),
+    'node': (('node_loads', 'service_density', None),
+             ('node_broker_hosts', 'hosted_brokers', None),
+             ('node_centrality', 'centrality', None)),
+    'application': (('app_dependencies', 'dependents', None),
+                    ('app_exclusive_topics', 'exclusive_topics', len),
+                    ('app_centrality', 'centrality', None)),
+    'topic': (('topic_subscribers', 'subscriber_breadth', None),)
+}
+
+class _LayerTop:
+    """Highest value of the one remaining metric in a layer"""
+    def __init__(self):
+        self._top = -np.inf
+    
+    def dominates(self, rest):
+        return self._top >= rest[0]
+    
+    def append(self, rest):
+        self._top = max(self._top, rest[0])
+
+class _LayerStaircase:
+    """Non-dominated (y, z) pairs of the two remaining metrics in a layer, z falling as y rises"""
+    def __init__(self):
+        self._ys = []
+        self._zs = []
+    
+    def dominates(self, rest):
+        # Of the pairs with y at least as high, the one with the lowest y has the highest z
+        position = bisect.bisect_left(self._ys, rest[0])
+        return position < len(self._ys) and self._zs[position] >= rest[1]
+    
+    def append(self, rest):
+        if self.dominates(rest):
+            return
+        y, z = rest
+        # Drop the pairs the new one dominates, which sit just below it in y
+        end = bisect.bisect_right(self._ys, y)
+        start = end
+        while start > 0 and self._zs[start - 1] <= z:
+            start -= 1
+        self._ys[start:end] = [y]
+        self._zs[start:end] = [z]
+
+class _LayerBuffer:
+    """Growable array of the remaining metrics of the vectors in a layer"""
+    def __init__(self, dimensions):
+        self._rows = np.empty((16, dimensions))
+        self._count = 0
+    
+    def dominates(self, rest):
+        return bool(np.any(np.all(self._rows[:self._count] >= rest, axis=1)))
+    
+    def append(self, rest):
+        if self._count == len(self._rows):
+            self._rows = np.concatenate([self._rows, np.empty_like(self._rows)])
+        self._rows[self._count] = rest
+        self._count += 1
+
+def pareto_layers(vectors):
+    """
+    Assign every vector to its Pareto layer (higher values dominate)
+    
+    Args:
+        vectors: Array of shape (n, d) of metric vectors
+    
+    Returns:
+        ndarray: Layer number of each vector, 0 for the skyline
+    """
+    vectors = np.asarray(vectors, dtype=float)
+    if vectors.ndim != 2:
+        raise ValueError("Metric vectors must form a 2-dimensional array")
+    if len(vectors) == 0 or vectors.shape[1] == 0:
+        return np.zeros(len(vectors), dtype=int)
+    
+    # Equal vectors share a layer, and integer-valued metrics repeat a lot
+    unique, inverse = np.unique(vectors, axis=0, return_inverse=True)
+    dimensions = unique.shape[1]
+    if dimensions == 1:
+        layers = np.arange(len(unique) - 1, -1, -1)
+    else:
+        if dimensions == 2:
+            new_layer = _LayerTop
+        elif dimensions == 3:
+            new_layer = _LayerStaircase
+        else:
+            new_layer = partial(_LayerBuffer, dimensions - 1)
+        layers = _sweep_layers(unique, new_layer)
+    return layers[inverse.reshape(-1)]
+
+def _sweep_layers(unique, new_layer):
+    """Layers of distinct vectors, swept in descending lexicographic order"""
+    # Every earlier vector is at least as high on the first metric and differs, so it
+    # dominates a later one exactly when it is at least as high on the remaining metrics
+    order = np.lexsort(-unique.T[::-1])
+    remaining = unique[:, 1:].tolist()
+    
+    layers = np.zeros(len(unique), dtype=int)
+    buffers = []
+    for i in order:
+        rest = remaining[i]
+        low, high = 0, len(buffers)
+        while low < high:
+            middle = (low + high) // 2
+            if buffers[middle].dominates(rest):
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(buffers):
+            buffers.append(new_layer())
+        buffers[low].append(rest)
+        layers[i] = low
+    return layers
+
+def skyline(vectors):
+    """
+    Find the non-dominated vectors
+    
+    Args:
+        vectors: Array of shape (n, d) of metric vectors
+    
+    Returns:
+        ndarray: Indices of the skyline vectors
+    """
+    return np.flatnonzero(pareto_layers(vectors) == 0)
+
+def component_vectors(component_metrics, component_type):
+    """
+    Collect the metric vectors of all components of one type
+    
+    Metrics missing from component_metrics (e.g. centrality when it was
+    not computed) are left out of the vectors.
+    
+    Args:
+        component_metrics: Component metrics (see compute_component_metrics)
+        component_type (str): 'broker', 'node', 'application' or 'topic'
+    
+    Returns:
+        tuple: (components, metric names, array of shape (components, metrics))
+    """
+    metrics = [(key, name, transform) for key, name, transform in PARETO_METRICS[component_type]
+               if key in component_metrics]
+    # The first metric of each type covers every component of that type
+    components = list(component_metrics[metrics[0][0]])
+    vectors = np.zeros((len(components), len(metrics)))
+    for column, (key, _, transform) in enumerate(metrics):
+        values = component_metrics[key]
+        for row, component in enumerate(components):
+            # Components missing from a metric keep 0
+            if component in values:
+                value = values[component]
+                vectors[row, column] = transform(value) if transform else value
+    return components, [name for _, name, _ in metrics], vectors
+
+def pareto_ranking(component_metrics, max_layers=None):
+    """
+    Rank the components of every type into Pareto layers
+    
+    Args:
+        component_metrics: Component metrics (see compute_component_metrics)
+        max_layers (int): Number of layers to keep per type (all if not given)
+    
+    Returns:
+        dict: Dictionary mapping component types to dictionaries with 'metrics' (names)
+              and 'layers' (lists of (component, metric vector) pairs, skyline first)
+    """
+    ranking = {}
+    for component_type in PARETO_METRICS:
+        components, names, vectors = component_vectors(component_metrics, component_type)
+        layer_of = pareto_layers(vectors)
+        count = int(layer_of.max()) + 1 if len(layer_of) else 0
+        if max_layers is not None:
+            count = min(count, max_layers)
+        
+        layers = [[] for _ in range(count)]
+        for component, vector, layer in zip(components, vectors, layer_of):
+            if layer < count:
+                layers[layer].append((component, tuple(vector.tolist())))
+        ranking[component_type] = {'metrics': names, 'layers': layers}
+    return ranking
+
+def print_pareto_summary(ranking, max_components=5):
+    """
+    Print the skyline of each component type
+    
+    Args:
+        ranking: Result of pareto_ranking
+        max_components (int): Number of skyline components printed per type
+    """
+    print("\nPareto Skyline (components not dominated on every metric):")
+    for component_type, result in ranking.items():
+        if not result['layers']:
+            continue
+        skyline_components = result['layers'][0]
+        print(f"  {component_type.capitalize()} ({len(skyline_components)} on the skyline, "
+              f"{len(result['layers'])} layers, metrics: {', '.join(result['metrics'])}):")
+        for component, vector in skyline_components[:max_components]:
+            values = ', '.join(f"{value:g}" for value in vector)
+            print(f"    - {component}: ({values})")
+        if len(skyline_components) > max_components:
+            print(f"    ... and {len(skyline_components) - max_components} more")
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Failure Sweep Module for the Publish-Subscribe System Model
+
+This module computes the failure impact of every broker, node, application
+and topic at once. Instead of simulating one failure at a time, it stacks
+one sparse boolean block per component type into a component x application
+impact matrix, whose row r holds the applications impacted by the failure
+of component r under the same rules as simulate_failure:
+
+- Broker: applications using a topic the broker routes (the broker impact
+  matrix, ROUTES @ USES)
+- Node: hosted applications, plus the impact of every hosted broker
+  (HOSTS_APP + HOSTS_BROKER @ BROKER_IMPACT)
+- Application: dependent applications, plus the subscribers of the topics
+  it is the sole publisher of (DEPENDENTS + EXCLUSIVE @ SUBSCRIBES)
+- Topic: its publishers and subscribers (USES)
+
+Impact percentages and resilience scores of all components then follow
+from the row counts of the matrix. The sweep is cached per typed index.
+"""
+
+import weakref
+from dataclasses import dataclass, field
+import numpy as np
+import scipy.sparse as sp
+from pubsub_matrix import get_broker_impact, boolean_incidence
+from pubsub_bitset import get_application_bitsets, overlap_counts
+
+# Component types in sweep row order
+SWEEP_TYPES = ('Broker', 'Node', 'Application', 'Topic')
+
+_sweep_cache = weakref.WeakKeyDictionary()
+
+@dataclass(slots=True)
+class FailureSweep:
+    """
+    Failure impact of every component of the system
+    
+    Attributes:
+        impact: Component x application boolean CSR matrix
+        components (list): Component names in row order
+        applications (list): Application names in column order
+        type_rows (dict): Component type -> slice of its rows
+        bitsets (ApplicationBitsets): Application numbering of the matrix columns
+        rows (dict): Component name -> row
+    """
+    impact: object
+    components: list
+    applications: list
+    type_rows: dict
+    bitsets: object = None
+    rows: dict = field(default_factory=dict)
+    
+    def __post_init__(self):
+        if not self.rows:
+            self.rows = {component: row for row, component in enumerate(self.components)}
+    
+    @property
+    def impacted_counts(self):
+        """Number of applications impacted by each component, in row order"""
+        return np.diff(self.impact.indptr)
+    
+    @property
+    def impact_percentages(self):
+        """Percentage of all applications impacted by each component, in row order"""
+        if not self.applications:
+            return np.zeros(len(self.components))
+        return self.impacted_counts * (100.0 / len(self.applications))
+    
+    @property
+    def resilience_scores(self):
+        """Resilience against the failure of each component on a 0-10 scale, in row order"""
+        return np.maximum(0.0, 10.0 - self.impact_percentages / 10.0)
+    
+    def component_type(self, component):
+        """Get the type of a swept component (None if it was not swept)"""
+        row = self.rows.get(component)
+        if row is None:
+            return None
+        for component_type, rows in self.type_rows.items():
+            if rows.start <= row < rows.stop:
+                return component_type
+        return None
+    
+    def impacted_applications(self, component):
+        """
+        Get the applications impacted by the failure of one component
+        
+        Args:
+            component: Component name
+        
+        Returns:
+            set: Names of the impacted applications (empty if the component was not swept)
+        """
+        row = self.rows.get(component)
+        if row is None:
+            return set()
+        indices = self.impact.indices[self.impact.indptr[row]:self.impact.indptr[row + 1]]
+        return {self.applications[col] for col in indices.tolist()}
+    
+    def impact_set(self, component):
+        """
+        Get the applications impacted by the failure of one component as a bitset
+        
+        Args:
+            component: Component name
+            
+        Returns:
+            ImpactSet: Impacted applications (empty if the component was not swept)
+        """
+        row = self.rows.get(component)
+        if row is None:
+            return self.bitsets.empty()
+        return self.bitsets.from_csr_row(self.impact, row)
+    
+    def overlap_counts(self, components):
+        """
+        Count the applications impacted by both of every pair of components
+        
+        Args:
+            components: Component names
+            
+        Returns:
+            ndarray: Symmetric array of shared impacted application counts, with the
+                     impacted application count of each component on the diagonal
+        """
+        rows = [self.rows[component] for component in components]
+        return overlap_counts(self.bitsets.from_csr(self.impact[rows]))
+    
+    def worst(self, k=10, component_type=None):
+        """
+        Get the components whose failure impacts the most applications
+        
+        Args:
+            k (int): Number of components returned
+            component_type (str): Only rank components of this type, or None for all
+        
+        Returns:
+            list: Dictionaries with 'component', 'type', 'impacted_applications',
+                  'impact_percentage' and 'resilience_score', most impacting first
+        """
+        rows = self.type_rows.get(component_type, slice(0, 0)) if component_type else slice(0, len(self.components))
+        counts = self.impacted_counts[rows]
+        k = min(k, len(counts))
+        if k <= 0:
+            return []
+        # Partial selection, then a stable sort of the k selected rows
+        top = np.argpartition(-counts, k - 1)[:k]
+        top = top[np.lexsort((top, -counts[top]))] + rows.start
+        
+        percentages = self.impact_percentages
+        scores = self.resilience_scores
+        return [{'component': self.components[row],
+                 'type': self.component_type(self.components[row]),
+                 'impacted_applications': int(self.impacted_counts[row]),
+                 'impact_percentage': float(percentages[row]),
+                 'resilience_score': float(scores[row])}
+                for row in top.tolist()]
+    
+    def type_summary(self):
+        """
+        Summarize the failure impact per component type
+        
+        Returns:
+            dict: Component type -> dictionary with 'components', 'mean_impact' and
+                  'max_impact' (percentages), and 'mean_resilience' and 'min_resilience'
+        """
+        percentages = self.impact_percentages
+        scores = self.resilience_scores
+        summary = {}
+        for component_type, rows in self.type_rows.items():
+            if rows.stop == rows.start:
+                continue
+            summary[component_type] = {
+                'components': rows.stop - rows.start,
+                'mean_impact': float(percentages[rows].mean()),
+                'max_impact': float(percentages[rows].max()),
+                'mean_resilience': float(scores[rows].mean()),
+                'min_resilience': float(scores[rows].min())
+            }
+        return summary
+    
+    @property
+    def overall_score(self):
+        """Average of the mean resilience score of each component type (None if nothing was swept)"""
+        summary = self.type_summary()
+        if not summary:
+            return None
+        return sum(entry['mean_resilience'] for entry in summary.values()) / len(summary)
+
+def build_failure_sweep(index):
+    """
+    Compute the failure impact matrix of all components
+    
+    Args:
+        index: TypedIndex of the graph
+    
+    Returns:
+        FailureSweep: Impact of the failure of every broker, node, application and topic
+    """
+    broker_impact = get_broker_impact(index)
+    applications = broker_impact['applications']
+    topics = broker_impact['topics']
+    brokers = broker_impact['brokers']
+    app_ids = {app: i for i, app in enumerate(applications)}
+    broker_rows = broker_impact['broker_rows']
+    nodes = list(index.nodes_of_type('Node'))
+    
+    # Node block: hosted applications plus the impact of hosted brokers
+    host_app_rows, host_app_cols, host_broker_rows, host_broker_cols = [], [], [], []
+    for row, node in enumerate(nodes):
+        for app in index.hosted_services(node, 'Application'):
+            host_app_rows.append(row)
+            host_app_cols.append(app_ids[app])
+        for broker in index.hosted_services(node, 'Broker'):
+            host_broker_rows.append(row)
+            host_broker_cols.append(broker_rows[broker])
+    hosts_app = boolean_incidence(host_app_rows, host_app_cols, (len(nodes), len(applications)))
+    hosts_broker = boolean_incidence(host_broker_rows, host_broker_cols, (len(nodes), len(brokers)))
+    node_impact = hosts_app + hosts_broker @ broker_impact['impact']
+    
+    # Application block: dependents plus subscribers of exclusively published topics
+    dependent_rows, dependent_cols, exclusive_rows, exclusive_cols = [], [], [], []
+    for row, app in enumerate(applications):
+        for dependent in index.dependents(app):
+            dependent_rows.append(row)
+            dependent_cols.append(app_ids[dependent])
+    subscribe_rows, subscribe_cols = [], []
+    for row, topic in enumerate(topics):
+        publishers = index.publishers(topic)
+        if len(publishers) == 1:
+            exclusive_rows.append(app_ids[publishers[0]])
+            exclusive_cols.append(row)
+        for app in index.subscribers(topic):
+            subscribe_rows.append(row)
+            subscribe_cols.append(app_ids[app])
+    dependents = boolean_incidence(dependent_rows, dependent_cols, (len(applications), len(applications)))
+    exclusive = boolean_incidence(exclusive_rows, exclusive_cols, (len(applications), len(topics)))
+    subscribes = boolean_incidence(subscribe_rows, subscribe_cols, (len(topics), len(applications)))
+    app_impact = dependents + exclusive @ subscribes
+    
+    blocks = [broker_impact['impact'], node_impact, app_impact, broker_impact['uses']]
+    impact = sp.vstack(blocks, format='csr').astype(bool)
+    impact.eliminate_zeros()
+    impact.sort_indices()
+    
+    type_rows = {}
+    start = 0
+    for component_type, block in zip(SWEEP_TYPES, blocks):
+        type_rows[component_type] = slice(start, start + block.shape[0])
+        start += block.shape[0]
+    
+    return FailureSweep(impact, list(brokers) + nodes + list(applications) + list(topics),
+                        list(applications), type_rows, get_application_bitsets(index))
+
+def get_failure_sweep(index):
+    """
+    Get the failure sweep of a typed index, computing it if missing
+    
+    Args:
+        index: TypedIndex of the graph
+    
+    Returns:
+        FailureSweep: Result of build_failure_sweep
+    """
+    sweep = _sweep_cache.get(index)
+    if sweep is None:
+        sweep = build_failure_sweep(index)
+        _sweep_cache[index] = sweep
+    return sweep
+
+def print_failure_sweep(sweep, k=10):
+    """
+    Print the failure impact of every component type and the most impacting components
+    
+    Args:
+        sweep: FailureSweep object
+        k (int): Number of most impacting components printed
+    """
+    print(f"\n=== Failure Sweep ({len(sweep.components)} components) ===")
+    for component_type, entry in sweep.type_summary().items():
+        print(f"{component_type} failures ({entry['components']} components): "
+              f"mean impact {entry['mean_impact']:.1f}%, worst {entry['max_impact']:.1f}%, "
+              f"resilience {entry['mean_resilience']:.1f}/10 (min {entry['min_resilience']:.1f})")
+    
+    worst = sweep.worst(k)
+    if worst:
+        print("\nMost impacting failures:")
+        for rank, entry in enumerate(worst, 1):
+            print(f"  {rank}. {entry['component']} ({entry['type']}): {entry['impacted_applications']} applications "
+                  f"({entry['impact_percentage']:.1f}%), resilience {entry['resilience_score']:.1f}/10")
+    
+    overall_score = sweep.overall_score
+    if overall_score is not None:
+        print(f"\nSwept system resilience score: {overall_score:.1f}/10")
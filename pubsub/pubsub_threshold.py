@@ -3,10 +3,21 @@
 Adaptive Threshold Module for the Publish-Subscribe System Model
 
 This module defines the CriticalityThresholds class for calculating
-adaptive thresholds based on system configuration.
+adaptive thresholds based on system configuration, and
+DistributionThresholds for deriving them from the measured metric
+distributions instead (e.g. the top 5% of broker topic coverage, or mean +
+3 sigma of node service density). Distributions are summarized in
+mergeable streaming sketches, so thresholds for huge or sharded graphs are
+computed in one pass per shard without holding all metric values.
 """
 
+import math
 import numpy as np
+from pubsub_sensitivity import THRESHOLD_RULES, rule_metric_values
+from pubsub_sketch import MetricSketch
+
+# Default distribution rule: a component is critical when its metric is in the top 5%
+DEFAULT_THRESHOLD_POLICY = ('quantile', 0.95)
 
 class CriticalityThresholds:
     """
@@ -52,9 +63,6 @@ class CriticalityThresholds:
         # Topic thresholds
         self.topic_subscriber_breadth = self._calculate_topic_subscriber_breadth()
         self.topic_criticality_minimum_subs = max(2, min(5, config.num_applications // 10))
-        
-        # Print calculated thresholds
-        self._print_thresholds()
     
     def _calculate_broker_topic_coverage(self):
         """
@@ -199,7 +207,7 @@ class CriticalityThresholds:
         threshold = base * pow(10 / max(10, self.config.num_applications), 0.4)
         return max(min_threshold, threshold)
     
-    def _print_thresholds(self):
+    def print_thresholds(self):
         """Print the calculated thresholds for reference"""
         print("\n=== Critical Component Thresholds ===")
         print(f"Broker topic coverage: >{self.broker_topic_coverage:.0%} of all topics")
@@ -211,6 +219,157 @@ class CriticalityThresholds:
         print(f"Topic subscriber breadth: >{self.topic_subscriber_breadth:.0%} of all applications")
         print(f"Topic minimum subscribers: >{self.topic_criticality_minimum_subs} subscribers")
 
+class ThresholdSketches:
+    """
+    One mergeable metric sketch per threshold rule
+    
+    Attributes:
+        sketches (dict): Dictionary mapping rule names to MetricSketch objects
+    """
+    def __init__(self, k=200, seed=None):
+        """
+        Create empty sketches
+        
+        Args:
+            k (int): Compactor capacity of each sketch
+            seed: Seed of the random compaction offsets
+        """
+        self.sketches = {rule: MetricSketch(k, seed) for rule, _, _, _ in THRESHOLD_RULES}
+    
+    def add(self, rule, value):
+        """Add the metric value of one component to a rule's sketch"""
+        self.sketches[rule].add(value)
+    
+    def add_metrics(self, component_metrics, total_components):
+        """
+        Add the metric values of every component of a graph or shard
+        
+        Args:
+            component_metrics: Component metrics (see compute_component_metrics)
+            total_components (dict): Number of components per type in the whole graph,
+                so that ratios computed on a shard match the full graph
+        """
+        for rule, values in rule_metric_values(component_metrics, total_components, None).items():
+            self.sketches[rule].update(values.values())
+    
+    def merge(self, other):
+        """
+        Merge the sketches of another shard into these
+        
+        Args:
+            other: ThresholdSketches of another shard
+        
+        Returns:
+            ThresholdSketches: These sketches
+        """
+        for rule, sketch in other.sketches.items():
+            self.sketches[rule].merge(sketch)
+        return self
+
+class DistributionThresholds(CriticalityThresholds):
+    """
+    Thresholds computed from the measured metric distributions
+    
+    Each rule follows a policy of ('quantile', q), critical above the q-quantile
+    of its metric, or ('sigma', k), critical above the mean plus k standard
+    deviations. Attributes are the same as CriticalityThresholds; config is None.
+    
+    Attributes:
+        sketches: ThresholdSketches the thresholds were computed from
+        policy (dict): Dictionary mapping rule names to their distribution policy
+    """
+    def __init__(self, sketches, policy=None, num_applications=None):
+        """
+        Compute the thresholds from metric sketches
+        
+        Args:
+            sketches: ThresholdSketches of the whole graph
+            policy: A (kind, value) policy for every rule, or a dictionary mapping
+                rule names to policies (unlisted rules use the top 5%)
+            num_applications (int): Number of applications, for the topic minimum
+                subscriber count (the size of the application sketch if not given)
+        """
+        self.config = None
+        self.sketches = sketches
+        if isinstance(policy, dict):
+            self.policy = {rule: tuple(policy.get(rule, DEFAULT_THRESHOLD_POLICY)) for rule in sketches.sketches}
+        else:
+            self.policy = dict.fromkeys(sketches.sketches, tuple(policy or DEFAULT_THRESHOLD_POLICY))
+        
+        for rule, _, comparison, _ in THRESHOLD_RULES:
+            value = self._distribution_threshold(rule)
+            if comparison == '>=':
+                # Counts strictly above the cut-off are critical
+                value = max(1, math.floor(value) + 1)
+            setattr(self, rule, value)
+        
+        if num_applications is None:
+            num_applications = sketches.sketches['app_dependency_ratio'].count
+        self.topic_criticality_minimum_subs = max(2, min(5, num_applications // 10))
+    
+    @classmethod
+    def from_metrics(cls, component_metrics, total_components, policy=None, k=200):
+        """
+        Compute the thresholds of one graph from its component metrics
+        
+        Args:
+            component_metrics: Component metrics (see compute_component_metrics)
+            total_components (dict): Number of components per type
+            policy: Distribution policy (see DistributionThresholds)
+            k (int): Compactor capacity of each sketch
+        
+        Returns:
+            DistributionThresholds: Thresholds for the graph
+        """
+        sketches = ThresholdSketches(k)
+        sketches.add_metrics(component_metrics, total_components)
+        return cls(sketches, policy, total_components['applications'])
+    
+    def _distribution_threshold(self, rule):
+        """
+        Calculate the threshold of one rule from its sketch
+        
+        Returns:
+            float: Threshold value (1.0, flagging nothing, if the rule has no components)
+        """
+        kind, value = self.policy[rule]
+        sketch = self.sketches.sketches[rule]
+        if sketch.count == 0:
+            return 1.0
+        if kind == 'quantile':
+            return sketch.quantile(value)
+        if kind == 'sigma':
+            return sketch.mean + value * sketch.std
+        raise ValueError(f"Unknown threshold policy: {kind}")
+    
+    def print_thresholds(self):
+        """Print the calculated thresholds and the policy they come from"""
+        super().print_thresholds()
+        policies = set(self.policy.values())
+        if len(policies) == 1:
+            kind, value = policies.pop()
+            source = f"top {1 - value:.0%}" if kind == 'quantile' else f"mean + {value:g} sigma"
+            print(f"(computed from metric distributions: {source})")
+        else:
+            print("(computed from metric distributions)")
+
+def threshold_policy_options(args):
+    """
+    Collect the distribution threshold policy of parsed command line arguments
+    
+    Args:
+        args: Parsed command line arguments
+    
+    Returns:
+        tuple: threshold_policy argument for identify_critical_components, or None for
+               thresholds calculated from the configuration
+    """
+    if args.thresholds != 'distribution':
+        return None
+    if args.threshold_sigma is not None:
+        return ('sigma', args.threshold_sigma)
+    return ('quantile', args.threshold_quantile)
+
 if __name__ == "__main__":
     from pubsub_config import SystemConfig, parse_args
     
@@ -221,15 +380,18 @@ if __name__ == "__main__":
     print("\n=== Small System ===")
     small_config = SystemConfig(num_brokers=2, num_nodes=3, num_applications=5, num_topics=10)
     small_thresholds = CriticalityThresholds(small_config)
+    small_thresholds.print_thresholds()
     
     # Medium system
     print("\n=== Medium System ===")
     medium_config = SystemConfig(num_brokers=5, num_nodes=10, num_applications=20, num_topics=50)
     medium_thresholds = CriticalityThresholds(medium_config)
+    medium_thresholds.print_thresholds()
     
     # Large system
     print("\n=== Large System ===")
     large_config = SystemConfig(num_brokers=15, num_nodes=30, num_applications=100, num_topics=200)
     large_thresholds = CriticalityThresholds(large_config)
+    large_thresholds.print_thresholds()
     
     print("\nAs you can see, thresholds adapt based on system size to maintain appropriate sensitivity.")
@@ -8,6 +8,9 @@ the publish-subscribe system model, including layers and critical components.
 
 import matplotlib.pyplot as plt
 import networkx as nx
+from pubsub_log import get_logger
+
+logger = get_logger(__name__)
 
 def visualize_layer(G, node_types, edge_types, title, layout=None, scale_factor=1.0):
     """
@@ -36,7 +39,7 @@ def visualize_layer(G, node_types, edge_types, title, layout=None, scale_factor=
     
     # Skip empty graphs
     if len(SG) == 0:
-        print(f"No nodes in {title} layer")
+        logger.info("No nodes in %s layer", title)
         return
     
     # Set figure size based on graph size
@@ -152,7 +155,7 @@ def visualize_critical_components(G, critical_components_analysis, config):
     
     # Skip if no critical components identified
     if not any(critical_components.values()):
-        print("No critical components to visualize.")
+        logger.info("No critical components to visualize.")
         return
     
     # Extract all critical component nodes
@@ -277,9 +280,54 @@ def visualize_critical_components(G, critical_components_analysis, config):
     plt.axis('off')
     plt.tight_layout()
     plt.savefig("critical_components_visualization.png", dpi=300)
-    print("\nCritical components visualization saved as 'critical_components_visualization.png'")
+    logger.info("\nCritical components visualization saved as 'critical_components_visualization.png'")
     #plt.show()
 
+def visualize_threshold_sensitivity(sensitivity, output_file="threshold_sensitivity.png"):
+    """
+    Plot where each criticality threshold cuts its metric distribution
+    
+    Each panel shows the histogram of one rule's metric values, the current
+    threshold as a vertical line and the number of flagged components as a
+    function of the threshold.
+    
+    Args:
+        sensitivity: ThresholdSensitivity object
+        output_file: Path of the PNG file to write
+    """
+    rules = sensitivity.rules
+    columns = 2
+    rows = (len(rules) + columns - 1) // columns
+    fig, axes = plt.subplots(rows, columns, figsize=(12, 3.5 * rows))
+    axes = axes.flatten()
+    
+    for ax, rule in zip(axes, rules):
+        values = sensitivity.metric_values(rule)
+        current = sensitivity.current_threshold(rule)
+        
+        if values:
+            ax.hist(values, bins=min(30, max(5, len(set(values)))), color='lightsteelblue')
+        ax.axvline(current, color='darkred', linestyle='--', label=f'Current threshold ({current:.2f})')
+        ax.set_title(sensitivity.description(rule), fontsize=10)
+        ax.set_ylabel('Components')
+        
+        # Critical count as a step function of the threshold
+        curve = sensitivity.curve(rule)
+        if curve:
+            count_ax = ax.twinx()
+            count_ax.step([threshold for threshold, _ in curve], [count for _, count in curve],
+                          where='post', color='darkorange')
+            count_ax.set_ylabel('Flagged', color='darkorange')
+        ax.legend(loc='upper right', fontsize='small')
+    
+    for ax in axes[len(rules):]:
+        ax.axis('off')
+    
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=150)
+    plt.close(fig)
+    logger.info("Threshold sensitivity plot saved as '%s'", output_file)
+
 def generate_visualizations(G, config, critical_components_analysis=None):
     """
     Generate standard visualizations for the graph model
@@ -300,7 +348,7 @@ def generate_visualizations(G, config, critical_components_analysis=None):
         scale_factor = 0.4
     
     # Generate standard layer visualizations
-    print("\n=== Generating Visualizations ===")
+    logger.info("\n=== Generating Visualizations ===")
     
     # Application Layer (Applications and their dependencies)
     visualize_layer(G, 
@@ -339,24 +387,27 @@ def generate_visualizations(G, config, critical_components_analysis=None):
                        title='Complete System View',
                        scale_factor=scale_factor * 0.8)  # Reduce scale further for complete view
     else:
-        print("System too large for complete visualization - skipping complete view")
+        logger.info("System too large for complete visualization - skipping complete view")
     
     # If critical component analysis is provided, visualize critical components
     if critical_components_analysis:
         visualize_critical_components(G, critical_components_analysis, config)
     
-    print("Visualizations complete. All visualization files saved as PNG.")
+    logger.info("Visualizations complete. All visualization files saved as PNG.")
 
 if __name__ == "__main__":
     import sys
     
     from pubsub_config import SystemConfig, parse_args
+    from pubsub_log import configure_logging
     from pubsub_graph import create_complete_graph
     from pubsub_critical import identify_critical_components
     
     try:
         # Parse arguments
         config, args = parse_args()
+        configure_logging()
+        config.print_summary()
         
         if args.no_viz:
             print("Visualization disabled (--no-viz flag used)")
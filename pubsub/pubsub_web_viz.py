@@ -11,6 +11,12 @@ import os
 import json
 import webbrowser
 from pathlib import Path
+from pubsub_index import get_typed_index
+from pubsub_sweep import get_failure_sweep
+from pubsub_failure import FailureImpact
+from pubsub_log import get_logger
+
+logger = get_logger(__name__)
 
 def generate_web_visualization(G, critical_components=None, simulation_results=None, recommendations=None, output_dir="web_viz"):
     """
@@ -126,14 +132,14 @@ def generate_web_visualization(G, critical_components=None, simulation_results=N
     with open(js_path, 'w') as f:
         f.write(js_content)
     
-    print(f"Web visualization generated at {html_path}")
-    print(f"Open this file in a web browser to view the interactive visualization")
+    logger.info("Web visualization generated at %s", html_path)
+    logger.info("Open this file in a web browser to view the interactive visualization")
     
     # Try to open in browser
     try:
         webbrowser.open('file://' + os.path.abspath(html_path))
     except:
-        print("Could not automatically open browser. Please open the HTML file manually.")
+        logger.warning("Could not automatically open browser. Please open the HTML file manually.")
     
     return html_path
 
@@ -1064,7 +1070,8 @@ def generate_web_visualization_with_analysis(G, critical_analysis, simulation_re
     Args:
         G: NetworkX graph object
         critical_analysis: Results from critical component identification
-        simulation_results: Results from failure simulation
+        simulation_results: Results from failure simulation (FailureSimulations, or a dictionary
+            of impacted component sets by type)
         recommendations: System improvement recommendations
         output_dir: Directory to store the visualization files
         
@@ -1076,15 +1083,20 @@ def generate_web_visualization_with_analysis(G, critical_analysis, simulation_re
     
     # Convert simulation results to expected format
     processed_simulation_results = {}
+    simulation_results = getattr(simulation_results, 'impacts', simulation_results)
     if simulation_results:
         for component_type, result in simulation_results.items():
-            if isinstance(result, set):
+            if isinstance(result, FailureImpact):
+                # Impacted applications plus the services that went down with a failed node
+                processed_simulation_results[component_type] = list(result.impacted) + [
+                    service for service in result.failed_services if service not in result.impacted]
+            elif isinstance(result, set):
                 processed_simulation_results[component_type] = list(result)
     
     # Generate the visualization
     return generate_web_visualization(G, critical_components, processed_simulation_results, recommendations, output_dir)
 
-def run_failure_simulation_for_web(G, component, component_type):
+def run_failure_simulation_for_web(G, component, component_type, index=None):
     """
     Run a simplified failure simulation for one component for the web visualization
     
@@ -1092,85 +1104,38 @@ def run_failure_simulation_for_web(G, component, component_type):
         G: NetworkX graph object
         component: The component to simulate failure for
         component_type: The type of the component (broker, node, application, topic)
+        index: TypedIndex of G (built if not given)
         
     Returns:
         set: Set of impacted components
     """
-    impacted_nodes = set()
+    if index is None:
+        index = get_typed_index(G)
     
-    if component_type.lower() == "broker":
-        # Find topics routed by this broker
-        affected_topics = [node for node in G.successors(component) 
-                          if G.nodes[node].get('type') == 'Topic' and G[component][node].get('type') == 'ROUTES']
-        
-        # Find applications using these topics
-        for topic in affected_topics:
-            publishers = [node for node in G.predecessors(topic) 
-                         if G.nodes[node].get('type') == 'Application' and G[node][topic].get('type') == 'PUBLISHES_TO']
-            
-            subscribers = [node for node in G.predecessors(topic) 
-                          if G.nodes[node].get('type') == 'Application' and G[node][topic].get('type') == 'SUBSCRIBES_TO']
-            
-            impacted_nodes.update(publishers)
-            impacted_nodes.update(subscribers)
+    # The failure sweep holds the impacted applications of every component as a bitset row
+    impacted_nodes = set(get_failure_sweep(index).impact_set(component))
     
-    elif component_type.lower() == "node":
-        # Find services running on this node
-        affected_services = [node for node in G.predecessors(component) 
-                            if G[node][component].get('type') == 'RUNS_ON']
-        
-        # Add directly affected services to impacted nodes
-        impacted_nodes.update(affected_services)
-        
-        # For affected brokers, analyze cascade impact
-        affected_brokers = [service for service in affected_services if G.nodes[service].get('type') == 'Broker']
-        for broker in affected_brokers:
-            broker_impacted = run_failure_simulation_for_web(G, broker, "Broker")
-            impacted_nodes.update(broker_impacted)
-    
-    elif component_type.lower() == "application":
-        # Find applications that depend on this one
-        dependent_apps = [node for node in G.predecessors(component) 
-                         if G.nodes[node].get('type') == 'Application' and G[node][component].get('type') == 'DEPENDS_ON']
-        
-        impacted_nodes.update(dependent_apps)
-        
-        # Find topics exclusively published by this application
-        for topic, attrs in G.nodes(data=True):
-            if attrs.get('type') == 'Topic':
-                publishers = [n for n in G.predecessors(topic) 
-                             if G.nodes[n].get('type') == 'Application' and G[n][topic].get('type') == 'PUBLISHES_TO']
-                if publishers == [component]:
-                    # Find subscribers to this topic
-                    subscribers = [n for n in G.predecessors(topic) 
-                                  if G.nodes[n].get('type') == 'Application' and G[n][topic].get('type') == 'SUBSCRIBES_TO']
-                    impacted_nodes.update(subscribers)
-    
-    elif component_type.lower() == "topic":
-        # Find applications publishing to or subscribing from this topic
-        publishers = [node for node in G.predecessors(component) 
-                     if G.nodes[node].get('type') == 'Application' and G[node][component].get('type') == 'PUBLISHES_TO']
-        
-        subscribers = [node for node in G.predecessors(component) 
-                      if G.nodes[node].get('type') == 'Application' and G[node][component].get('type') == 'SUBSCRIBES_TO']
-        
-        # Add to impacted nodes
-        impacted_nodes.update(publishers)
-        impacted_nodes.update(subscribers)
+    if component_type.lower() == "node":
+        # Services running on this node go down with it
+        impacted_nodes.update(index.hosted_services(component))
     
     return impacted_nodes
 
-def prepare_simulation_data(G, critical_components):
+def prepare_simulation_data(G, critical_components, index=None):
     """
     Prepare simulation data for all critical components
     
     Args:
         G: NetworkX graph object
         critical_components: Dictionary of critical components
+        index: TypedIndex of G (built if not given)
         
     Returns:
         dict: Dictionary of simulation results by component type
     """
+    if index is None:
+        index = get_typed_index(G)
+    
     simulation_results = {}
     
     # Run simulation for one component of each type
@@ -1182,7 +1147,7 @@ def prepare_simulation_data(G, critical_components):
         critical_component = components[0]['node']
         
         # Run simulation
-        impacted_nodes = run_failure_simulation_for_web(G, critical_component, component_type)
+        impacted_nodes = run_failure_simulation_for_web(G, critical_component, component_type, index)
         
         # Store results
         simulation_results[component_type] = impacted_nodes
@@ -1250,19 +1215,22 @@ def export_graph_for_d3(G, critical_components=None, output_dir="graph_data"):
     with open(json_path, 'w') as f:
         json.dump(graph_data, f, indent=2)
     
-    print(f"Graph data exported to {json_path} in D3.js compatible format")
+    logger.info("Graph data exported to %s in D3.js compatible format", json_path)
     return json_path
 
 if __name__ == "__main__":
     import sys
     
     from pubsub_config import SystemConfig, parse_args
+    from pubsub_log import configure_logging
     from pubsub_graph import create_complete_graph
     from pubsub_critical import identify_critical_components
     
     try:
         # Parse arguments
         config, args = parse_args()
+        configure_logging()
+        config.print_summary()
         
         # Create graph
         print("Creating graph model...")